@@ -0,0 +1,78 @@
+﻿import argparse
+import json
+from pathlib import Path
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from persistence.journal_storage import JournalStorage
+
+
+def make_student(i: int) -> Dict[str, Any]:
+    """Создаёт запись студента того же вида, что и Student.to_dict."""
+    return {
+        "id": str(i),
+        "last_name": "Иванов",
+        "first_name": "Иван",
+        "exam_result": {
+            "exam": {
+                "subject": "Математика",
+                "questions": [
+                    ["Линейные уравнения", "Найдите корень уравнения 2x=4", "2"],
+                    ["Производная простой функции", "Какова производная от x^2?", "2x"]
+                ]
+            },
+            "answers": ["2", "2"]
+        },
+        "materials": None,
+        "unexplored_topics": ["Производная простой функции"]
+    }
+
+
+def legacy_save(path: Path, student: Dict[str, Any]) -> None:
+    """Сохранение так, как его делал Student.save до появления хранилищ: прочитать и переписать весь файл."""
+    with open(path, 'r', encoding='utf-8') as file:
+        students = json.load(file)
+    students[student["id"]] = student
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(students, file, indent=4, ensure_ascii=False)
+
+
+def measure(save: Callable[[Dict[str, Any]], None], first_id: int, repeats: int) -> float:
+    """Возвращает среднее время одного сохранения в миллисекундах."""
+    start = time.perf_counter()
+    for i in range(repeats):
+        save(make_student(first_id + i))
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def run(sizes: List[int], legacy_repeats: int, journal_repeats: int) -> None:
+    print(f"{'студентов':>10} | {'перезапись файла, мс':>21} | {'журнал, мс':>11} | {'ускорение':>9}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "students.json"
+            with open(path, 'w', encoding='utf-8') as file:
+                json.dump({str(i): make_student(i) for i in range(size)}, file, indent=4, ensure_ascii=False)
+
+            legacy_ms = measure(lambda student: legacy_save(path, student), size, legacy_repeats)
+
+            storage = JournalStorage(path)
+            # Разбор снимка выполняется один раз при открытии и в замер не входит
+            storage.load_all()
+            journal_ms = measure(lambda student: storage.put(student["id"], student), size, journal_repeats)
+            storage.close()
+
+        print(f"{size:>10} | {legacy_ms:>21.3f} | {journal_ms:>11.3f} | {legacy_ms / journal_ms:>8.0f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение времени сохранения одного студента: перезапись JSON-файла и журнал.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--legacy-repeats", type=int, default=3)
+    parser.add_argument("--journal-repeats", type=int, default=1000)
+    args = parser.parse_args()
+    run(args.sizes, args.legacy_repeats, args.journal_repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+﻿import argparse
+from pathlib import Path
+
+from entities.bulk_io import ENTITIES, export_records, import_records
+from persistence.registry import flush_all
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Массовая загрузка и выгрузка студентов, экзаменов и учебных материалов.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="загрузить записи из CSV/JSONL")
+    import_parser.add_argument("entity", choices=ENTITIES)
+    import_parser.add_argument("file", type=Path)
+    import_parser.add_argument("--format", choices=["csv", "jsonl"], help="формат файла (по умолчанию по расширению)")
+    import_parser.add_argument("--batch-size", type=int,
+                               help="число записей в одной записи на диск (по умолчанию весь файл одним пакетом)")
+    import_parser.add_argument("--overwrite", action="store_true", help="заменять уже существующие записи")
+
+    export_parser = subparsers.add_parser("export", help="выгрузить записи в CSV/JSONL")
+    export_parser.add_argument("entity", choices=ENTITIES)
+    export_parser.add_argument("file", type=Path)
+    export_parser.add_argument("--format", choices=["csv", "jsonl"], help="формат файла (по умолчанию по расширению)")
+
+    args = parser.parse_args()
+    try:
+        if args.command == "import":
+            report = import_records(args.entity, args.file, args.format, args.batch_size, args.overwrite)
+            report.display()
+        else:
+            count = export_records(args.entity, args.file, args.format)
+            print(f"Выгружено записей: {count}.")
+        flush_all()
+    except Exception as e:
+        print(f"Ошибка: {e}")
+
+
+if __name__ == "__main__":
+    main()
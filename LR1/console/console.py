@@ -2,8 +2,10 @@
 from typing import Optional
 
 from entities.additional_classes import AdditionalClasses
+from entities.cohort_analysis import analyze_cohort
 from entities.educational_materials import EducationalMaterial
 from entities.exam import Exam
+from persistence.registry import flush_all
 
 from .states import InitialState, State
 
@@ -28,6 +30,8 @@ class Console:
                 self.state.show_menu()
                 choice = input("\nВыберите действие: ")
                 self.state.handle_input(choice)
+                # Изменения, накопленные за действие, записываются одним пакетом
+                flush_all()
             except KeyboardInterrupt:
                 print("\nПрограмма завершена.")
                 break
@@ -49,6 +53,13 @@ class Console:
                 print(f"\nОшибка при входе в систему: {e}")
                 return
 
+    def analyze_cohort(self) -> None:
+        try:
+            report = analyze_cohort()
+            report.display()
+        except Exception as e:
+            print(f"\nОшибка при анализе ошибок студентов: {e}")
+
     def process_student_choice(self, choice: str) -> None:
         try:
             if choice == "1":
@@ -73,6 +73,7 @@ class TeacherState(State):
         print(f"\n     Главное меню")
         print("1. Добавление.")
         print("2. Удаление.")
+        print("3. Анализ ошибок всех студентов.")
         print("0. Выход.")
 
 
@@ -82,6 +83,8 @@ class TeacherState(State):
                 self.console.set_state(AddedState(self.console))
             elif choice == "2":
                 self.console.set_state(DeletedState(self.console))
+            elif choice == "3":
+                self.console.analyze_cohort()
             elif choice == "0":
                 self.console.student = None
                 self.console.set_state(InitialState(self.console))
@@ -19,41 +19,24 @@ class AdditionalClasses:
 
     def recommend_literature(self) -> None:
         try:
-            material = EducationalMaterial(topic=self)
-            materials = material.load_all()
-
-            if self.topic in materials:
-                material_data = materials[self.topic]
-                recommended_material = EducationalMaterial(
-                    topic=self.topic,
-                    title=material_data['title'],
-                    author=material_data['author']
-                )
+            # Материалы хранятся по теме, поэтому читается только одна запись
+            recommended_material = EducationalMaterial.find(self.topic)
 
+            if recommended_material is not None:
                 # Инициализируем список материалов студента, если он пуст
                 if self.student.materials is None:
                     self.student.materials = []
 
-                # Проверяем, есть ли материал уже в списке студента
-                is_material_exists = any(
-                    book.topic == recommended_material.topic and
-                    book.title == recommended_material.title and
-                    book.author == recommended_material.author
-                    for book in self.student.materials
-                )
+                # Повторы проверяются по множеству ключей материалов студента
+                is_material_added = self.student.add_material(recommended_material)
 
-                if not is_material_exists:
-                    self.student.materials.append(recommended_material)
-                    print("\nРекомендованная литература:")
-                    for book in self.student.materials:
-                        print(f"- {book.title} (автор: {book.author})")
+                print("\nРекомендованная литература:")
+                for book in self.student.materials:
+                    print(f"- {book.title} (автор: {book.author})")
 
+                if is_material_added:
                     # Сохраняем изменения
                     self.student.save()
-                else:
-                    print("\nРекомендованная литература:")
-                    for book in self.student.materials:
-                        print(f"- {book.title} (автор: {book.author})")
             else:
                 print("\nЛитература по данной теме не найдена.")
         except FileNotFoundError:
@@ -0,0 +1,119 @@
+﻿from itertools import chain
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from entities.exam import Exam
+from entities.previous_exam_attempt import PreviousExamAttempt
+
+
+
+class GradingResult:
+    """Результаты проверки N попыток одного экзамена.
+
+    Атрибуты:
+        topics: темы экзамена в порядке первого появления;
+        scores: массив (N,) с числом правильных ответов;
+        correctness: булева матрица (N, Q), True — ответ на вопрос верный;
+        topic_errors: матрица (N, T) с числом ошибок по каждой теме.
+    """
+
+    def __init__(self, topics: List[str], scores, correctness, topic_errors) -> None:
+        self.topics: List[str] = topics
+        self.scores = scores
+        self.correctness = correctness
+        self.topic_errors = topic_errors
+
+    def error_totals(self) -> Dict[str, int]:
+        """Метод для подсчёта ошибок по темам по всем попыткам."""
+        return dict(zip(self.topics, self.topic_errors.sum(axis=0).tolist()))
+
+    def unexplored_topics(self, index: int) -> List[str]:
+        """Метод для получения тем, в которых ошибся студент с номером index."""
+        return [topic for topic, count in zip(self.topics, self.topic_errors[index]) if count]
+
+
+
+class BatchGrader:
+    """Пакетная проверка ответов на экзамен с помощью NumPy.
+
+    Ответы переводятся в целочисленные идентификаторы (одинаковые строки —
+    один идентификатор), после чего оценки, матрица правильности и ошибки по
+    темам для всех попыток считаются одним векторным проходом.
+    Сравнение ответов точное, как в PreviousExamAttempt.calculate_score.
+    """
+
+    # Идентификатор отсутствующего ответа: не совпадает ни с одним правильным
+    MISSING = -1
+
+    def __init__(self, exam: Exam) -> None:
+        if np is None:
+            raise ImportError("Для пакетной проверки требуется пакет numpy (pip install numpy).")
+        self.exam: Exam = exam
+        self._answer_ids: Dict[str, int] = {}
+
+        topic_ids: Dict[str, int] = {}
+        question_topics = []
+        correct = []
+        for topic, _, correct_answer in exam.questions:
+            question_topics.append(topic_ids.setdefault(topic, len(topic_ids)))
+            correct.append(self._intern(correct_answer))
+        self.topics: List[str] = list(topic_ids)
+        self._correct_ids = np.array(correct, dtype=np.int32)
+        # Матрица (Q, T): вопрос -> тема
+        self._topic_matrix = np.zeros((len(exam.questions), len(self.topics)), dtype=np.int32)
+        self._topic_matrix[np.arange(len(question_topics)), question_topics] = 1
+
+    def _intern(self, answer: str) -> int:
+        return self._answer_ids.setdefault(answer, len(self._answer_ids))
+
+    def encode(self, answers: Sequence[Sequence[str]]):
+        """Метод для перевода ответов в матрицу (N, Q) идентификаторов."""
+        question_count = len(self.exam.questions)
+        lengths = np.fromiter(map(len, answers), dtype=np.int64, count=len(answers))
+        if len(answers) and (lengths == question_count).all():
+            # Частый случай: у всех студентов ответы на все вопросы, кодируем одним плоским проходом
+            flat = chain.from_iterable(answers)
+            for answer in set(chain.from_iterable(answers)):
+                self._intern(answer)
+            ids = np.fromiter(map(self._answer_ids.__getitem__, flat), dtype=np.int32,
+                              count=len(answers) * question_count)
+            return ids.reshape(len(answers), question_count)
+
+        ids = np.full((len(answers), question_count), self.MISSING, dtype=np.int32)
+        for row, student_answers in enumerate(answers):
+            student_answers = student_answers[:question_count]
+            ids[row, :len(student_answers)] = [self._intern(answer) for answer in student_answers]
+        return ids
+
+    def grade_ids(self, ids) -> GradingResult:
+        """Метод для проверки уже закодированных ответов одним векторным проходом."""
+        correctness = ids == self._correct_ids
+        scores = correctness.sum(axis=1)
+        topic_errors = (~correctness).astype(np.int32) @ self._topic_matrix
+        return GradingResult(self.topics, scores, correctness, topic_errors)
+
+    def grade(self, answers: Sequence[Sequence[str]]) -> GradingResult:
+        """Метод для проверки списков ответов N студентов."""
+        return self.grade_ids(self.encode(answers))
+
+    def grade_attempts(self, attempts: Sequence[PreviousExamAttempt]) -> GradingResult:
+        return self.grade([attempt.answers for attempt in attempts])
+
+
+def grade_by_exam(attempts: Sequence[Optional[PreviousExamAttempt]]) -> Dict[str, GradingResult]:
+    """Группирует попытки по экзаменам и проверяет каждую группу одним проходом.
+
+    Возвращает словарь предмет@версия -> результаты (в порядке попыток этой группы).
+    """
+    # Равные экзамены могут быть разными объектами (например, загруженные через Exam.load),
+    # поэтому группируем по предмету и версии; версия экзамена кэшируется
+    groups: Dict[str, List[PreviousExamAttempt]] = {}
+    for attempt in attempts:
+        if attempt is not None:
+            groups.setdefault(f"{attempt.exam.subject}@{attempt.exam.version}", []).append(attempt)
+
+    return {key: BatchGrader(group[0].exam).grade_attempts(group) for key, group in groups.items()}
@@ -0,0 +1,309 @@
+﻿import csv
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from entities.educational_materials import EducationalMaterial
+from entities.exam import Exam
+from entities.previous_exam_attempt import PreviousExamAttempt
+from entities.student import Student
+
+
+ENTITIES = ("students", "exams", "materials")
+
+# Разделитель ответов студента в CSV-файле; разделитель и обратная косая черта
+# внутри ответа экранируются обратной косой чертой
+ANSWERS_SEPARATOR = ";"
+ANSWERS_ESCAPE = "\\"
+
+STUDENT_FIELDS = ["id", "last_name", "first_name", "subject", "answers"]
+EXAM_FIELDS = ["subject", "topic", "question", "answer"]
+MATERIAL_FIELDS = ["subject", "topic", "title", "author"]
+
+
+
+class ImportReport:
+    """Итоги массовой загрузки: сколько записей сохранено и какие строки отклонены."""
+
+    def __init__(self) -> None:
+        self.imported: int = 0
+        self.skipped: int = 0
+        self.errors: List[Tuple[int, str]] = []
+
+    def add_error(self, line: int, message: str) -> None:
+        self.errors.append((line, message))
+
+    def display(self, max_errors: int = 20) -> None:
+        print(f"Загружено записей: {self.imported}.")
+        if self.skipped:
+            print(f"Пропущено уже существующих записей: {self.skipped}.")
+        if self.errors:
+            print(f"Отклонено записей: {len(self.errors)}.")
+            for line, message in self.errors[:max_errors]:
+                print(f"- строка {line}: {message}")
+            if len(self.errors) > max_errors:
+                print(f"... и ещё {len(self.errors) - max_errors}.")
+
+
+
+def detect_format(path: Path) -> str:
+    suffix = Path(path).suffix.lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"Не удалось определить формат файла {path}: ожидается .csv или .jsonl.")
+
+
+def read_rows(path: Path, file_format: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Потоково читает записи файла. Возвращает пары (номер строки, запись)."""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as file:
+        if file_format == "csv":
+            reader = csv.DictReader(file)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for line_number, line in enumerate(file, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_number, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_number, {"__error__": f"некорректный JSON: {e}"}
+
+
+
+def _text(row: Dict[str, Any], field: str) -> str:
+    value = row.get(field)
+    return "" if value is None else str(value)
+
+
+def _parse_answers(value: Any) -> List[str]:
+    if isinstance(value, list):
+        return [str(answer) for answer in value]
+    if not value:
+        return []
+    text = str(value)
+    answers, current = [], []
+    position = 0
+    while position < len(text):
+        character = text[position]
+        following = text[position + 1:position + 2]
+        if character == ANSWERS_ESCAPE and following in (ANSWERS_SEPARATOR, ANSWERS_ESCAPE):
+            current.append(following)
+            position += 2
+            continue
+        if character == ANSWERS_SEPARATOR:
+            answers.append("".join(current))
+            current = []
+        else:
+            # Одиночная обратная косая черта (например, из старой выгрузки) остаётся как есть
+            current.append(character)
+        position += 1
+    answers.append("".join(current))
+    return answers
+
+
+def _join_answers(answers: List[str]) -> str:
+    return ANSWERS_SEPARATOR.join(
+        answer.replace(ANSWERS_ESCAPE, ANSWERS_ESCAPE * 2).replace(ANSWERS_SEPARATOR, ANSWERS_ESCAPE + ANSWERS_SEPARATOR)
+        for answer in answers
+    )
+
+
+class _ExamCache:
+    """Кэш экзаменов на время загрузки, чтобы не разбирать один экзамен для каждого студента."""
+
+    def __init__(self) -> None:
+        self._exams: Dict[str, Optional[Exam]] = {}
+
+    def get(self, subject: str) -> Optional[Exam]:
+        if subject not in self._exams:
+            exam_data = Exam.storage().get(subject)
+            exam = Exam.intern(Exam.from_dict(exam_data)) if exam_data else None
+            if exam is not None:
+                # Студенты ссылаются на версию экзамена, поэтому она должна быть в архиве
+                Exam.archive(exam)
+            self._exams[subject] = exam
+        return self._exams[subject]
+
+
+def build_student(row: Dict[str, Any], exams: _ExamCache) -> Tuple[str, Dict[str, Any]]:
+    """Проверяет запись студента по правилам Student.set_info и возвращает (ключ, запись)."""
+    if row.get("exam_result"):
+        # Полная запись в формате Student.to_dict (так выгружает export_records в JSONL)
+        exam_result = PreviousExamAttempt.from_dict(row["exam_result"])
+        subject, answers = exam_result.exam.subject, exam_result.answers
+    else:
+        subject, answers = _text(row, "subject").strip(), _parse_answers(row.get("answers"))
+
+    student = Student(Student.validate_id(_text(row, "id")))
+    student.last_name = Student.validate_last_name(_text(row, "last_name"))
+    student.first_name = Student.validate_first_name(_text(row, "first_name"))
+
+    if subject:
+        exam = exams.get(Exam.validate_subject(subject))
+        if exam is None:
+            raise ValueError(f"Экзамен по предмету '{subject}' не найден.")
+        answers = [answer.strip() for answer in answers]
+        if len(answers) != len(exam.questions):
+            raise ValueError(f"Ожидается ответов: {len(exam.questions)}, получено: {len(answers)}.")
+        if not all(answers):
+            raise ValueError("Ответ не может быть пустым.")
+        student.exam_result = PreviousExamAttempt(exam, answers)
+
+    if row.get("materials"):
+        student.materials = [EducationalMaterial.from_dict(material) for material in row["materials"]]
+    if row.get("unexplored_topics"):
+        student.unexplored_topics = set(row["unexplored_topics"])
+    return student.id, student.to_dict()
+
+
+def build_exam_question(row: Dict[str, Any]) -> Tuple[str, Tuple[str, str, str]]:
+    """Проверяет строку с вопросом экзамена. Возвращает (предмет, вопрос)."""
+    subject = Exam.validate_subject(_text(row, "subject"))
+    return subject, Exam.validate_question(_text(row, "topic"), _text(row, "question"), _text(row, "answer"))
+
+
+def build_material(row: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    material = EducationalMaterial.validate(
+        _text(row, "subject"), _text(row, "topic"), _text(row, "title"), _text(row, "author")
+    )
+    return material.topic, material.to_dict()
+
+
+
+def import_records(entity: str, path: Path, file_format: Optional[str] = None,
+                   batch_size: Optional[int] = None, overwrite: bool = False) -> ImportReport:
+    """Массовая загрузка студентов, экзаменов или учебных материалов из CSV/JSONL.
+
+    Записи читаются потоково и проверяются по тем же правилам, что и в set_info.
+    Корректные записи сохраняются пакетами: одна запись в хранилище на batch_size записей
+    (по умолчанию весь файл сохраняется одним пакетом).
+    """
+    file_format = file_format or detect_format(path)
+    if entity == "exams":
+        return _import_exams(path, file_format, overwrite)
+
+    exams = _ExamCache()
+    entity_class, build, index = {
+        "students": (Student, lambda row: build_student(row, exams), None),
+        # Материалы сохраняются в обход save(), поэтому индекс предметов обновляется отдельно
+        "materials": (EducationalMaterial, build_material, EducationalMaterial.index_records),
+    }[entity]
+    storage = entity_class.storage()
+    report = ImportReport()
+    batch: Dict[str, Dict[str, Any]] = {}
+
+    for line, row in read_rows(path, file_format):
+        try:
+            if "__error__" in row:
+                raise ValueError(row["__error__"])
+            key, record = build(row)
+        except Exception as e:
+            report.add_error(line, str(e))
+            continue
+
+        if not overwrite and (key in batch or storage.contains(key)):
+            report.skipped += 1
+            continue
+        batch[key] = record
+        if batch_size and len(batch) >= batch_size:
+            _commit(storage, batch, report, index)
+
+    _commit(storage, batch, report, index)
+    return report
+
+
+def _import_exams(path: Path, file_format: str, overwrite: bool) -> ImportReport:
+    """Экзамены собираются из строк-вопросов целиком и сохраняются одной записью."""
+    storage = Exam.storage()
+    report = ImportReport()
+    # Вопросы экзаменов по предметам; экзамен создаётся один раз со всеми вопросами
+    questions: Dict[str, List[Tuple[str, str, str]]] = {}
+
+    for line, row in read_rows(path, file_format):
+        try:
+            if "__error__" in row:
+                raise ValueError(row["__error__"])
+            if "questions" in row:
+                # Экзамен целиком в формате Exam.to_dict
+                subject = Exam.validate_subject(_text(row, "subject"))
+                exam_questions = [Exam.validate_question(*question) for question in row["questions"]]
+                questions.setdefault(subject, []).extend(exam_questions)
+            else:
+                subject, question = build_exam_question(row)
+                questions.setdefault(subject, []).append(question)
+        except Exception as e:
+            report.add_error(line, str(e))
+
+    batch = {}
+    for subject, exam_questions in questions.items():
+        if not overwrite and storage.contains(subject):
+            report.skipped += 1
+            continue
+        exam = Exam(subject)
+        exam.questions = exam_questions
+        batch[subject] = exam.to_dict()
+    _commit(storage, batch, report)
+    return report
+
+
+def _commit(storage, batch: Dict[str, Dict[str, Any]], report: ImportReport, index=None) -> None:
+    if not batch:
+        return
+    storage.put_many(batch)
+    storage.flush()
+    if index is not None:
+        index(batch)
+    report.imported += len(batch)
+    batch.clear()
+
+
+
+def export_records(entity: str, path: Path, file_format: Optional[str] = None) -> int:
+    """Выгрузка всех записей сущности в CSV/JSONL. Возвращает число выгруженных записей.
+
+    JSONL содержит записи целиком (в формате to_dict) и загружается обратно без потерь.
+    CSV содержит только поля, перечисленные в STUDENT_FIELDS, EXAM_FIELDS и MATERIAL_FIELDS.
+    """
+    file_format = file_format or detect_format(path)
+    entity_class, fields, to_rows = {
+        "students": (Student, STUDENT_FIELDS, _student_rows),
+        "exams": (Exam, EXAM_FIELDS, _exam_rows),
+        "materials": (EducationalMaterial, MATERIAL_FIELDS, _material_rows),
+    }[entity]
+    records = entity_class.storage().load_all()
+
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        if file_format == "csv":
+            writer = csv.DictWriter(file, fieldnames=fields)
+            writer.writeheader()
+            for record in records.values():
+                writer.writerows(to_rows(record))
+        else:
+            for record in records.values():
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return len(records)
+
+
+def _student_rows(record: Dict[str, Any]) -> List[Dict[str, Any]]:
+    exam_result = record.get("exam_result") or {}
+    return [{
+        "id": record.get("id"),
+        "last_name": record.get("last_name"),
+        "first_name": record.get("first_name"),
+        "subject": (exam_result.get("exam") or {}).get("subject", ""),
+        "answers": _join_answers(exam_result.get("answers", [])),
+    }]
+
+
+def _exam_rows(record: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {"subject": record.get("subject"), "topic": topic, "question": question, "answer": answer}
+        for topic, question, answer in record.get("questions", [])
+    ]
+
+
+def _material_rows(record: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{field: record.get(field) for field in MATERIAL_FIELDS}]
@@ -0,0 +1,151 @@
+﻿from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from entities.exam import Exam
+from entities.previous_exam_attempt import PreviousExamAttempt
+from entities.student import Student
+
+
+
+class StudentSummary:
+    """Итоги анализа ошибок одного студента."""
+
+    def __init__(self, id: str, last_name: str, first_name: str, subject: Optional[str],
+                 score: int, errors: List[Tuple[int, str, str, str, str]], unexplored_topics: List[str]) -> None:
+        self.id: str = id
+        self.last_name: str = last_name
+        self.first_name: str = first_name
+        self.subject: Optional[str] = subject
+        self.score: int = score
+        self.errors: List[Tuple[int, str, str, str, str]] = errors
+        self.unexplored_topics: List[str] = unexplored_topics
+
+
+
+class CohortReport:
+    """Сводный отчёт по ошибкам всех студентов."""
+
+    def __init__(self) -> None:
+        self.students: List[StudentSummary] = []
+        self.topic_errors: Counter = Counter()
+        self.failed: List[Tuple[str, str]] = []
+        self.updated: int = 0
+
+    def merge(self, summaries: List[StudentSummary], failed: List[Tuple[str, str]]) -> None:
+        for summary in summaries:
+            self.students.append(summary)
+            self.topic_errors.update(error[2] for error in summary.errors)
+        self.failed.extend(failed)
+
+    def display(self, max_topics: int = 10) -> None:
+        with_errors = [summary for summary in self.students if summary.errors]
+        print(f"\nПроанализировано студентов: {len(self.students)}.")
+        print(f"Студентов с ошибками: {len(with_errors)}.")
+        print(f"Обновлено записей студентов: {self.updated}.")
+
+        if self.topic_errors:
+            print("\nТемы с наибольшим числом ошибок:")
+            for topic, count in self.topic_errors.most_common(max_topics):
+                print(f"- {topic}: {count}")
+
+        if self.failed:
+            print("\nНе удалось проанализировать:")
+            for id, message in self.failed:
+                print(f"- {id}: {message}")
+
+
+
+def _init_worker(exams: List[Dict[str, Any]]) -> None:
+    """Заполняет общий кэш экзаменов процесса, чтобы рабочим не нужно было читать хранилище."""
+    for exam_data in exams:
+        Exam.intern(Exam.from_dict(exam_data))
+
+
+# Вычисленные рабочим процессом поля студента: (id, предмет, число баллов, ошибки)
+_Analysis = Tuple[str, str, int, List[Tuple[int, str, str, str, str]]]
+
+
+def _analyze_chunk(attempts: List[Tuple[str, Dict[str, Any]]]) -> Tuple[List[_Analysis], List[Tuple[str, str]]]:
+    """Проверяет попытки (id студента, запись exam_result) и возвращает только вычисленные поля."""
+    results = []
+    failed = []
+    for id, exam_result_data in attempts:
+        try:
+            student = Student(id)
+            student.exam_result = PreviousExamAttempt.from_dict(exam_result_data)
+            results.append((id, student.exam_result.exam.subject,
+                            student.exam_result.calculate_score(), student.collect_errors()))
+        except Exception as e:
+            failed.append((id, str(e)))
+    return results, failed
+
+
+def _referenced_exams(records: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Собирает экзамены, на которые ссылаются записи студентов (по одному на версию)."""
+    exams = {}
+    for record in records.values():
+        exam_result = record.get("exam_result") or {}
+        exam_data = exam_result.get("exam") or {}
+        if "version" in exam_data:
+            key = (exam_data["subject"], exam_data["version"])
+            if key not in exams:
+                try:
+                    exams[key] = Exam.resolve(*key).to_dict()
+                except ValueError:
+                    # Ошибка попадёт в отчёт при анализе студента
+                    pass
+    return list(exams.values())
+
+
+def analyze_cohort(workers: Optional[int] = None, parallel_threshold: int = 2000) -> CohortReport:
+    """Анализ ошибок всех студентов.
+
+    Попытки студентов делятся на части и проверяются в пуле процессов
+    (при числе студентов меньше parallel_threshold — в текущем процессе):
+    рабочие получают только id и попытки и возвращают только баллы и ошибки.
+    Неизученные темы обновляются так же, как в Student.analyze_errors, а все
+    изменённые записи сохраняются одной пакетной записью.
+    """
+    storage = Student.storage()
+    records = storage.load_all()
+    report = CohortReport()
+    if not records:
+        return report
+
+    # Рабочим процессам передаются только id и попытки, а не записи студентов целиком
+    attempts = [(id, record["exam_result"]) for id, record in records.items() if record.get("exam_result")]
+    results, failed = [], []
+    workers = workers or os.cpu_count() or 1
+    if len(records) < parallel_threshold or workers == 1:
+        results, failed = _analyze_chunk(attempts)
+    elif attempts:
+        chunk_size = max(1, -(-len(attempts) // (workers * 4)))
+        chunks = [attempts[i:i + chunk_size] for i in range(0, len(attempts), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(_referenced_exams(records),)) as executor:
+            for chunk_results, chunk_failed in executor.map(_analyze_chunk, chunks):
+                results.extend(chunk_results)
+                failed.extend(chunk_failed)
+
+    analyzed = {id: (subject, score, errors) for id, subject, score, errors in results}
+    failed_ids = {id for id, _ in failed}
+    summaries = []
+    updated = {}
+    for id, record in records.items():
+        if id in failed_ids:
+            continue
+        subject, score, errors = analyzed.get(id, (None, 0, []))
+        unexplored_topics = sorted(Student.topics_to_explore(errors)) if errors else []
+        summaries.append(StudentSummary(id, record.get("last_name"), record.get("first_name"),
+                                        subject, score, errors, unexplored_topics))
+        if errors and set(record.get("unexplored_topics") or []) != set(unexplored_topics):
+            updated[id] = dict(record, unexplored_topics=unexplored_topics)
+    report.merge(summaries, failed)
+
+    if updated:
+        storage.put_many(updated)
+        storage.flush()
+    report.updated = len(updated)
+    return report
@@ -1,7 +1,9 @@
 ﻿import json
-import os
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from persistence.base import Storage
+from persistence.registry import get_storage
 
 
 
@@ -17,42 +19,122 @@ class EducationalMaterial:
     def set_info(self) -> None:
         """Метод для ввода данных учебного материала."""
         try:
-            self.subject = input("Введите название предмета: ").strip()
-            if not self.subject:
-                raise ValueError("Ответ не может быть пустым.")
-
-            self.topic = input("Введите тему: ").strip()
-            if not self.topic:
-                raise ValueError("Тема не может быть пустой.")
+            self.subject = self._require_text(input("Введите название предмета: "), "Ответ не может быть пустым.")
+            self.topic = self._require_text(input("Введите тему: "), "Тема не может быть пустой.")
 
             # Проверка на дублирование материала
-            materials = self.load_all()
-            if self.topic in materials:
+            if self.storage().contains(self.topic):
                 print(f"Материал с темой '{self.topic}' уже существует.")
                 return
 
-            self.title = input("Введите название материала: ").strip()
-            if not self.title:
-                raise ValueError("Название не может быть пустым.")
-
-            self.author = input("Введите автора материала: ").strip()
-            if not self.author:
-                raise ValueError("Автор не может быть пустым.")
+            self.title = self._require_text(input("Введите название материала: "), "Название не может быть пустым.")
+            self.author = self._require_text(input("Введите автора материала: "), "Автор не может быть пустым.")
 
             print("\nДанные учебного материала успешно сохранены!")
             self.save()
         except Exception as e:
             print(f"Ошибка при вводе данных учебного материала: {e}")
 
+    @classmethod
+    def validate(cls, subject: str, topic: str, title: str, author: str) -> 'EducationalMaterial':
+        """Метод для создания материала с теми же проверками, что и при вводе с клавиатуры."""
+        material = cls(
+            topic=cls._require_text(topic, "Тема не может быть пустой."),
+            title=cls._require_text(title, "Название не может быть пустым."),
+            author=cls._require_text(author, "Автор не может быть пустым.")
+        )
+        material.subject = cls._require_text(subject, "Название предмета не может быть пустым.")
+        return material
+
+    @staticmethod
+    def _require_text(value: str, message: str) -> str:
+        value = value.strip()
+        if not value:
+            raise ValueError(message)
+        return value
+
+    @classmethod
+    def storage(cls) -> Storage:
+        """Метод для получения общего хранилища учебных материалов."""
+        return get_storage(cls.STORAGE_FILE)
+
+    @classmethod
+    def subjects_storage(cls) -> Storage:
+        """Метод для получения индекса предмет -> темы материалов (хранится рядом с материалами)."""
+        return get_storage(cls.STORAGE_FILE.with_name(f"{cls.STORAGE_FILE.stem}_subjects.json"))
+
+    def key(self) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """Метод для получения ключа материала (тема, название, автор) для поиска повторов."""
+        return self.topic, self.title, self.author
+
+    @classmethod
+    def find(cls, topic: str) -> Optional['EducationalMaterial']:
+        """Метод для поиска материала по теме: читается только одна запись хранилища."""
+        material_data = cls.storage().get(topic)
+        return cls.from_dict(material_data) if material_data else None
+
+    @classmethod
+    def find_by_subject(cls, subject: str) -> List['EducationalMaterial']:
+        """Метод для поиска материалов по предмету через индекс предметов."""
+        entry = cls.subjects_storage().get(subject)
+        if not entry:
+            return []
+        storage = cls.storage()
+        materials = (storage.get(topic) for topic in entry["topics"])
+        # Перезаписанный в обход save() материал мог сменить предмет
+        return [cls.from_dict(material) for material in materials if material and material.get("subject") == subject]
+
+    @classmethod
+    def index_records(cls, records: Dict[str, Dict[str, Any]]) -> None:
+        """Метод для добавления в индекс предметов материалов, сохранённых в обход save()."""
+        # Темы собираются по предметам для всего пакета, и запись индекса каждого предмета
+        # обновляется один раз; словарь сохраняет порядок тем и проверяет повторы за O(1)
+        new_topics: Dict[Optional[str], Dict[str, None]] = {}
+        for topic, record in records.items():
+            new_topics.setdefault(record.get("subject"), {})[topic] = None
+
+        index = cls.subjects_storage()
+        changed = {}
+        for subject, topics in new_topics.items():
+            entry = index.get(subject)
+            known = dict.fromkeys(entry["topics"]) if entry else {}
+            size = len(known)
+            known.update(topics)
+            if len(known) != size:
+                changed[subject] = {"subject": subject, "topics": list(known)}
+        if changed:
+            index.put_many(changed)
+
+    @classmethod
+    def rebuild_index(cls) -> None:
+        """Метод для построения индекса предметов заново по всем материалам."""
+        index = {}
+        for topic, record in cls.storage().iter_records():
+            index.setdefault(record.get("subject"), {"subject": record.get("subject"), "topics": []})["topics"].append(topic)
+        cls.subjects_storage().replace_all(index)
+
+    @classmethod
+    def _unindex(cls, subject: Optional[str], topic: str) -> None:
+        index = cls.subjects_storage()
+        entry = index.get(subject)
+        topics = dict.fromkeys(entry["topics"]) if entry else {}
+        if topic not in topics:
+            return
+        del topics[topic]
+        if topics:
+            index.put(subject, {"subject": subject, "topics": list(topics)})
+        else:
+            index.delete(subject)
+
     @classmethod
     def load(cls, topic: str) -> Optional['EducationalMaterial']:
         """Метод для загрузки учебного материала по теме."""
         try:
-            materials = cls.load_all()
-            if topic not in materials:
+            material_data = cls.storage().get(topic)
+            if material_data is None:
                 print(f"Материал с темой '{topic}' не найден.")
                 return None
-            return cls.from_dict(materials[topic])
+            return cls.from_dict(material_data)
         except Exception as e:
             print(f"Ошибка при загрузке учебного материала: {e}")
             return None
@@ -60,10 +142,7 @@ class EducationalMaterial:
     @classmethod
     def load_all(cls) -> Dict[str, Dict[str, Any]]:
         try:
-            if not cls.STORAGE_FILE.exists():
-                return {}
-            with open(cls.STORAGE_FILE, 'r', encoding='utf-8') as file:
-                return json.load(file)
+            return cls.storage().load_all()
         except json.JSONDecodeError:
             print("Ошибка: Файл с учебными материалами поврежден или имеет неверный формат.")
             return {}
@@ -77,9 +156,12 @@ class EducationalMaterial:
     def save(self) -> None:
         """Метод для сохранения учебного материала."""
         try:
-            materials = self.load_all()
-            materials[self.topic] = self.to_dict()
-            self.save_all(materials)
+            previous = self.storage().get(self.topic)
+            if previous and previous.get("subject") != self.subject:
+                self._unindex(previous.get("subject"), self.topic)
+            record = self.to_dict()
+            self.storage().put(self.topic, record)
+            self.index_records({self.topic: record})
             print(f"Учебный материал '{self.title}' успешно сохранён.")
         except Exception as e:
             print(f"Ошибка при сохранении учебного материала: {e}")
@@ -88,19 +170,17 @@ class EducationalMaterial:
     def save_all(cls, materials: Dict[str, Dict[str, Any]]) -> None:
         """Метод для сохранения всех учебных материалов в файл."""
         try:
-            os.makedirs(os.path.dirname(cls.STORAGE_FILE), exist_ok=True)
-            with open(cls.STORAGE_FILE, 'w', encoding='utf-8') as file:
-                json.dump(materials, file, indent=4, ensure_ascii=False)
+            cls.storage().replace_all(materials)
+            cls.rebuild_index()
         except Exception as e:
             print(f"Ошибка при сохранении файла с учебными материалами: {e}")
 
     def delete(self) -> None:
         """Метод для удаления учебного материала."""
         try:
-            materials = self.load_all()
-            if self.topic in materials:
-                del materials[self.topic]
-                self.save_all(materials)
+            previous = self.storage().get(self.topic)
+            if self.storage().delete(self.topic):
+                self._unindex(previous.get("subject"), self.topic)
                 print(f"Учебный материал '{self.title}' удалён из системы.")
             else:
                 print(f"Учебный материал с темой '{self.topic}' не найден.")
@@ -1,60 +1,114 @@
-﻿import json
-import os
+﻿import hashlib
+import json
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+import sys
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from persistence.base import Storage
+from persistence.registry import get_storage
 
 
 
 class Exam:
     STORAGE_FILE = Path("storage/exams.json")
 
+    # Общие для процесса неизменяемые экземпляры экзаменов: (предмет, версия) -> Exam
+    _interned: Dict[Tuple[str, str], 'Exam'] = {}
+
     def __init__(self, subject: Optional[str] = None) -> None:
-        self.subject: str = subject
-        self.questions: List[Tuple[str, str, str]] = []
+        self._frozen = False
+        self._questions: Tuple[Tuple[str, str, str], ...] = ()
+        self.subject = subject
+
+    @property
+    def subject(self) -> str:
+        return self._subject
+
+    @subject.setter
+    def subject(self, subject: str) -> None:
+        self._check_mutable()
+        self._subject = subject
+        self._version = self._content_hash()
+
+    @property
+    def questions(self) -> Tuple[Tuple[str, str, str], ...]:
+        """Вопросы экзамена; кортеж нельзя изменить на месте, поэтому версия меняется только при присваивании."""
+        return self._questions
+
+    @questions.setter
+    def questions(self, questions: Iterable[Tuple[str, str, str]]) -> None:
+        self._check_mutable()
+        self._questions = tuple(questions)
+        self._version = self._content_hash()
+
+    @property
+    def version(self) -> str:
+        """Хэш содержимого экзамена: вычисляется при присваивании предмета или вопросов."""
+        return self._version
+
+    def _content_hash(self) -> str:
+        payload = json.dumps([self._subject, [list(question) for question in self._questions]], ensure_ascii=False)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+
+    def _check_mutable(self) -> None:
+        if self._frozen:
+            raise AttributeError("Общий экземпляр экзамена нельзя изменять.")
 
     def set_info(self) -> None:
         try:
-            self.subject = input("Введите название предмета: ").strip().title()
-            if not self.subject:
-                raise ValueError("Название предмета не может быть пустым.")
+            self.subject = self.validate_subject(input("Введите название предмета: "))
 
             # Проверка на дублирование экзамена
-            exams = self.load_all()
-            if self.subject in exams:
+            if self.storage().contains(self.subject):
                 print(f"Экзамен по предмету '{self.subject}' уже существует.")
                 return
 
             # Инициализация списка для хранения вопросов
-            self.questions = []
+            questions = []
 
             # Цикл для ввода вопросов
             while True:
                 print("\nВведите данные для нового вопроса (тема, вопрос, ответ).")
-                topic = input("Введите тему: ").strip()
-                if not topic:
-                    raise ValueError("Тема не может быть пустой.")
-
-                question = input("Введите вопрос: ").strip()
-                if not question:
-                    raise ValueError("Вопрос не может быть пустым.")
-
-                answer = input("Введите ответ: ").strip()
-                if not answer:
-                    raise ValueError("Ответ не может быть пустым.")
+                topic = self._require_text(input("Введите тему: "), "Тема не может быть пустой.")
+                question = self._require_text(input("Введите вопрос: "), "Вопрос не может быть пустым.")
+                answer = self._require_text(input("Введите ответ: "), "Ответ не может быть пустым.")
 
                 # Добавляем вопрос в список
-                self.questions.append((topic, question, answer))
+                questions.append((topic, question, answer))
 
                 # Спрашиваем, хочет ли пользователь добавить ещё один вопрос
                 another = input("Хотите добавить ещё один вопрос? (да/нет): ").strip().lower()
                 if another != "да":
                     break
 
+            self.questions = questions
             print("\nДанные экзамена успешно сохранены!")
             self.save()
         except Exception as e:
             print(f"Ошибка при вводе данных экзамена: {e}")
 
+    @staticmethod
+    def validate_subject(subject: str) -> str:
+        subject = subject.strip().title()
+        if not subject:
+            raise ValueError("Название предмета не может быть пустым.")
+        return subject
+
+    @classmethod
+    def validate_question(cls, topic: str, question: str, answer: str) -> Tuple[str, str, str]:
+        return (
+            cls._require_text(topic, "Тема не может быть пустой."),
+            cls._require_text(question, "Вопрос не может быть пустым."),
+            cls._require_text(answer, "Ответ не может быть пустым.")
+        )
+
+    @staticmethod
+    def _require_text(value: str, message: str) -> str:
+        value = value.strip()
+        if not value:
+            raise ValueError(message)
+        return value
+
     @classmethod
     def display_exams(cls) -> None:
         try:
@@ -65,14 +119,18 @@ class Exam:
         except Exception as e:
             print(f"Ошибка при отображении списка экзаменов: {e}")
 
+    @classmethod
+    def storage(cls) -> Storage:
+        return get_storage(cls.STORAGE_FILE)
+
     @classmethod
     def load(cls, subject: str) -> Optional['Exam']:
         try:
-            exams = cls.load_all()
-            if subject not in exams:
+            exam_data = cls.storage().get(subject)
+            if exam_data is None:
                 print(f"Экзамен по предмету '{subject}' не найден.")
                 return None
-            return cls.from_dict(exams[subject])
+            return cls.from_dict(exam_data)
         except Exception as e:
             print(f"Ошибка при загрузке экзамена: {e}")
             return None
@@ -80,10 +138,7 @@ class Exam:
     @classmethod
     def load_all(cls) -> Dict[str, Dict[str, Any]]:
         try:
-            if not cls.STORAGE_FILE.exists():
-                return {}
-            with open(cls.STORAGE_FILE, 'r', encoding='utf-8') as file:
-                return json.load(file)
+            return cls.storage().load_all()
         except json.JSONDecodeError:
             print("Ошибка: Файл с экзаменами поврежден или имеет неверный формат.")
             return {}
@@ -94,11 +149,53 @@ class Exam:
             print(f"Неизвестная ошибка при загрузке экзаменов: {e}")
             return {}
 
+    @classmethod
+    def versions_storage(cls) -> Storage:
+        """Архив всех версий экзаменов, на которые ссылаются результаты студентов."""
+        return get_storage(cls.STORAGE_FILE.with_name(f"{cls.STORAGE_FILE.stem}_versions.json"))
+
+    @classmethod
+    def intern(cls, exam: 'Exam') -> 'Exam':
+        """Возвращает общий экземпляр экзамена с тем же содержимым.
+
+        Общий экземпляр — неизменяемая копия exam, поэтому по версии всегда
+        находится то содержимое, из которого она вычислена.
+        """
+        key = (exam.subject, exam.version)
+        shared = cls._interned.get(key)
+        if shared is None:
+            shared = cls(exam.subject)
+            shared.questions = exam.questions
+            shared._frozen = True
+            cls._interned[key] = shared
+        return shared
+
+    @classmethod
+    def archive(cls, exam: 'Exam') -> None:
+        """Сохраняет версию экзамена в архив, если её там ещё нет."""
+        key = f"{exam.subject}@{exam.version}"
+        versions = cls.versions_storage()
+        if not versions.contains(key):
+            versions.put(key, exam.to_dict())
+
+    @classmethod
+    def resolve(cls, subject: str, version: str) -> 'Exam':
+        """Находит экзамен по предмету и версии: в общем кэше, в архиве версий или среди текущих экзаменов."""
+        exam = cls._interned.get((subject, version))
+        if exam is not None:
+            return exam
+
+        exam_data = cls.versions_storage().get(f"{subject}@{version}")
+        if exam_data is None:
+            exam_data = cls.storage().get(subject)
+            if exam_data is None or cls.from_dict(exam_data).version != version:
+                raise ValueError(f"Экзамен по предмету '{subject}' версии {version} не найден.")
+        return cls.intern(cls.from_dict(exam_data))
+
     def save(self) -> None:
         try:
-            exams = self.load_all()
-            exams[self.subject] = self.to_dict()
-            self.save_all(exams)
+            self.storage().put(self.subject, self.to_dict())
+            self.archive(self)
             print(f"Экзамен по предмету '{self.subject}' успешно сохранён.")
         except Exception as e:
             print(f"Ошибка при сохранении экзамена: {e}")
@@ -106,18 +203,13 @@ class Exam:
     @classmethod
     def save_all(cls, exams: Dict[str, Dict[str, Any]]) -> None:
         try:
-            os.makedirs(cls.STORAGE_FILE.parent, exist_ok=True)
-            with open(cls.STORAGE_FILE, 'w', encoding='utf-8') as file:
-                json.dump(exams, file, indent=4, ensure_ascii=False)
+            cls.storage().replace_all(exams)
         except Exception as e:
             print(f"Ошибка при сохранении файла с экзаменами: {e}")
 
     def delete(self) -> None:
         try:
-            exams = self.load_all()
-            if self.subject in exams:
-                del exams[self.subject]
-                self.save_all(exams)
+            if self.storage().delete(self.subject):
                 print(f"Экзамен по предмету '{self.subject}' удалён из системы.")
             else:
                 print(f"Экзамен по предмету '{self.subject}' не найден.")
@@ -133,5 +225,6 @@ class Exam:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Exam':
         exam = cls(subject=data.get('subject'))
-        exam.questions = [tuple(question) for question in data.get('questions', [])]  # Преобразуем вопросы в кортежи
+        # Преобразуем вопросы в кортежи; темы повторяются, поэтому храним их в единственном экземпляре
+        exam.questions = [(sys.intern(topic), question, answer) for topic, question, answer in data.get('questions', [])]
         return exam
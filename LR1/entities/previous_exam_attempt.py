@@ -10,8 +10,9 @@ class PreviousExamAttempt:
         self.answers: List[str] = answers
 
     def to_dict(self) -> Dict[str, Any]:
+        # Вместо текста экзамена храним ссылку на его версию, сам экзамен лежит в архиве версий
         return {
-            "exam": self.exam.to_dict(),
+            "exam": {"subject": self.exam.subject, "version": self.exam.version},
             "answers": self.answers
         }
 
@@ -21,7 +22,12 @@ class PreviousExamAttempt:
             if not data or 'exam' not in data or 'answers' not in data:
                 raise ValueError("Некорректные данные для создания PreviousExamAttempt.")
 
-            exam = Exam.from_dict(data['exam'])
+            exam_data = data['exam']
+            if 'questions' in exam_data:
+                # Старый формат: экзамен записан целиком
+                exam = Exam.intern(Exam.from_dict(exam_data))
+            else:
+                exam = Exam.resolve(exam_data['subject'], exam_data['version'])
             answers = data['answers']
 
             if not isinstance(answers, list):
@@ -1,10 +1,11 @@
 ﻿import json
-import os
 from pathlib import Path
 import random
-from typing import Any, Dict, List, Optional, Tuple, Set
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Set
 
 from entities.exam import Exam
+from persistence.base import Storage
+from persistence.registry import get_storage
 
 from .previous_exam_attempt import PreviousExamAttempt
 from .educational_materials import EducationalMaterial
@@ -19,33 +20,51 @@ class Student:
         self.last_name: Optional[str] = None
         self.first_name: Optional[str] = None
         self.exam_result: Optional[PreviousExamAttempt] = None
-        self.materials: Optional[List[EducationalMaterial]] = None
+        self.materials: Optional[Tuple[EducationalMaterial, ...]] = None
         self.unexplored_topics: Optional[Set[str]] = None
 
+    @property
+    def materials(self) -> Optional[Tuple[EducationalMaterial, ...]]:
+        # Кортеж нельзя изменить в обход add_material, поэтому множество ключей не устаревает
+        return None if self._materials is None else tuple(self._materials)
+
+    @materials.setter
+    def materials(self, materials: Optional[Iterable[EducationalMaterial]]) -> None:
+        self._materials = None if materials is None else list(materials)
+        # Множество ключей материалов для поиска повторов строится при первом обращении
+        self._material_keys: Optional[Set[Tuple[Optional[str], Optional[str], Optional[str]]]] = None
+
+    def _material_key_set(self) -> Set[Tuple[Optional[str], Optional[str], Optional[str]]]:
+        if self._material_keys is None:
+            self._material_keys = {material.key() for material in self._materials or []}
+        return self._material_keys
+
+    def has_material(self, material: EducationalMaterial) -> bool:
+        """Метод для проверки, есть ли такой материал в списке студента."""
+        return material.key() in self._material_key_set()
+
+    def add_material(self, material: EducationalMaterial) -> bool:
+        """Метод для добавления материала без повторов. Возвращает False, если материал уже есть."""
+        keys = self._material_key_set()
+        if material.key() in keys:
+            return False
+        if self._materials is None:
+            self._materials = []
+        self._materials.append(material)
+        keys.add(material.key())
+        return True
+
     def set_info(self) -> None:
         try:
-            self.id = input("Введите номер студенческого билета: ").strip()
-            if not self.id:
-                raise ValueError("Номер студенческого билета не может быть пустым.")
-            if not self.id.isdigit():
-                raise ValueError("Номер студенческого билета может содержать только цифры!")
+            self.id = self.validate_id(input("Введите номер студенческого билета: "))
 
             # Проверка на дублирование студента
             if self.id_exist(self.id):
                 print(f"Студент с номером '{self.id}' уже существует.")
                 return
 
-            self.last_name = input("Введите фамилию студента: ").strip().title()
-            if not self.last_name:
-                raise ValueError("Фамилия не может быть пустой.")
-            if not self.last_name.isalpha():
-                raise ValueError("Фамилия может содержать только буквы!")
-
-            self.first_name = input("Введите имя студента: ").strip().title()
-            if not self.first_name:
-                raise ValueError("Имя не может быть пустым.")
-            if not self.first_name.isalpha():
-                raise ValueError("Имя может содержать только буквы!")
+            self.last_name = self.validate_last_name(input("Введите фамилию студента: "))
+            self.first_name = self.validate_first_name(input("Введите имя студента: "))
 
             
             self.exam_result = self.set_exam_result()
@@ -61,6 +80,36 @@ class Student:
         except Exception as e:
             print(f"Неизвестная ошибка: {e}")
 
+    @staticmethod
+    def validate_id(id: str) -> str:
+        """Метод для проверки номера студенческого билета. Возвращает очищенное значение."""
+        id = id.strip()
+        if not id:
+            raise ValueError("Номер студенческого билета не может быть пустым.")
+        if not id.isdigit():
+            raise ValueError("Номер студенческого билета может содержать только цифры!")
+        return id
+
+    @staticmethod
+    def validate_last_name(last_name: str) -> str:
+        """Метод для проверки фамилии. Возвращает фамилию с заглавной буквы."""
+        last_name = last_name.strip().title()
+        if not last_name:
+            raise ValueError("Фамилия не может быть пустой.")
+        if not last_name.isalpha():
+            raise ValueError("Фамилия может содержать только буквы!")
+        return last_name
+
+    @staticmethod
+    def validate_first_name(first_name: str) -> str:
+        """Метод для проверки имени. Возвращает имя с заглавной буквы."""
+        first_name = first_name.strip().title()
+        if not first_name:
+            raise ValueError("Имя не может быть пустым.")
+        if not first_name.isalpha():
+            raise ValueError("Имя может содержать только буквы!")
+        return first_name
+
     def set_exam_result(self) -> Optional[PreviousExamAttempt]:
         try:
             Exam.display_exams()
@@ -88,8 +137,8 @@ class Student:
             print(f"Ошибка при вводе результатов экзамена: {e}")
             return None
 
-    def analyze_errors(self) -> List[Tuple[int, str, str, str, str]]:
-        """Метод для анализа ошибок в результатах экзамена."""
+    def collect_errors(self) -> List[Tuple[int, str, str, str, str]]:
+        """Метод для поиска ошибок в результатах экзамена без изменения и сохранения студента."""
         errors = []
 
         if not self.exam_result or not self.exam_result.exam.questions:
@@ -99,8 +148,19 @@ class Student:
             student_answer = self.exam_result.answers[i]
             if student_answer != correct_answer:
                 errors.append((i, question, topic, student_answer, correct_answer))
-                self.unexplored_topics = set()
-                self.unexplored_topics.add(topic)
+
+        return errors
+
+    @staticmethod
+    def topics_to_explore(errors: List[Tuple[int, str, str, str, str]]) -> Set[str]:
+        """Неизученные темы по списку ошибок: тема последней ошибки."""
+        return {errors[-1][2]}
+
+    def analyze_errors(self) -> List[Tuple[int, str, str, str, str]]:
+        """Метод для анализа ошибок в результатах экзамена."""
+        errors = self.collect_errors()
+        if errors:
+            self.unexplored_topics = self.topics_to_explore(errors)
 
         self.save()
 
@@ -133,15 +193,18 @@ class Student:
             matched_materials = False
             errors = self.analyze_errors()
 
+            materials_by_topic: Dict[Optional[str], List[EducationalMaterial]] = {}
+            for material in self.materials:
+                materials_by_topic.setdefault(material.topic, []).append(material)
+
             for error in errors:
                 found_material = False
-                for material in self.materials:
-                    if error[2] == material.topic:
-                        if self.unexplored_topics:
-                            self.unexplored_topics.discard(material.topic)
-                        print(f"{self.last_name} {self.first_name} изучил(а) тему {material.topic} по литературе {material.title}.")
-                        found_material = True
-                        matched_materials = True
+                for material in materials_by_topic.get(error[2], ()):
+                    if self.unexplored_topics:
+                        self.unexplored_topics.discard(material.topic)
+                    print(f"{self.last_name} {self.first_name} изучил(а) тему {material.topic} по литературе {material.title}.")
+                    found_material = True
+                    matched_materials = True
 
                 if not found_material:
                     print(f"Для темы {error[2]} не найдена соответствующая литература.")
@@ -206,14 +269,19 @@ class Student:
         except Exception as e:
             print(f"Ошибка при повторной сдаче экзамена: {e}")
 
+    @classmethod
+    def storage(cls) -> Storage:
+        """Метод для получения общего хранилища студентов."""
+        return get_storage(cls.STORAGE_FILE)
+
     @classmethod
     def load(cls, id: str) -> Optional['Student']:
         try:
-            students_data = cls.load_all()
-            if id not in students_data:
+            student_data = cls.storage().get(id)
+            if student_data is None:
                 print(f"Студент с ID '{id}' не найден.")
                 return None
-            return cls.from_dict(students_data[id])
+            return cls.from_dict(student_data)
         except Exception as e:
             print(f"Ошибка при загрузке студента: {e}")
             return None
@@ -222,10 +290,7 @@ class Student:
     def load_all(cls) -> Dict[str, Dict[str, Any]]:
         """Метод для загрузки всех студентов из файла."""
         try:
-            if not cls.STORAGE_FILE.exists():
-                return {}
-            with open(cls.STORAGE_FILE, 'r', encoding='utf-8') as file:
-                return json.load(file)
+            return cls.storage().load_all()
         except json.JSONDecodeError:
             print("Ошибка: Файл с данными студентов поврежден или имеет неверный формат.")
             return {}
@@ -236,12 +301,18 @@ class Student:
             print(f"Неизвестная ошибка при загрузке студентов: {e}")
             return {}
 
+    @classmethod
+    def iter_all(cls) -> Iterator['Student']:
+        """Метод для поочерёдной загрузки студентов: в памяти держится только текущий студент."""
+        for _, student_data in cls.storage().iter_records():
+            yield cls.from_dict(student_data)
+
     def save(self) -> None:
         """Метод для сохранения данных студента."""
         try:
-            students_data = self.load_all()
-            students_data[self.id] = self.to_dict()
-            self.save_all(students_data)
+            if self.exam_result:
+                Exam.archive(self.exam_result.exam)
+            self.storage().put(self.id, self.to_dict())
         except Exception as e:
             print(f"Ошибка при сохранении данных студента: {e}")
 
@@ -249,18 +320,13 @@ class Student:
     def save_all(cls, students_data: Dict[str, Dict[str, Any]]) -> None:
         """Метод для сохранения всех студентов в файл."""
         try:
-            os.makedirs(os.path.dirname(cls.STORAGE_FILE), exist_ok=True)
-            with open(cls.STORAGE_FILE, 'w', encoding='utf-8') as file:
-                json.dump(students_data, file, indent=4, ensure_ascii=False)
+            cls.storage().replace_all(students_data)
         except Exception as e:
             print(f"Ошибка при сохранении файла с данными студентов: {e}")
 
     def delete(self) -> None:
         try:
-            students_data = self.load_all()
-            if self.id in students_data:
-                del students_data[self.id]
-                self.save_all(students_data)
+            if self.storage().delete(self.id):
                 print(f"Студент {self.last_name} {self.first_name} удален из системы.")
             else:
                 print(f"Студент {self.last_name} {self.first_name} не найден!")
@@ -270,8 +336,11 @@ class Student:
     @classmethod
     def id_exist(cls, id: str) -> bool:
         """Метод для проверки существования студента по ID."""
-        students = cls.load_all()
-        return id in students
+        try:
+            return cls.storage().contains(id)
+        except Exception as e:
+            print(f"Ошибка при проверке студента: {e}")
+            return False
 
     def to_dict(self) -> Dict[str, Any]:
         """Метод для преобразования объекта в словарь."""
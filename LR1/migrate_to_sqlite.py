@@ -0,0 +1,50 @@
+﻿import argparse
+import json
+from pathlib import Path
+
+from entities.educational_materials import EducationalMaterial
+from entities.exam import Exam
+from entities.student import Student
+from persistence.sqlite_storage import SqliteStorage
+
+
+def migrate(json_file: Path, replace: bool) -> int:
+    """Переносит записи из JSON-файла в базу SQLite рядом с ним. Возвращает число записей."""
+    with open(json_file, 'r', encoding='utf-8') as file:
+        records = json.load(file)
+
+    storage = SqliteStorage(json_file)
+    try:
+        if replace:
+            storage.replace_all(records)
+        else:
+            storage.put_many(records)
+    finally:
+        storage.close()
+    return len(records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Перенос данных из storage/*.json в базы SQLite.")
+    parser.add_argument("files", type=Path, nargs="*",
+                        default=[Student.STORAGE_FILE, Exam.STORAGE_FILE, EducationalMaterial.STORAGE_FILE],
+                        help="JSON-файлы для переноса (по умолчанию файлы студентов, экзаменов и материалов)")
+    parser.add_argument("--replace", action="store_true",
+                        help="удалить из базы записи, которых нет в JSON-файле")
+    args = parser.parse_args()
+
+    for json_file in args.files:
+        if not json_file.exists():
+            print(f"Файл {json_file} не найден, пропускаем.")
+            continue
+        try:
+            count = migrate(json_file, args.replace)
+            print(f"{json_file}: перенесено записей: {count} -> {json_file.with_suffix('.sqlite3')}")
+        except json.JSONDecodeError:
+            print(f"Ошибка: файл {json_file} поврежден или имеет неверный формат.")
+
+    print("Чтобы работать с базой, запустите программу с LR1_STORAGE_BACKEND=sqlite.")
+
+
+if __name__ == "__main__":
+    main()
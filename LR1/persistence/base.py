@@ -0,0 +1,69 @@
+﻿from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+
+class StorageError(Exception):
+    """Ошибка работы с хранилищем данных."""
+
+
+
+class StorageConflictError(StorageError):
+    """Запись одновременно изменена несколькими процессами."""
+
+
+
+class Storage(ABC):
+    """Хранилище записей сущности: словарь ключ -> запись (словарь)."""
+
+    def __init__(self, path: Path) -> None:
+        self.path: Path = Path(path)
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Метод для получения записи по ключу."""
+        pass
+
+    @abstractmethod
+    def contains(self, key: str) -> bool:
+        """Метод для проверки существования записи по ключу."""
+        pass
+
+    @abstractmethod
+    def load_all(self) -> Dict[str, Dict[str, Any]]:
+        """Метод для получения всех записей хранилища."""
+        pass
+
+    def iter_records(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Метод для поочерёдного получения записей хранилища (пар ключ, запись)."""
+        yield from self.load_all().items()
+
+    @abstractmethod
+    def put(self, key: str, record: Dict[str, Any]) -> None:
+        """Метод для добавления или замены записи."""
+        pass
+
+    @abstractmethod
+    def put_many(self, records: Dict[str, Dict[str, Any]]) -> None:
+        """Метод для добавления или замены нескольких записей за одну операцию."""
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """Метод для удаления записи. Возвращает False, если записи не было."""
+        pass
+
+    @abstractmethod
+    def replace_all(self, records: Dict[str, Dict[str, Any]]) -> None:
+        """Метод для полной замены содержимого хранилища."""
+        pass
+
+    @abstractmethod
+    def flush(self) -> None:
+        """Метод для записи накопленных изменений на диск."""
+        pass
+
+    def close(self) -> None:
+        """Метод для освобождения ресурсов хранилища."""
+        self.flush()
@@ -0,0 +1,61 @@
+﻿import os
+from pathlib import Path
+import time
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+
+
+class FileLock:
+    """Межпроцессная блокировка на основе файла <имя>.lock.
+
+    Используется как контекстный менеджер:
+        with FileLock(path):
+            ...
+    """
+
+    RETRY_DELAY = 0.01
+
+    def __init__(self, path: Path) -> None:
+        self.lock_path: Path = Path(path).with_name(Path(path).name + ".lock")
+        self._file = None
+
+    def acquire(self) -> None:
+        os.makedirs(self.lock_path.parent, exist_ok=True)
+        self._file = open(self.lock_path, 'a+b')
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            return
+
+        while True:
+            try:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+                return
+            except OSError:
+                time.sleep(self.RETRY_DELAY)
+
+    def release(self) -> None:
+        if self._file is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> 'FileLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.release()
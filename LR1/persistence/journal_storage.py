@@ -0,0 +1,198 @@
+﻿import json
+import os
+from pathlib import Path
+import threading
+from typing import Any, Dict, Optional
+
+from .base import Storage
+
+
+
+class JournalStorage(Storage):
+    """Хранилище в виде снимка и журнала изменений.
+
+    Снимок хранится в исходном JSON-файле (в том же формате, что и у JsonStorage),
+    а каждое изменение дописывается строкой в файл <имя>.journal. При открытии
+    снимок читается и журнал проигрывается поверх него. Когда журнал вырастает
+    больше COMPACTION_THRESHOLD байт, в фоновом потоке записывается новый снимок,
+    а применённая часть журнала удаляется.
+    """
+
+    COMPACTION_THRESHOLD = 4 * 1024 * 1024
+    # Вызывать fsync после каждой записи (защита от потери питания, а не только от падения процесса)
+    SYNC_WRITES = False
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        self.journal_path: Path = self.path.with_name(self.path.name + ".journal")
+        self.compacting_path: Path = self.path.with_name(self.path.name + ".journal.compacting")
+        self._lock = threading.RLock()
+        self._records: Optional[Dict[str, Dict[str, Any]]] = None
+        self._journal = None
+        self._journal_size = 0
+        self._compaction: Optional[threading.Thread] = None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._ensure_loaded().get(key)
+
+    def contains(self, key: str) -> bool:
+        return key in self._ensure_loaded()
+
+    def load_all(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return dict(self._ensure_loaded())
+
+    def put(self, key: str, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self._ensure_loaded()[key] = record
+            self._append([{"op": "put", "key": key, "record": record}])
+
+    def put_many(self, records: Dict[str, Dict[str, Any]]) -> None:
+        with self._lock:
+            self._ensure_loaded().update(records)
+            self._append([{"op": "put", "key": key, "record": record} for key, record in records.items()])
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            records = self._ensure_loaded()
+            if key not in records:
+                return False
+            del records[key]
+            self._append([{"op": "delete", "key": key}])
+            return True
+
+    def replace_all(self, records: Dict[str, Dict[str, Any]]) -> None:
+        with self._lock:
+            self._wait_for_compaction()
+            self._records = dict(records)
+            self._close_journal()
+            self._write_snapshot(self._records)
+            for path in (self.compacting_path, self.journal_path):
+                if path.exists():
+                    path.unlink()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._journal is not None:
+                self._journal.flush()
+                os.fsync(self._journal.fileno())
+
+    def close(self) -> None:
+        with self._lock:
+            self._wait_for_compaction()
+            self._close_journal()
+
+    def compact(self, wait: bool = False) -> None:
+        """Метод для запуска записи нового снимка в фоновом потоке."""
+        with self._lock:
+            if self._compaction is not None and self._compaction.is_alive():
+                if not wait:
+                    return
+                self._wait_for_compaction()
+            self._ensure_loaded()
+            # Замораживаем текущий журнал: всё, что в нём есть, попадёт в снимок
+            self._close_journal()
+            if self.journal_path.exists():
+                if self.compacting_path.exists():
+                    # Предыдущее сжатие было прервано: его журнал ещё не вошёл в снимок
+                    self._merge_journal(self.journal_path, self.compacting_path)
+                else:
+                    os.replace(self.journal_path, self.compacting_path)
+            snapshot = dict(self._records)
+            self._compaction = threading.Thread(
+                target=self._run_compaction, args=(snapshot,), name=f"compaction-{self.path.name}", daemon=True
+            )
+            self._compaction.start()
+        if wait:
+            self._wait_for_compaction()
+
+    def _run_compaction(self, snapshot: Dict[str, Dict[str, Any]]) -> None:
+        try:
+            self._write_snapshot(snapshot)
+            self.compacting_path.unlink(missing_ok=True)
+        except Exception as e:
+            # Журнал .compacting остаётся на диске и будет проигран при следующем открытии
+            print(f"Ошибка при сжатии журнала {self.journal_path}: {e}")
+
+    def _wait_for_compaction(self) -> None:
+        compaction = self._compaction
+        if compaction is not None and compaction is not threading.current_thread():
+            compaction.join()
+        self._compaction = None
+
+    def _ensure_loaded(self) -> Dict[str, Dict[str, Any]]:
+        if self._records is not None:
+            return self._records
+        with self._lock:
+            if self._records is None:
+                records: Dict[str, Dict[str, Any]] = {}
+                if self.path.exists():
+                    with open(self.path, 'r', encoding='utf-8') as file:
+                        records = json.load(file)
+                for journal_path in (self.compacting_path, self.journal_path):
+                    self._replay(journal_path, records)
+                self._records = records
+            return self._records
+
+    @staticmethod
+    def _replay(journal_path: Path, records: Dict[str, Dict[str, Any]]) -> None:
+        """Метод для применения записей журнала к словарю записей."""
+        if not journal_path.exists():
+            return
+        with open(journal_path, 'r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Недописанная строка после аварийного завершения
+                    continue
+                if entry["op"] == "put":
+                    records[entry["key"]] = entry["record"]
+                elif entry["op"] == "delete":
+                    records.pop(entry["key"], None)
+
+    def _append(self, entries) -> None:
+        if self._journal is None:
+            os.makedirs(self.path.parent, exist_ok=True)
+            self._journal = open(self.journal_path, 'a', encoding='utf-8')
+            self._journal_size = self._journal.tell()
+            if self._journal_size and not self._ends_with_newline(self.journal_path):
+                # Отделяем недописанную строку, чтобы новые записи не склеились с ней
+                self._journal.write("\n")
+                self._journal_size += 1
+        data = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+        self._journal.write(data)
+        self._journal.flush()
+        if self.SYNC_WRITES:
+            os.fsync(self._journal.fileno())
+        self._journal_size += len(data.encode('utf-8'))
+        if self._journal_size >= self.COMPACTION_THRESHOLD:
+            self.compact()
+
+    @staticmethod
+    def _ends_with_newline(path: Path) -> bool:
+        with open(path, 'rb') as file:
+            file.seek(-1, os.SEEK_END)
+            return file.read(1) == b"\n"
+
+    def _close_journal(self) -> None:
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+            self._journal_size = 0
+
+    @staticmethod
+    def _merge_journal(source: Path, target: Path) -> None:
+        with open(source, 'r', encoding='utf-8') as src, open(target, 'a', encoding='utf-8') as dst:
+            for line in src:
+                dst.write(line)
+        source.unlink()
+
+    def _write_snapshot(self, records: Dict[str, Dict[str, Any]]) -> None:
+        os.makedirs(self.path.parent, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(records, file, indent=4, ensure_ascii=False)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.path)
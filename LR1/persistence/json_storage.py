@@ -0,0 +1,364 @@
+﻿import codecs
+import json
+import os
+from pathlib import Path
+import re
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+from .base import Storage, StorageConflictError
+from .file_lock import FileLock
+
+
+
+# Маркер удалённой (или ещё не существовавшей) записи в списке несохранённых изменений
+_DELETED = object()
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class JsonStorage(Storage):
+    """Хранилище в JSON-файле с кэшем в памяти и отложенной пакетной записью.
+
+    Файл разбирается один раз и держится в памяти, пока не изменятся его
+    время модификации или размер. Изменения накапливаются и записываются
+    на диск одним проходом, когда их набирается FLUSH_BATCH_SIZE или при
+    явном вызове flush().
+
+    Запись выполняется под межпроцессной блокировкой файла: содержимое
+    перечитывается, если его успел изменить другой процесс, несохранённые
+    изменения накладываются поверх, и результат пишется во временный файл,
+    который затем атомарно заменяет основной (os.replace). Если запись,
+    которую меняли мы, тем временем изменил другой процесс, побеждает его
+    версия, а flush() сообщает о конфликте исключением StorageConflictError.
+
+    Пока файл не загружен целиком, get(), contains() и iter_records() читают
+    только нужные записи: рядом с файлом хранится индекс <имя>.idx
+    (ключ -> смещения записи в байтах). При записи файла смещения
+    запоминаются только в памяти, а файл индекса строится лениво — одним
+    потоковым проходом, когда читатель видит, что индекс устарел. Поэтому
+    частые сбросы изменений не переписывают индекс каждый раз.
+    """
+
+    FLUSH_BATCH_SIZE = 100
+    # Размер куска файла, читаемого при построении индекса
+    SCAN_CHUNK_SIZE = 1 << 20
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        self._records: Optional[Dict[str, Dict[str, Any]]] = None
+        self._signature: Optional[Tuple[int, int, int]] = None
+        self._dirty: Dict[str, Any] = {}
+        # Версии изменённых записей, на которых основаны наши изменения
+        self._base: Dict[str, Any] = {}
+        self._conflicts: Set[str] = set()
+        self.index_path: Path = self.path.with_name(self.path.name + ".idx")
+        self._offsets: Optional[Dict[str, Tuple[int, int]]] = None
+        self._offsets_signature: Optional[Tuple[int, int, int]] = None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if self._is_cached():
+            return self._ensure_loaded().get(key)
+        with self._open_indexed() as (file, offsets):
+            if offsets is None:
+                return self._ensure_loaded().get(key)
+            span = offsets.get(key)
+            return self._read_span(file, span) if span else None
+
+    def contains(self, key: str) -> bool:
+        if self._is_cached():
+            return key in self._ensure_loaded()
+        with self._open_indexed() as (file, offsets):
+            if offsets is None:
+                return key in self._ensure_loaded()
+            return key in offsets
+
+    def load_all(self) -> Dict[str, Dict[str, Any]]:
+        return dict(self._ensure_loaded())
+
+    def iter_records(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        if self._is_cached():
+            yield from list(self._ensure_loaded().items())
+            return
+        with self._open_indexed() as (file, offsets):
+            if offsets is None:
+                yield from list(self._ensure_loaded().items())
+                return
+            for key, span in offsets.items():
+                yield key, self._read_span(file, span)
+
+    def put(self, key: str, record: Dict[str, Any]) -> None:
+        records = self._ensure_loaded()
+        self._remember_base(key, records)
+        records[key] = record
+        self._dirty[key] = record
+        self._flush_if_needed()
+
+    def put_many(self, records: Dict[str, Dict[str, Any]]) -> None:
+        current = self._ensure_loaded()
+        for key in records:
+            self._remember_base(key, current)
+        current.update(records)
+        self._dirty.update(records)
+        self._flush_if_needed()
+
+    def delete(self, key: str) -> bool:
+        records = self._ensure_loaded()
+        if key not in records:
+            return False
+        self._remember_base(key, records)
+        del records[key]
+        self._dirty[key] = _DELETED
+        self._flush_if_needed()
+        return True
+
+    def replace_all(self, records: Dict[str, Dict[str, Any]]) -> None:
+        # Полная замена содержимого намеренно перезаписывает чужие изменения
+        with FileLock(self.path):
+            self._write_file(records)
+            self._records = dict(records)
+            self._dirty.clear()
+            self._base.clear()
+            self._signature = self._stat_signature()
+
+    def flush(self) -> None:
+        if not self._dirty and not self._conflicts:
+            return
+        with FileLock(self.path):
+            records = self._ensure_loaded()
+            if self._dirty:
+                self._write_file(records)
+                self._signature = self._stat_signature()
+            self._dirty.clear()
+            self._base.clear()
+
+        if self._conflicts:
+            conflicts = sorted(self._conflicts)
+            self._conflicts.clear()
+            raise StorageConflictError(
+                f"Записи {', '.join(conflicts)} в файле {self.path} были изменены другим процессом, "
+                f"наши изменения этих записей не сохранены."
+            )
+
+    def _remember_base(self, key: str, records: Dict[str, Dict[str, Any]]) -> None:
+        if key not in self._base:
+            self._base[key] = records.get(key, _DELETED)
+
+    def _flush_if_needed(self) -> None:
+        if len(self._dirty) >= self.FLUSH_BATCH_SIZE:
+            self.flush()
+
+    def _ensure_loaded(self) -> Dict[str, Dict[str, Any]]:
+        """Метод для перечитывания файла, если он изменился с момента последнего чтения."""
+        signature = self._stat_signature()
+        if self._records is not None and signature == self._signature:
+            return self._records
+
+        records = self._read_file() if signature is not None else {}
+        # Поверх актуального содержимого файла применяем ещё не записанные изменения
+        for key, record in list(self._dirty.items()):
+            if records.get(key, _DELETED) != self._base.get(key, _DELETED):
+                # Запись изменил другой процесс: оставляем его версию
+                self._conflicts.add(key)
+                del self._dirty[key]
+                del self._base[key]
+            elif record is _DELETED:
+                records.pop(key, None)
+            else:
+                records[key] = record
+
+        self._records = records
+        self._signature = signature
+        return records
+
+    def _stat_signature(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            return self._signature_of(os.stat(self.path))
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _signature_of(stat: os.stat_result) -> Tuple[int, int, int]:
+        # После os.replace меняется и номер inode, даже если время и размер совпали
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _is_cached(self) -> bool:
+        """Файл уже загружен целиком и не изменился (или есть несохранённые изменения)."""
+        if self._dirty or self._conflicts:
+            return True
+        return self._records is not None and self._stat_signature() == self._signature
+
+    def _open_indexed(self) -> '_IndexedFile':
+        return _IndexedFile(self)
+
+    @staticmethod
+    def _read_span(file, span: Tuple[int, int]) -> Dict[str, Any]:
+        file.seek(span[0])
+        return json.loads(file.read(span[1] - span[0]))
+
+    def _index_for(self, file) -> Optional[Dict[str, Tuple[int, int]]]:
+        """Метод для получения индекса открытого файла: из памяти, из файла индекса или сканированием.
+
+        Возвращает None, если файл нельзя проиндексировать (пустой или не объект из словарей).
+        """
+        signature = self._signature_of(os.fstat(file.fileno()))
+        if self._offsets is not None and self._offsets_signature == signature:
+            return self._offsets
+
+        offsets = self._read_index(signature)
+        if offsets is None:
+            if signature[2] == 0:
+                return None
+            offsets = self._scan_offsets(file)
+            if offsets is None:
+                return None
+            self._write_index(signature, offsets)
+        self._offsets, self._offsets_signature = offsets, signature
+        return offsets
+
+    def _read_index(self, signature: Tuple[int, int, int]) -> Optional[Dict[str, Tuple[int, int]]]:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as file:
+                index = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if tuple(index.get("signature", ())) != signature:
+            return None
+        return {key: tuple(span) for key, span in index["offsets"].items()}
+
+    def _write_index(self, signature: Tuple[int, int, int], offsets: Dict[str, Tuple[int, int]]) -> None:
+        # Индекс лишь ускоряет чтение: если его не удалось записать, он будет построен заново
+        tmp_path = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                json.dump({"signature": signature, "offsets": offsets}, file, ensure_ascii=False)
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    @classmethod
+    def _scan_offsets(cls, file) -> Optional[Dict[str, Tuple[int, int]]]:
+        """Метод для потокового построения индекса: в памяти одновременно находится одна запись."""
+        file.seek(0)
+        base = 3 if file.read(3) == codecs.BOM_UTF8 else 0
+        file.seek(base)
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        buffer = ""
+
+        def fill() -> bool:
+            nonlocal buffer
+            chunk = file.read(cls.SCAN_CHUNK_SIZE)
+            buffer += decoder.decode(chunk, final=not chunk)
+            return bool(chunk)
+
+        def skip(pos: int) -> int:
+            # Пропуск пробелов; при нехватке данных читается следующий кусок файла
+            while True:
+                pos = _WHITESPACE.match(buffer, pos).end()
+                if pos < len(buffer) or not fill():
+                    return pos
+
+        pos = skip(0)
+        if buffer[pos:pos + 1] != "{":
+            return None
+        pos = skip(pos + 1)
+        if buffer[pos:pos + 1] == "}":
+            return {}
+
+        offsets = {}
+        # Позиция в буфере и смещение в байтах, до которых длина уже посчитана
+        mark, mark_offset = 0, base
+        while True:
+            record_pos = pos
+            try:
+                key, pos = _DECODER.raw_decode(buffer, pos)
+                pos = skip(pos)
+                if not isinstance(key, str) or buffer[pos:pos + 1] != ":":
+                    return None
+                value_pos = skip(pos + 1)
+                value, end = _DECODER.raw_decode(buffer, value_pos)
+            except json.JSONDecodeError:
+                # Запись не поместилась в прочитанную часть файла
+                if not fill():
+                    return None
+                pos = record_pos
+                continue
+            if not isinstance(value, dict):
+                return None
+
+            start = mark_offset + len(buffer[mark:value_pos].encode('utf-8'))
+            mark, mark_offset = end, start + len(buffer[value_pos:end].encode('utf-8'))
+            offsets[key] = (start, mark_offset)
+
+            pos = skip(end)
+            separator = buffer[pos:pos + 1]
+            if separator == "}":
+                return offsets
+            if separator != ",":
+                return None
+            if mark > cls.SCAN_CHUNK_SIZE:
+                # Разобранная часть буфера больше не нужна
+                buffer, pos, mark = buffer[mark:], pos - mark, 0
+            pos = skip(pos + 1)
+
+    def _read_file(self) -> Dict[str, Dict[str, Any]]:
+        with open(self.path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+
+    def _write_file(self, records: Dict[str, Dict[str, Any]]) -> None:
+        """Метод для атомарной записи файла: сбой во время записи не портит старое содержимое.
+
+        Записи пишутся по одной (формат совпадает с json.dump(..., indent=4)),
+        чтобы попутно запомнить их смещения. Файл индекса не переписывается:
+        его подпись больше не совпадает с подписью файла, и индекс будет
+        построен заново при первом чтении без него.
+        """
+        os.makedirs(self.path.parent, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        offsets = {}
+        try:
+            with open(tmp_path, 'wb') as file:
+                file.write(b"{")
+                for number, (key, record) in enumerate(records.items()):
+                    file.write(b",\n    " if number else b"\n    ")
+                    file.write(json.dumps(key, ensure_ascii=False).encode('utf-8') + b": ")
+                    value = json.dumps(record, indent=4, ensure_ascii=False).replace("\n", "\n    ").encode('utf-8')
+                    start = file.tell()
+                    file.write(value)
+                    offsets[key] = (start, start + len(value))
+                file.write(b"\n}" if records else b"}")
+                file.flush()
+                os.fsync(file.fileno())
+                signature = self._signature_of(os.fstat(file.fileno()))
+            os.replace(tmp_path, self.path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        # os.replace сохраняет inode, время изменения и размер временного файла
+        self._offsets, self._offsets_signature = offsets, signature
+
+
+
+class _IndexedFile:
+    """Открытый файл хранилища вместе с его индексом.
+
+    Индекс строится по тому же открытому файлу, из которого потом читаются
+    записи, поэтому одновременная замена файла другим процессом не приводит
+    к чтению по чужим смещениям.
+    """
+
+    def __init__(self, storage: JsonStorage) -> None:
+        self._storage: JsonStorage = storage
+        self._file = None
+
+    def __enter__(self) -> Tuple[Any, Optional[Dict[str, Tuple[int, int]]]]:
+        try:
+            self._file = open(self._storage.path, 'rb')
+        except FileNotFoundError:
+            return None, {}
+        return self._file, self._storage._index_for(self._file)
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if self._file is not None:
+            self._file.close()
@@ -0,0 +1,77 @@
+﻿import atexit
+import os
+from pathlib import Path
+from typing import Callable, Dict, Union
+
+from .base import Storage
+from .journal_storage import JournalStorage
+from .json_storage import JsonStorage
+from .sqlite_storage import SqliteStorage
+
+
+
+# Доступные реализации хранилища; выбираются переменной окружения LR1_STORAGE_BACKEND
+BACKENDS: Dict[str, Callable[[Path], Storage]] = {
+    "json": JsonStorage,
+    "journal": JournalStorage,
+    "sqlite": SqliteStorage,
+}
+
+
+
+def _backend_by_name(name: str, source: str = "Неизвестное хранилище") -> Callable[[Path], Storage]:
+    """Возвращает реализацию хранилища по имени из BACKENDS."""
+    if name not in BACKENDS:
+        raise ValueError(f"{source}: {name!r}. Доступные хранилища: {', '.join(BACKENDS)}")
+    return BACKENDS[name]
+
+
+# Общие для всего процесса хранилища: один объект на каждый файл данных
+_storages: Dict[Path, Storage] = {}
+_backend: Callable[[Path], Storage] = _backend_by_name(
+    os.environ.get("LR1_STORAGE_BACKEND", "json"), "Неизвестное хранилище в LR1_STORAGE_BACKEND")
+
+
+def get_storage(path: Path) -> Storage:
+    """Возвращает общее хранилище для файла, создавая его при первом обращении."""
+    key = Path(path).resolve()
+    storage = _storages.get(key)
+    if storage is None:
+        storage = _backend(Path(path))
+        _storages[key] = storage
+    return storage
+
+
+def set_backend(backend: Union[str, Callable[[Path], Storage]]) -> None:
+    """Выбирает реализацию хранилища (по имени из BACKENDS или фабрикой).
+    Открытые хранилища сохраняются и закрываются."""
+    global _backend
+    if isinstance(backend, str):
+        backend = _backend_by_name(backend)
+    close_all()
+    _backend = backend
+
+
+def flush_all() -> None:
+    """Записывает на диск изменения всех открытых хранилищ.
+    Ошибка одного хранилища не мешает сохранить остальные."""
+    errors = []
+    for storage in list(_storages.values()):
+        try:
+            storage.flush()
+        except Exception as e:
+            errors.append(e)
+    if errors:
+        raise errors[0]
+
+
+def close_all() -> None:
+    """Сохраняет изменения и забывает все открытые хранилища."""
+    try:
+        for storage in list(_storages.values()):
+            storage.close()
+    finally:
+        _storages.clear()
+
+
+atexit.register(flush_all)
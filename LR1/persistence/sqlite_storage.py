@@ -0,0 +1,82 @@
+﻿import json
+import os
+from pathlib import Path
+import sqlite3
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from .base import Storage
+
+
+
+class SqliteStorage(Storage):
+    """Хранилище в базе SQLite рядом с JSON-файлом (<имя>.sqlite3).
+
+    Записи лежат в таблице records, ключ записи (номер студенческого, предмет
+    экзамена, тема материала) является первичным ключом, поэтому поиск одной
+    записи не требует чтения всей базы. База открывается в режиме WAL.
+    """
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        self.db_path: Path = self.path.with_suffix(".sqlite3")
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute("SELECT data FROM records WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def contains(self, key: str) -> bool:
+        return self._connect().execute("SELECT 1 FROM records WHERE key = ?", (key,)).fetchone() is not None
+
+    def load_all(self) -> Dict[str, Dict[str, Any]]:
+        rows = self._connect().execute("SELECT key, data FROM records ORDER BY rowid")
+        return {key: json.loads(data) for key, data in rows}
+
+    def iter_records(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        for key, data in self._connect().execute("SELECT key, data FROM records ORDER BY rowid"):
+            yield key, json.loads(data)
+
+    def put(self, key: str, record: Dict[str, Any]) -> None:
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT INTO records (key, data) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET data = excluded.data",
+                (key, json.dumps(record, ensure_ascii=False))
+            )
+
+    def put_many(self, records: Dict[str, Dict[str, Any]]) -> None:
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT INTO records (key, data) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET data = excluded.data",
+                ((key, json.dumps(record, ensure_ascii=False)) for key, record in records.items())
+            )
+
+    def delete(self, key: str) -> bool:
+        with self._connect() as connection:
+            return connection.execute("DELETE FROM records WHERE key = ?", (key,)).rowcount > 0
+
+    def replace_all(self, records: Dict[str, Dict[str, Any]]) -> None:
+        with self._connect() as connection:
+            connection.execute("DELETE FROM records")
+            connection.executemany(
+                "INSERT INTO records (key, data) VALUES (?, ?)",
+                ((key, json.dumps(record, ensure_ascii=False)) for key, record in records.items())
+            )
+
+    def flush(self) -> None:
+        # Каждое изменение фиксируется своей транзакцией, отложенных записей нет
+        pass
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(self.db_path.parent, exist_ok=True)
+            connection = sqlite3.connect(self.db_path)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("CREATE TABLE IF NOT EXISTS records (key TEXT PRIMARY KEY, data TEXT NOT NULL)")
+            self._connection = connection
+        return self._connection
@@ -16,27 +16,39 @@ class TestAdditionalClasses(unittest.TestCase):
         self.student.first_name = "Иван"
         self.additional_classes = AdditionalClasses(self.student, "Линейные уравнения")
 
-    @patch('entities.educational_materials.EducationalMaterial.load_all', return_value={
-        "Линейные уравнения": {"subject": "Математика", "topic": "Линейные уравнения", "title": "Введение в алгебру", "author": "John Doe"}
-    })
+    @patch('entities.educational_materials.EducationalMaterial.find', return_value=EducationalMaterial.from_dict(
+        {"subject": "Математика", "topic": "Линейные уравнения", "title": "Введение в алгебру", "author": "John Doe"}
+    ))
     @patch('entities.student.Student.save')
-    def test_recommend_literature(self, mock_save, mock_load_all):
+    def test_recommend_literature(self, mock_save, mock_find):
         with patch('builtins.print') as mock_print:
             self.additional_classes.recommend_literature()
             self.assertTrue(any("Рекомендованная литература:" in call[0][0] for call in mock_print.call_args_list))
             self.assertTrue(any("- Введение в алгебру (автор: John Doe)" in call[0][0] for call in mock_print.call_args_list))
             self.assertEqual(len(self.student.materials), 1)
             mock_save.assert_called_once()
+            mock_find.assert_called_once_with("Линейные уравнения")
 
-    @patch('entities.educational_materials.EducationalMaterial.load_all', return_value={})
-    def test_recommend_literature_not_found(self, mock_load_all):
+    @patch('entities.educational_materials.EducationalMaterial.find', return_value=EducationalMaterial.from_dict(
+        {"subject": "Математика", "topic": "Линейные уравнения", "title": "Введение в алгебру", "author": "John Doe"}
+    ))
+    @patch('entities.student.Student.save')
+    def test_recommend_literature_twice(self, mock_save, mock_find):
+        with patch('builtins.print'):
+            self.additional_classes.recommend_literature()
+            self.additional_classes.recommend_literature()
+        self.assertEqual(len(self.student.materials), 1)
+        mock_save.assert_called_once()
+
+    @patch('entities.educational_materials.EducationalMaterial.find', return_value=None)
+    def test_recommend_literature_not_found(self, mock_find):
         with patch('builtins.print') as mock_print:
             self.additional_classes.recommend_literature()
             self.assertTrue(any("Литература по данной теме не найдена." in call[0][0] for call in mock_print.call_args_list))
             self.assertIsNone(self.student.materials)
 
-    @patch('entities.educational_materials.EducationalMaterial.load_all', side_effect=FileNotFoundError)
-    def test_recommend_literature_file_not_found(self, mock_load_all):
+    @patch('entities.educational_materials.EducationalMaterial.find', side_effect=FileNotFoundError)
+    def test_recommend_literature_file_not_found(self, mock_find):
         with patch('builtins.print') as mock_print:
             self.additional_classes.recommend_literature()
             self.assertTrue(any("Ошибка: файл с учебными материалами не найден." in call[0][0] for call in mock_print.call_args_list))
@@ -0,0 +1,71 @@
+﻿import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from entities.batch_grading import BatchGrader, grade_by_exam, np
+from entities.exam import Exam
+from entities.previous_exam_attempt import PreviousExamAttempt
+
+
+
+@unittest.skipIf(np is None, "numpy не установлен")
+class TestBatchGrader(unittest.TestCase):
+
+    def setUp(self):
+        self.exam = Exam(subject="Математика")
+        self.exam.questions = [
+            ("Линейные уравнения", "Найдите корень уравнения 2x=4", "2"),
+            ("Производная простой функции", "Какова производная от x^2?", "2x"),
+            ("Линейные уравнения", "Найдите корень уравнения 3x=9", "3")
+        ]
+        self.answers = [
+            ["2", "2x", "3"],
+            ["1", "2x", "4"],
+            ["2", "x"],
+        ]
+        self.grader = BatchGrader(self.exam)
+
+    def test_scores_match_calculate_score(self):
+        result = self.grader.grade(self.answers)
+        expected = [PreviousExamAttempt(self.exam, answers).calculate_score() for answers in self.answers]
+        self.assertEqual(result.scores.tolist(), expected)
+
+    def test_all_answers_present(self):
+        result = self.grader.grade([["2", "2x", "3"], ["1", "1", "1"], ["2", "1", "3"]])
+        self.assertEqual(result.scores.tolist(), [3, 0, 2])
+        self.assertEqual(result.topic_errors.tolist(), [[0, 0], [2, 1], [0, 1]])
+
+    def test_correctness_matrix(self):
+        result = self.grader.grade(self.answers)
+        self.assertEqual(result.correctness.tolist(), [
+            [True, True, True],
+            [False, True, False],
+            [True, False, False],
+        ])
+
+    def test_topic_errors(self):
+        result = self.grader.grade(self.answers)
+        self.assertEqual(result.topics, ["Линейные уравнения", "Производная простой функции"])
+        self.assertEqual(result.topic_errors.tolist(), [[0, 0], [2, 0], [1, 1]])
+        self.assertEqual(result.error_totals(), {"Линейные уравнения": 3, "Производная простой функции": 1})
+        self.assertEqual(result.unexplored_topics(2), ["Линейные уравнения", "Производная простой функции"])
+
+    def test_grade_by_exam(self):
+        attempts = [PreviousExamAttempt(self.exam, answers) for answers in self.answers]
+        results = grade_by_exam(attempts + [None])
+        self.assertEqual(list(results), [f"Математика@{self.exam.version}"])
+        self.assertEqual(results[f"Математика@{self.exam.version}"].scores.tolist(), [3, 1, 1])
+
+    def test_grade_by_exam_groups_equal_exams(self):
+        # Равные, но не интернированные экзамены (как после Exam.load) — одна группа
+        copies = [Exam.from_dict(self.exam.to_dict()) for _ in self.answers]
+        self.assertIsNot(copies[0], copies[1])
+        attempts = [PreviousExamAttempt(exam, answers) for exam, answers in zip(copies, self.answers)]
+        results = grade_by_exam(attempts)
+        self.assertEqual(list(results), [f"Математика@{self.exam.version}"])
+        self.assertEqual(results[f"Математика@{self.exam.version}"].scores.tolist(), [3, 1, 1])
+
+if __name__ == '__main__':
+    unittest.main()
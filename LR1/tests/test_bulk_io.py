@@ -0,0 +1,115 @@
+﻿import json
+import os
+from pathlib import Path
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from entities.bulk_io import export_records, import_records
+from entities.educational_materials import EducationalMaterial
+from entities.exam import Exam
+from entities.student import Student
+from persistence.registry import flush_all
+
+
+
+class TestBulkIO(unittest.TestCase):
+
+    def setUp(self):
+        Student.STORAGE_FILE = Path("test_storage/test_bulk_students.json")
+        Exam.STORAGE_FILE = Path("test_storage/test_exams.json")
+        EducationalMaterial.STORAGE_FILE = Path("test_storage/test_bulk_materials.json")
+        self.files = [
+            Student.STORAGE_FILE,
+            EducationalMaterial.STORAGE_FILE,
+            Path("test_storage/bulk_input.csv"),
+            Path("test_storage/bulk_input.jsonl"),
+            Path("test_storage/bulk_output.jsonl"),
+            Path("test_storage/bulk_output.csv"),
+            Path("test_storage/test_exams_versions.json"),
+            Path("test_storage/test_bulk_materials_subjects.json"),
+        ]
+
+    def tearDown(self):
+        flush_all()
+        for path in self.files:
+            for candidate in (path, Path(str(path) + ".lock")):
+                if candidate.exists():
+                    candidate.unlink()
+
+    def write(self, path, text):
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(text)
+
+    def test_import_students_csv(self):
+        self.write(self.files[2],
+                   "id,last_name,first_name,subject,answers\n"
+                   "1,иванов,иван,Математика,2;2x\n"
+                   "2,Петров,Пётр,,\n"
+                   "abc,Сидоров,Сидор,,\n"
+                   "3,Smith2,John,,\n"
+                   "4,Орлов,Олег,Математика,2\n"
+                   "1,Иванов,Иван,,\n")
+        report = import_records("students", self.files[2])
+
+        self.assertEqual(report.imported, 2)
+        self.assertEqual(report.skipped, 1)
+        self.assertEqual([line for line, _ in report.errors], [4, 5, 6])
+        self.assertIn("только цифры", report.errors[0][1])
+
+        student = Student.load("1")
+        self.assertEqual(student.last_name, "Иванов")
+        self.assertEqual(student.exam_result.answers, ["2", "2x"])
+        self.assertEqual(student.exam_result.calculate_score(), 2)
+
+    def test_import_students_in_batches(self):
+        lines = [json.dumps({"id": str(i), "last_name": "Иванов", "first_name": "Иван"}) for i in range(10)]
+        self.write(self.files[3], "\n".join(lines) + "\n")
+        report = import_records("students", self.files[3], batch_size=4)
+        self.assertEqual(report.imported, 10)
+        self.assertEqual(len(Student.load_all()), 10)
+
+    def test_import_materials(self):
+        self.write(self.files[2],
+                   "subject,topic,title,author\n"
+                   "Математика,Линейные уравнения,Введение в алгебру,John Doe\n"
+                   "Математика,,Без темы,John Doe\n")
+        report = import_records("materials", self.files[2])
+        self.assertEqual(report.imported, 1)
+        self.assertEqual(report.errors[0][1], "Тема не может быть пустой.")
+        self.assertEqual(EducationalMaterial.load("Линейные уравнения").author, "John Doe")
+        self.assertEqual([material.topic for material in EducationalMaterial.find_by_subject("Математика")],
+                         ["Линейные уравнения"])
+
+    def test_export_and_import_roundtrip(self):
+        student = Student("7")
+        student.last_name = "Иванов"
+        student.first_name = "Иван"
+        student.unexplored_topics = {"Линейные уравнения"}
+        student.save()
+
+        self.assertEqual(export_records("students", self.files[4]), 1)
+        Student.storage().delete("7")
+        report = import_records("students", self.files[4])
+
+        self.assertEqual(report.imported, 1)
+        self.assertEqual(Student.load("7").unexplored_topics, {"Линейные уравнения"})
+
+    def test_answers_with_separator_roundtrip_through_csv(self):
+        self.write(self.files[2],
+                   "id,last_name,first_name,subject,answers\n"
+                   "1,Иванов,Иван,Математика,a\\;b;c\\\\d\n")
+        report = import_records("students", self.files[2])
+        self.assertEqual(report.imported, 1, report.errors)
+        self.assertEqual(Student.load("1").exam_result.answers, ["a;b", "c\\d"])
+
+        self.assertEqual(export_records("students", self.files[5]), 1)
+        Student.storage().delete("1")
+        report = import_records("students", self.files[5])
+
+        self.assertEqual(report.imported, 1, report.errors)
+        self.assertEqual(Student.load("1").exam_result.answers, ["a;b", "c\\d"])
+
+if __name__ == '__main__':
+    unittest.main()
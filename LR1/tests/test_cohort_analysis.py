@@ -0,0 +1,84 @@
+﻿import os
+from pathlib import Path
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from entities import cohort_analysis
+from entities.cohort_analysis import analyze_cohort
+from entities.exam import Exam
+from entities.previous_exam_attempt import PreviousExamAttempt
+from entities.student import Student
+from persistence.registry import flush_all
+
+
+
+class TestCohortAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        Student.STORAGE_FILE = Path("test_storage/test_cohort_students.json")
+        Exam.STORAGE_FILE = Path("test_storage/test_cohort_exams.json")
+        self.files = [
+            Student.STORAGE_FILE,
+            Exam.STORAGE_FILE,
+            Path("test_storage/test_cohort_exams_versions.json"),
+        ]
+        self.exam = Exam("Математика")
+        self.exam.questions = [
+            ("Линейные уравнения", "2x=4", "2"),
+            ("Производные", "(x^2)'", "2x"),
+            ("Производные", "(x^3)'", "3x^2"),
+        ]
+        answers = [["2", "2x", "3x^2"], ["1", "2x", "3x^2"], ["1", "x", "x"], ["2", "x", "3x^2"]]
+        for number, student_answers in enumerate(answers, 1):
+            student = Student(str(number))
+            student.last_name = "Иванов"
+            student.first_name = "Иван"
+            student.exam_result = PreviousExamAttempt(self.exam, student_answers)
+            student.save()
+        Student(str(len(answers) + 1)).save()
+        flush_all()
+
+    def tearDown(self):
+        flush_all()
+        for path in self.files:
+            for candidate in (path, Path(str(path) + ".lock")):
+                if candidate.exists():
+                    candidate.unlink()
+
+    def check_report(self, report):
+        self.assertEqual(len(report.students), 5)
+        self.assertEqual(report.failed, [])
+        self.assertEqual(report.topic_errors["Производные"], 3)
+        self.assertEqual(report.topic_errors["Линейные уравнения"], 2)
+        errors = {summary.id: len(summary.errors) for summary in report.students}
+        self.assertEqual(errors, {"1": 0, "2": 1, "3": 3, "4": 1, "5": 0})
+        self.assertEqual(report.updated, 3)
+
+        # Как и в Student.analyze_errors, неизученной становится тема последней ошибки
+        self.assertEqual(Student.load("3").unexplored_topics, {"Производные"})
+        self.assertEqual(Student.load("4").unexplored_topics, {"Производные"})
+        self.assertFalse(Student.load("1").unexplored_topics)
+
+    def test_analyze_inline(self):
+        self.check_report(analyze_cohort(workers=1))
+
+    def test_analyze_parallel(self):
+        self.check_report(analyze_cohort(workers=2, parallel_threshold=0))
+
+    def test_workers_receive_only_attempts(self):
+        with patch("entities.cohort_analysis._analyze_chunk", wraps=cohort_analysis._analyze_chunk) as analyze:
+            analyze_cohort(workers=1)
+        (attempts,), _ = analyze.call_args
+        self.assertEqual([id for id, _ in attempts], ["1", "2", "3", "4"])
+        self.assertEqual(set(attempts[0][1]), {"exam", "answers"})
+
+    def test_repeated_analysis_does_not_rewrite(self):
+        analyze_cohort(workers=1)
+        self.assertEqual(analyze_cohort(workers=1).updated, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
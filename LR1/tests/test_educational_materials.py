@@ -7,6 +7,7 @@ import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from entities.educational_materials import EducationalMaterial
+from persistence.registry import flush_all
 
 
 
@@ -18,6 +19,12 @@ class TestEducationalMaterial(unittest.TestCase):
         self.material = EducationalMaterial(topic="Линейные уравнения", title="Введение в алгебру", author="John Doe")
         self.material.subject = "Математика"
 
+    def tearDown(self):
+        flush_all()
+        subjects_file = Path("test_storage/test_educational_materials_subjects.json")
+        if subjects_file.exists():
+            subjects_file.unlink()
+
     def test_set_info(self):
         # Задаем информацию вручную, минуя вызов input
         self.material.subject = "Математика"
@@ -49,5 +56,40 @@ class TestEducationalMaterial(unittest.TestCase):
         loaded_material = EducationalMaterial.load("Линейные уравнения")
         self.assertIsNone(loaded_material)
 
+    def test_subject_index(self):
+        self.material.save()
+        other = EducationalMaterial(topic="Производные", title="Матанализ", author="Jane Doe")
+        other.subject = "Математика"
+        other.save()
+        self.assertEqual([material.title for material in EducationalMaterial.find_by_subject("Математика")],
+                         ["Введение в алгебру", "Матанализ"])
+
+        other.subject = "Физика"
+        other.save()
+        self.assertEqual([material.topic for material in EducationalMaterial.find_by_subject("Математика")],
+                         ["Линейные уравнения"])
+        self.assertEqual([material.topic for material in EducationalMaterial.find_by_subject("Физика")],
+                         ["Производные"])
+
+        other.delete()
+        self.assertEqual(EducationalMaterial.find_by_subject("Физика"), [])
+        self.assertIsNone(EducationalMaterial.subjects_storage().get("Физика"))
+
+    def test_index_records_batch(self):
+        self.material.save()
+        records = {f"Тема {i}": {"subject": "Математика" if i % 2 else "Физика"} for i in range(1000)}
+        records["Линейные уравнения"] = self.material.to_dict()
+        EducationalMaterial.index_records(records)
+        EducationalMaterial.index_records(records)
+
+        topics = EducationalMaterial.subjects_storage().get("Математика")["topics"]
+        self.assertEqual(topics, ["Линейные уравнения"] + [f"Тема {i}" for i in range(1, 1000, 2)])
+        self.assertEqual(len(EducationalMaterial.subjects_storage().get("Физика")["topics"]), 500)
+
+    def test_find(self):
+        self.material.save()
+        self.assertEqual(EducationalMaterial.find("Линейные уравнения").title, "Введение в алгебру")
+        self.assertIsNone(EducationalMaterial.find("Нет такой темы"))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -8,6 +8,7 @@ import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from entities.exam import Exam
+from persistence.registry import flush_all
 
 class TestExam(unittest.TestCase):
 
@@ -20,6 +21,13 @@ class TestExam(unittest.TestCase):
             ("Производная простой функции", "Какова производная от x^2?", "2x")
         ]
 
+    def tearDown(self):
+        # Записываем отложенные изменения, чтобы тесты не влияли друг на друга
+        flush_all()
+        versions_file = Path("test_storage/test_exams_versions.json")
+        if versions_file.exists():
+            versions_file.unlink()
+
 
     def test_set_info(self):
         # Очищаем данные экзаменов
@@ -72,10 +80,10 @@ class TestExam(unittest.TestCase):
         loaded_exam = Exam.load("Математика")
         self.assertIsNotNone(loaded_exam)
         self.assertEqual(loaded_exam.subject, "Математика")
-        self.assertEqual(loaded_exam.questions, [
+        self.assertEqual(loaded_exam.questions, (
             ("Линейные уравнения", "Найдите корень уравнения 2x=4", "2"),
             ("Производная простой функции", "Какова производная от x^2?", "2x")
-        ])
+        ))
 
     def test_load_not_found(self):
         with patch('builtins.print') as mock_print:
@@ -116,6 +124,50 @@ class TestExam(unittest.TestCase):
             ("Производная простой функции", "Какова производная от x^2?", "2x")
         ])
 
+    def test_version(self):
+        same_exam = Exam.from_dict(self.exam.to_dict())
+        self.assertEqual(same_exam.version, self.exam.version)
+
+        same_exam.questions = same_exam.questions[:1] + (("Производная простой функции", "Какова производная от x^2?", "2*x"),)
+        self.assertNotEqual(same_exam.version, self.exam.version)
+        same_exam.questions = self.exam.questions
+        same_exam.subject = "Физика"
+        self.assertNotEqual(same_exam.version, self.exam.version)
+
+    def test_version_is_computed_when_questions_are_assigned(self):
+        with patch("entities.exam.hashlib.sha1", wraps=__import__("hashlib").sha1) as sha1:
+            version = self.exam.version
+            self.assertEqual(self.exam.version, version)
+            self.assertEqual(sha1.call_count, 0)
+
+            questions = self.exam.questions
+            self.exam.questions += (("Интегралы", "Чему равен интеграл от 0?", "C"),)
+            self.assertNotEqual(self.exam.version, version)
+            self.exam.questions = questions
+            self.assertEqual(self.exam.version, version)
+            self.assertEqual(sha1.call_count, 2)
+        with self.assertRaises(AttributeError):
+            self.exam.questions.append(("Интегралы", "Чему равен интеграл от 0?", "C"))
+
+    def test_interned_exam_cannot_change(self):
+        shared = Exam.intern(self.exam)
+        self.assertIsNot(shared, self.exam)
+        self.assertIs(Exam.intern(Exam.from_dict(self.exam.to_dict())), shared)
+        self.assertIs(Exam.resolve("Математика", self.exam.version), shared)
+
+        # Изменение исходного экзамена не меняет содержимое, найденное по старой версии
+        version, questions = self.exam.version, self.exam.questions
+        self.exam.questions = []
+        self.assertEqual(Exam.resolve("Математика", version).questions, questions)
+        with self.assertRaises(AttributeError):
+            shared.questions = []
+        with self.assertRaises(AttributeError):
+            shared.subject = "Физика"
+
+    def test_save_archives_version(self):
+        self.exam.save()
+        self.assertTrue(Exam.versions_storage().contains(f"Математика@{self.exam.version}"))
+
     def test_from_dict(self):
         exam_dict = {
             "subject": "Математика",
@@ -126,10 +178,10 @@ class TestExam(unittest.TestCase):
         }
         loaded_exam = Exam.from_dict(exam_dict)
         self.assertEqual(loaded_exam.subject, "Математика")
-        self.assertEqual(loaded_exam.questions, [
+        self.assertEqual(loaded_exam.questions, (
             ("Линейные уравнения", "Найдите корень уравнения 2x=4", "2"),
             ("Производная простой функции", "Какова производная от x^2?", "2x")
-        ])
+        ))
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,79 @@
+﻿import json
+import os
+from pathlib import Path
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from persistence.journal_storage import JournalStorage
+
+
+
+class TestJournalStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.test_file = Path("test_storage/test_journal_storage.json")
+        with open(self.test_file, 'w', encoding='utf-8') as file:
+            json.dump({"1": {"id": "1"}}, file)
+        self.storage = JournalStorage(self.test_file)
+
+    def tearDown(self):
+        self.storage.close()
+        for path in (self.test_file, self.storage.journal_path, self.storage.compacting_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def reopen(self):
+        self.storage.close()
+        self.storage = JournalStorage(self.test_file)
+        return self.storage
+
+    def test_changes_are_appended_and_replayed(self):
+        self.storage.put("2", {"id": "2"})
+        self.storage.delete("1")
+        self.storage.put("2", {"id": "2", "name": "new"})
+
+        # Снимок не переписывается при каждом изменении
+        with open(self.test_file, 'r', encoding='utf-8') as file:
+            self.assertEqual(json.load(file), {"1": {"id": "1"}})
+
+        storage = self.reopen()
+        self.assertEqual(storage.load_all(), {"2": {"id": "2", "name": "new"}})
+
+    def test_torn_last_line_is_ignored(self):
+        self.storage.put("2", {"id": "2"})
+        self.storage.close()
+        with open(self.storage.journal_path, 'a', encoding='utf-8') as file:
+            file.write('{"op": "put", "key": "3", "rec')
+
+        storage = self.reopen()
+        self.assertFalse(storage.contains("3"))
+        storage.put("4", {"id": "4"})
+
+        storage = self.reopen()
+        self.assertEqual(set(storage.load_all()), {"1", "2", "4"})
+
+    def test_compaction(self):
+        self.storage.COMPACTION_THRESHOLD = 200
+        for i in range(2, 12):
+            self.storage.put(str(i), {"id": str(i)})
+        self.storage.compact(wait=True)
+
+        with open(self.test_file, 'r', encoding='utf-8') as file:
+            snapshot = json.load(file)
+        self.assertEqual(len(snapshot), 11)
+        self.assertFalse(self.storage.compacting_path.exists())
+
+        self.storage.put("12", {"id": "12"})
+        storage = self.reopen()
+        self.assertEqual(len(storage.load_all()), 12)
+
+    def test_replace_all(self):
+        self.storage.put("2", {"id": "2"})
+        self.storage.replace_all({"5": {"id": "5"}})
+        self.assertFalse(self.storage.journal_path.exists())
+        self.assertEqual(self.reopen().load_all(), {"5": {"id": "5"}})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+﻿import json
+import os
+from pathlib import Path
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from persistence.base import StorageConflictError
+from persistence.json_storage import JsonStorage
+
+
+
+class TestJsonStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.test_file = Path("test_storage/test_json_storage.json")
+        with open(self.test_file, 'w', encoding='utf-8') as file:
+            json.dump({"1": {"id": "1"}}, file)
+        self.storage = JsonStorage(self.test_file)
+
+    def tearDown(self):
+        for path in (self.test_file, Path(str(self.test_file) + ".lock"), self.storage.index_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def read_file(self):
+        with open(self.test_file, 'r', encoding='utf-8') as file:
+            return json.load(file)
+
+    def test_get(self):
+        self.assertEqual(self.storage.get("1"), {"id": "1"})
+        self.assertIsNone(self.storage.get("2"))
+        self.assertTrue(self.storage.contains("1"))
+
+    def test_put_is_deferred_until_flush(self):
+        self.storage.put("2", {"id": "2"})
+        self.assertTrue(self.storage.contains("2"))
+        self.assertNotIn("2", self.read_file())
+
+        self.storage.flush()
+        self.assertEqual(self.read_file(), {"1": {"id": "1"}, "2": {"id": "2"}})
+
+    def test_flush_when_batch_is_full(self):
+        self.storage.FLUSH_BATCH_SIZE = 3
+        self.storage.put("2", {"id": "2"})
+        self.storage.put("3", {"id": "3"})
+        self.assertEqual(len(self.read_file()), 1)
+
+        self.storage.delete("1")
+        self.assertEqual(self.read_file(), {"2": {"id": "2"}, "3": {"id": "3"}})
+
+    def test_reload_on_external_change(self):
+        self.storage.get("1")
+        self.storage.put("2", {"id": "2"})
+        with open(self.test_file, 'w', encoding='utf-8') as file:
+            json.dump({"1": {"id": "1"}, "3": {"id": "3", "name": "external"}}, file)
+
+        self.assertEqual(self.storage.get("3"), {"id": "3", "name": "external"})
+        # Несохранённые изменения не теряются при перечитывании файла
+        self.assertTrue(self.storage.contains("2"))
+
+    def test_concurrent_change_of_other_record_is_kept(self):
+        self.storage.put("2", {"id": "2"})
+        other = JsonStorage(self.test_file)
+        other.put("3", {"id": "3"})
+        other.flush()
+
+        self.storage.flush()
+        self.assertEqual(set(self.read_file()), {"1", "2", "3"})
+
+    def test_conflicting_change_is_reported(self):
+        self.storage.put("1", {"id": "1", "name": "наша версия"})
+        other = JsonStorage(self.test_file)
+        other.put("1", {"id": "1", "name": "чужая версия"})
+        other.flush()
+
+        with self.assertRaises(StorageConflictError):
+            self.storage.flush()
+        self.assertEqual(self.read_file()["1"]["name"], "чужая версия")
+        self.assertEqual(self.storage.get("1")["name"], "чужая версия")
+
+    def test_corrupted_file_is_not_overwritten(self):
+        with open(self.test_file, 'w', encoding='utf-8') as file:
+            file.write('{"1": {"id": ')
+        with self.assertRaises(json.JSONDecodeError):
+            self.storage.put("2", {"id": "2"})
+        with open(self.test_file, 'r', encoding='utf-8') as file:
+            self.assertEqual(file.read(), '{"1": {"id": ')
+
+    def test_replace_all(self):
+        self.storage.replace_all({"5": {"id": "5"}})
+        self.assertEqual(self.read_file(), {"5": {"id": "5"}})
+        self.assertFalse(self.storage.contains("1"))
+
+    def test_delete_missing(self):
+        self.assertFalse(self.storage.delete("42"))
+
+    def test_get_does_not_load_whole_file(self):
+        self.assertEqual(self.storage.get("1"), {"id": "1"})
+        self.assertFalse(self.storage.contains("2"))
+        self.assertIsNone(self.storage._records)
+        self.assertTrue(self.storage.index_path.exists())
+
+    def test_written_file_matches_json_dump(self):
+        records = {"1": {"id": "1", "text": "скобки {} [] и \"кавычки\" \\"}, "2": {"list": [1, {"a": None}]}}
+        self.storage.replace_all(records)
+        with open(self.test_file, 'r', encoding='utf-8') as file:
+            self.assertEqual(file.read(), json.dumps(records, indent=4, ensure_ascii=False))
+
+        storage = JsonStorage(self.test_file)
+        self.assertEqual(storage.get("1"), records["1"])
+        self.assertEqual(list(storage.iter_records()), list(records.items()))
+        self.assertIsNone(storage._records)
+
+    def test_index_rebuilt_after_external_change(self):
+        self.assertEqual(self.storage.get("1"), {"id": "1"})
+        with open(self.test_file, 'w', encoding='utf-8') as file:
+            json.dump({"3": {"id": "3", "name": "{\"1\": {}}"}}, file)
+        self.assertIsNone(self.storage.get("1"))
+        self.assertEqual(self.storage.get("3")["name"], '{"1": {}}')
+
+    def test_flush_does_not_rewrite_index(self):
+        self.assertEqual(self.storage.get("1"), {"id": "1"})
+        index_before = self.storage.index_path.read_bytes()
+        self.storage.put("2", {"id": "2"})
+        self.storage.flush()
+        self.storage.put("3", {"id": "3"})
+        self.storage.flush()
+        self.assertEqual(self.storage.index_path.read_bytes(), index_before)
+
+        # Устаревший индекс строится заново при первом чтении без загрузки файла
+        storage = JsonStorage(self.test_file)
+        self.assertEqual(storage.get("3"), {"id": "3"})
+        self.assertIsNone(storage._records)
+        with open(storage.index_path, 'r', encoding='utf-8') as file:
+            index = json.load(file)
+        self.assertEqual(tuple(index["signature"]), storage._stat_signature())
+        self.assertEqual(sorted(index["offsets"]), ["1", "2", "3"])
+
+    def test_iter_records_includes_unsaved_changes(self):
+        self.storage.put("2", {"id": "2"})
+        self.assertEqual(dict(self.storage.iter_records()), {"1": {"id": "1"}, "2": {"id": "2"}})
+
+if __name__ == '__main__':
+    unittest.main()
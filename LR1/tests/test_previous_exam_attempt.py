@@ -1,4 +1,5 @@
 ﻿import os
+from pathlib import Path
 import unittest
 from unittest.mock import patch
 import sys
@@ -7,10 +8,12 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from entities.previous_exam_attempt import PreviousExamAttempt
 from entities.exam import Exam
+from persistence.registry import flush_all
 
 class TestPreviousExamAttempt(unittest.TestCase):
 
     def setUp(self):
+        Exam.STORAGE_FILE = Path("test_storage/test_exams.json")
         self.exam_data = {
             "subject": "Математика",
             "questions": [("Линейные уравнения", "Найдите корень уравнения 2x=4", "2"), ("Производная простой функции", "Какова производная от x^2?", "2x")]
@@ -19,13 +22,32 @@ class TestPreviousExamAttempt(unittest.TestCase):
         self.answers = ["2", "2x"]
         self.attempt = PreviousExamAttempt(self.exam, self.answers)
 
+    def tearDown(self):
+        flush_all()
+        versions_file = Path("test_storage/test_exams_versions.json")
+        if versions_file.exists():
+            versions_file.unlink()
+
     def test_to_dict(self):
         expected = {
-            "exam": self.exam_data,
+            "exam": {"subject": "Математика", "version": self.exam.version},
             "answers": self.answers
         }
         self.assertEqual(self.attempt.to_dict(), expected)
 
+    def test_from_dict_exam_reference(self):
+        Exam.archive(self.exam)
+        first = PreviousExamAttempt.from_dict(self.attempt.to_dict())
+        second = PreviousExamAttempt.from_dict(self.attempt.to_dict())
+        self.assertEqual(first.exam.questions, self.exam.questions)
+        # Все попытки ссылаются на один общий экземпляр экзамена
+        self.assertIs(first.exam, second.exam)
+
+    def test_from_dict_unknown_exam_version(self):
+        with patch('builtins.print'):
+            with self.assertRaises(ValueError):
+                PreviousExamAttempt.from_dict({"exam": {"subject": "Математика", "version": "000000000000"}, "answers": []})
+
     def test_from_dict(self):
         data = {
             "exam": self.exam_data,
@@ -0,0 +1,36 @@
+﻿import os
+import subprocess
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from persistence.registry import set_backend
+
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+class TestRegistry(unittest.TestCase):
+
+    def import_registry(self, backend):
+        env = dict(os.environ, LR1_STORAGE_BACKEND=backend)
+        return subprocess.run([sys.executable, "-c", "import persistence.registry"],
+                              cwd=ROOT, env=env, capture_output=True, text=True)
+
+    def test_backend_from_environment(self):
+        self.assertEqual(self.import_registry("sqlite").returncode, 0)
+
+    def test_unknown_backend_in_environment(self):
+        result = self.import_registry("mongo")
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn("LR1_STORAGE_BACKEND: 'mongo'", result.stderr)
+        self.assertIn("Доступные хранилища: json, journal, sqlite", result.stderr)
+
+    def test_set_unknown_backend(self):
+        with self.assertRaisesRegex(ValueError, "Доступные хранилища: json, journal, sqlite"):
+            set_backend("mongo")
+
+
+if __name__ == '__main__':
+    unittest.main()
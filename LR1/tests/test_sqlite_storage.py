@@ -0,0 +1,61 @@
+﻿import json
+import os
+from pathlib import Path
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from migrate_to_sqlite import migrate
+from persistence.sqlite_storage import SqliteStorage
+
+
+
+class TestSqliteStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.test_file = Path("test_storage/test_sqlite_storage.json")
+        self.storage = SqliteStorage(self.test_file)
+
+    def tearDown(self):
+        self.storage.close()
+        for suffix in ("", "-wal", "-shm"):
+            path = str(self.storage.db_path) + suffix
+            if os.path.exists(path):
+                os.remove(path)
+        if os.path.exists(self.test_file):
+            os.remove(self.test_file)
+
+    def test_put_and_get(self):
+        self.storage.put("1", {"id": "1", "last_name": "Иванов"})
+        self.assertEqual(self.storage.get("1"), {"id": "1", "last_name": "Иванов"})
+        self.assertTrue(self.storage.contains("1"))
+        self.assertIsNone(self.storage.get("2"))
+
+        self.storage.put("1", {"id": "1", "last_name": "Петров"})
+        self.assertEqual(self.storage.get("1")["last_name"], "Петров")
+
+    def test_delete(self):
+        self.storage.put_many({"1": {"id": "1"}, "2": {"id": "2"}})
+        self.assertTrue(self.storage.delete("1"))
+        self.assertFalse(self.storage.delete("1"))
+        self.assertEqual(self.storage.load_all(), {"2": {"id": "2"}})
+
+    def test_replace_all(self):
+        self.storage.put("1", {"id": "1"})
+        self.storage.replace_all({"3": {"id": "3"}})
+        self.assertEqual(self.storage.load_all(), {"3": {"id": "3"}})
+
+    def test_wal_mode(self):
+        self.storage.put("1", {"id": "1"})
+        mode = self.storage._connect().execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+    def test_migrate(self):
+        with open(self.test_file, 'w', encoding='utf-8') as file:
+            json.dump({"1": {"id": "1"}, "2": {"id": "2"}}, file)
+        self.assertEqual(migrate(self.test_file, replace=False), 2)
+        self.assertEqual(self.storage.load_all(), {"1": {"id": "1"}, "2": {"id": "2"}})
+
+if __name__ == '__main__':
+    unittest.main()
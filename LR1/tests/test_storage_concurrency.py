@@ -0,0 +1,60 @@
+﻿import json
+import multiprocessing
+import os
+from pathlib import Path
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from persistence.json_storage import JsonStorage
+
+
+PROCESSES = 4
+RECORDS_PER_PROCESS = 60
+
+
+def write_records(path: str, worker: int) -> None:
+    """Процесс-писатель: сохраняет свои записи небольшими пакетами."""
+    storage = JsonStorage(Path(path))
+    storage.FLUSH_BATCH_SIZE = 5
+    for i in range(RECORDS_PER_PROCESS):
+        key = f"{worker}-{i}"
+        storage.put(key, {"id": key, "worker": worker})
+    storage.flush()
+
+
+
+class TestStorageConcurrency(unittest.TestCase):
+
+    def setUp(self):
+        self.test_file = Path("test_storage/test_concurrency.json")
+        with open(self.test_file, 'w', encoding='utf-8') as file:
+            json.dump({}, file)
+
+    def tearDown(self):
+        for path in (self.test_file, Path(str(self.test_file) + ".lock")):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_concurrent_writers_do_not_lose_updates(self):
+        context = multiprocessing.get_context("spawn")
+        processes = [
+            context.Process(target=write_records, args=(str(self.test_file), worker))
+            for worker in range(PROCESSES)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(timeout=60)
+            self.assertEqual(process.exitcode, 0)
+
+        with open(self.test_file, 'r', encoding='utf-8') as file:
+            records = json.load(file)
+        self.assertEqual(len(records), PROCESSES * RECORDS_PER_PROCESS)
+        for worker in range(PROCESSES):
+            for i in range(RECORDS_PER_PROCESS):
+                self.assertEqual(records[f"{worker}-{i}"]["worker"], worker)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,6 +12,7 @@ from entities.student import Student
 from entities.exam import Exam
 from entities.previous_exam_attempt import PreviousExamAttempt
 from entities.educational_materials import EducationalMaterial
+from persistence.registry import flush_all
 
 
 
@@ -20,6 +21,7 @@ class TestStudent(unittest.TestCase):
     def setUp(self):
         self.test_file = Path("test_storage/test_students.json")
         Student.STORAGE_FILE = self.test_file
+        Exam.STORAGE_FILE = Path("test_storage/test_exams.json")
         self.student = Student(id="12345")
         self.student.last_name = "Иванов"
         self.student.first_name = "Иван"
@@ -39,8 +41,10 @@ class TestStudent(unittest.TestCase):
         self.student.unexplored_topics = {"Линейные уравнения", "Производная простой функции"}
 
     def tearDown(self):
-        if os.path.exists(self.test_file):
-            os.remove(self.test_file)
+        flush_all()
+        for path in (self.test_file, Path("test_storage/test_exams_versions.json")):
+            if os.path.exists(path):
+                os.remove(path)
 
     def test_set_info(self):
         with unittest.mock.patch('builtins.input', side_effect=["12345", "Иванов", "Иван"]):
@@ -56,6 +60,8 @@ class TestStudent(unittest.TestCase):
         self.student.exam_result.answers = ["1", "2"]
         errors = self.student.analyze_errors()
         self.assertEqual(len(errors), 2)  # All answers incorrect
+        # Неизученной остаётся тема последней ошибки
+        self.assertEqual(self.student.unexplored_topics, {"Производная простой функции"})
 
     def test_display_errors(self):
         with unittest.mock.patch('builtins.print') as mock_print:
@@ -123,6 +129,24 @@ class TestStudent(unittest.TestCase):
         self.assertEqual(loaded_student.last_name, "Иванов")
         self.assertEqual(loaded_student.first_name, "Иван")
 
+    def test_add_material_skips_duplicates(self):
+        duplicate = EducationalMaterial(topic="Линейные уравнения", title="Введение в алгебру", author="John Doe")
+        self.assertTrue(self.student.has_material(duplicate))
+        self.assertFalse(self.student.add_material(duplicate))
+        self.assertTrue(self.student.add_material(EducationalMaterial(topic="Линейные уравнения", title="Алгебра", author="Jane Doe")))
+        self.assertEqual(len(self.student.materials), 3)
+
+        self.student.materials = []
+        self.assertFalse(self.student.has_material(duplicate))
+
+    def test_materials_change_only_through_add_material(self):
+        material = EducationalMaterial(topic="Линейные уравнения", title="Алгебра", author="Jane Doe")
+        with self.assertRaises(AttributeError):
+            self.student.materials.append(material)
+        self.assertFalse(self.student.has_material(material))
+        self.assertTrue(self.student.add_material(material))
+        self.assertEqual(self.student.materials[-1], material)
+
     def test_display_unexplored_topics(self):
         with unittest.mock.patch('builtins.print') as mock_print:
             self.student.display_unexplored_topics()
@@ -0,0 +1,87 @@
+import argparse
+import os
+import tempfile
+import time
+import xml.sax
+from typing import Callable
+
+from benchmark_search import make_students
+from model.repositories import InMemoryStudentRepository
+from model.service import StudentModel
+from model.student_handler import DomHandler
+from model.validators import BasicStudentValidator
+
+
+class DictSaxHandler(xml.sax.ContentHandler):
+    """Разбор так, как его делал SaxHandler до загрузки столбцами: словарь на каждого студента."""
+
+    def __init__(self):
+        super().__init__()
+        self.students = []
+        self._student = None
+        self._element = None
+
+    def startElement(self, name, attrs):
+        if name == "Student":
+            self._student = {}
+        self._element = name
+
+    def characters(self, content):
+        if self._element and self._element != "Students" and self._element != "Student":
+            self._student[self._element] = self._student.get(self._element, "") + content
+
+    def endElement(self, name):
+        if name == "Student":
+            self.students.append(self._student)
+        self._element = None
+
+
+def load_by_rows(file_path: str) -> StudentModel:
+    """Загрузка так, как её делал StudentModel.load_from_file: проверка и добавление по одному студенту."""
+    handler = DictSaxHandler()
+    xml.sax.parse(file_path, handler)
+    model = StudentModel(InMemoryStudentRepository(), BasicStudentValidator())
+    for student_data in handler.students:
+        model.add_student({field: value.strip() for field, value in student_data.items()})
+    return model
+
+
+def load_by_columns(file_path: str) -> StudentModel:
+    model = StudentModel(InMemoryStudentRepository(), BasicStudentValidator())
+    model.load_from_file(file_path)
+    return model
+
+
+def measure(load: Callable[[str], StudentModel], file_path: str, repeats: int) -> float:
+    """Возвращает наименьшее время загрузки в секундах."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        load(file_path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(size: int, repeats: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "students.xml")
+        DomHandler().write_students_to_file(make_students(size), file_path)
+        assert load_by_rows(file_path).get_total_students() == load_by_columns(file_path).get_total_students()
+        file_size = os.path.getsize(file_path)
+        rows = measure(load_by_rows, file_path, repeats)
+        columns = measure(load_by_columns, file_path, repeats)
+    print(f"Студентов: {size}, размер файла: {file_size / 2 ** 20:.0f} МБ")
+    print(f"По одному студенту: {rows:.2f} с")
+    print(f"Столбцами:          {columns:.2f} с ({rows / columns:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение загрузки XML-файла: по одному студенту и столбцами.")
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    run(args.size, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
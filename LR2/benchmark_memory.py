@@ -0,0 +1,68 @@
+import argparse
+import gc
+import tracemalloc
+from typing import Callable, List, Tuple
+
+from benchmark_search import make_students
+from model.repositories import ColumnarStudentRepository, InMemoryStudentRepository
+from model.student import Student
+
+
+class DictStudent:
+    """Студент так, как он хранился до добавления __slots__ (атрибуты в __dict__)."""
+
+    def __init__(self, full_name, course, group, total_works, completed_works, programming_language):
+        self._full_name = full_name
+        self._course = course
+        self._group = group
+        self._total_works = total_works
+        self._completed_works = completed_works
+        self._programming_language = programming_language
+
+
+def make_rows(size: int) -> List[Tuple]:
+    """Данные студентов; каждая строка — отдельный объект, как после разбора XML."""
+    return [(s.full_name, s.course, s.group, s.total_works, s.completed_works, s.programming_language)
+            for s in make_students(size)]
+
+
+def copy_row(row: Tuple) -> Tuple:
+    return tuple(value.encode().decode() if isinstance(value, str) else value for value in row)
+
+
+def measure(build: Callable[[List[Tuple]], object], rows: List[Tuple]) -> float:
+    """Возвращает число байт на студента, занятых результатом build."""
+    gc.collect()
+    tracemalloc.start()
+    result = build(rows)
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return used / len(rows)
+
+
+def run(size: int) -> None:
+    rows = make_rows(size)
+    builds = [
+        ("Student с __dict__", lambda rows: [DictStudent(*copy_row(row)) for row in rows]),
+        ("Student с __slots__", lambda rows: [Student(*copy_row(row)) for row in rows]),
+        ("InMemoryStudentRepository", lambda rows: InMemoryStudentRepository([Student(*copy_row(row)) for row in rows])),
+        ("ColumnarStudentRepository", lambda rows: ColumnarStudentRepository(Student(*row) for row in rows)),
+    ]
+    baseline = None
+    print(f"{'хранение':>26} | {'байт на студента':>16} | {'экономия':>8}")
+    for name, build in builds:
+        used = measure(build, rows)
+        baseline = baseline or used
+        print(f"{name:>26} | {used:>16.1f} | {baseline / used:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение памяти, занимаемой студентами при разных способах хранения.")
+    parser.add_argument("--size", type=int, default=1_000_000)
+    args = parser.parse_args()
+    run(args.size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import random
+import time
+from typing import Callable, List
+
+from model.repositories import InMemoryStudentRepository
+from model.student import Student
+
+
+SYLLABLES = ["ан", "ба", "ва", "го", "да", "ер", "жи", "зо", "ки", "ло", "ми", "но", "ор", "пе", "ро",
+             "са", "ти", "ун", "фе", "ха", "це", "чу", "ша", "эл", "юр", "як"]
+LANGUAGES = ["Python", "Java", "C++", "C#", "JavaScript", "Go"]
+
+
+def make_word(rng: random.Random, ending: str) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize() + ending
+
+
+def make_students(size: int, seed: int = 0) -> List[Student]:
+    """Создаёт студентов со случайными (почти не повторяющимися) ФИО и группами."""
+    rng = random.Random(seed)
+    students = []
+    for _ in range(size):
+        total_works = rng.randint(5, 20)
+        students.append(Student(
+            full_name=f"{make_word(rng, 'ов')} {make_word(rng, '')} {make_word(rng, 'ович')}",
+            course=rng.randint(1, 4),
+            group=str(rng.randint(100000, 999999)),
+            total_works=total_works,
+            completed_works=rng.randint(0, total_works),
+            programming_language=rng.choice(LANGUAGES)
+        ))
+    return students
+
+
+def scan(students: List[Student], field: Callable[[Student], str], value: str) -> List[Student]:
+    """Поиск так, как его делал InMemoryStudentRepository до появления индексов."""
+    return [student for student in students if value.lower() in field(student).lower()]
+
+
+def measure(search: Callable[[], List[Student]], repeats: int) -> float:
+    """Возвращает среднее время одного поиска в миллисекундах."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        search()
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def run(sizes: List[int], repeats: int) -> None:
+    queries = [
+        ("FullName", lambda s: s.full_name, "лоро"),
+        ("FullName", lambda s: s.full_name, "ович"),
+        ("Group", lambda s: s.group, "1234"),
+    ]
+    print(f"{'студентов':>10} | {'критерий':>9} | {'запрос':>7} | {'найдено':>8} | "
+          f"{'перебор, мс':>12} | {'индекс, мс':>11} | {'ускорение':>9}")
+    for size in sizes:
+        students = make_students(size)
+        repository = InMemoryStudentRepository(students)
+        for key, field, value in queries:
+            found = len(repository.search_students({key: value}))
+            assert found == len(scan(students, field, value))
+            scan_ms = measure(lambda: scan(students, field, value), repeats)
+            index_ms = measure(lambda: repository.search_students({key: value}), repeats)
+            print(f"{size:>10} | {key:>9} | {value:>7} | {found:>8} | "
+                  f"{scan_ms:>12.3f} | {index_ms:>11.3f} | {scan_ms / index_ms:>8.0f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение поиска по подстроке: перебор студентов и индекс триграмм.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    run(args.sizes, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import queue
+import threading
+from typing import Any, Callable, Optional
+
+
+class OperationCancelled(Exception):
+    """Операция отменена пользователем."""
+
+
+class BackgroundTask:
+    """Выполняет долгую операцию в рабочем потоке, не блокируя цикл Tk.
+
+    Операция work получает функцию report(fraction) для сообщения о ходе
+    выполнения (доля от 0 до 1). Если операция отменена, report выбрасывает
+    OperationCancelled, поэтому операция прерывается при ближайшем отчёте.
+    Рабочий поток не обращается к Tk: ход выполнения и результат передаются
+    через очередь, которую основной поток опрашивает с помощью schedule
+    (root.after), и там же вызываются on_progress и on_done.
+    """
+
+    # Интервал опроса очереди, мс
+    POLL_INTERVAL = 50
+
+    def __init__(self, schedule: Callable[[int, Callable[[], None]], Any],
+                 work: Callable[[Callable[[float], None]], Any],
+                 on_progress: Callable[[float], None],
+                 on_done: Callable[[Any, Optional[BaseException]], None]):
+        self._schedule = schedule
+        self._work = work
+        self._on_progress = on_progress
+        self._on_done = on_done
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+        self._schedule(self.POLL_INTERVAL, self._poll)
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def _report(self, fraction: float) -> None:
+        if self._cancelled.is_set():
+            raise OperationCancelled("Операция отменена")
+        self._queue.put(("progress", fraction))
+
+    def _run(self) -> None:
+        try:
+            result = self._work(self._report)
+        except Exception as e:
+            self._queue.put(("done", None, e))
+        else:
+            self._queue.put(("done", result, None))
+
+    def _poll(self) -> None:
+        # Из накопившихся отчётов о ходе выполнения показывается только последний
+        progress = None
+        while True:
+            try:
+                message = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if message[0] == "done":
+                self._on_done(message[1], message[2])
+                return
+            progress = message[1]
+        if progress is not None:
+            self._on_progress(progress)
+        self._schedule(self.POLL_INTERVAL, self._poll)
@@ -1,66 +1,117 @@
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional
 from tkinter import filedialog
 
+from controller.background import BackgroundTask, OperationCancelled
+from controller.live_search import LiveSearch
+from model.incremental_search import IncrementalSearch
+from model.query import Criteria
+from model.repositories import SearchCursor, StudentChange
 from model.student import Student
 from model.service import StudentModel
+from model.snapshot_handler import SNAPSHOT_EXTENSION
 
 
 class StudentController:
+    # Формат файла выбирается по расширению: снимок или XML
+    _FILE_TYPES = [("XML files", "*.xml"), ("Snapshot files", f"*{SNAPSHOT_EXTENSION}")]
+
     def __init__(self, model: StudentModel, view):
         self._model = model
         self._view = view
         self._view.set_controller(self)
         self._current_file_path = None
+        # Выполняющаяся в рабочем потоке операция с файлом
+        self._file_task: Optional[BackgroundTask] = None
+        # Таблица обновляется по изменениям хранилища, а не перечитывается целиком
+        self._model.subscribe(self._on_students_changed)
+    
+    def _on_students_changed(self, change: StudentChange) -> None:
+        # Файл загружается в рабочем потоке, а представление можно менять только
+        # в потоке Tk: после загрузки таблица обновляется целиком в on_success
+        if self._file_task is None:
+            self._view.on_students_changed(change)
     
     def add_student(self, student_data: Dict[str, str]) -> bool:
         try:
             self._model.add_student(student_data)
             self._view.show_message("Студент добавлен!")
-            self._view.update_view()
             return True
         except Exception as e:
             self._view.show_error(str(e))
             return False
     
-    def delete_students(self, criteria: Dict[str, str]) -> None:
+    def delete_students(self, criteria: Criteria) -> None:
         try:
             deleted_count = self._model.delete_students(criteria)
             if deleted_count > 0:
                 self._view.show_message(f"Удалено {deleted_count} записей.")
             else:
                 self._view.show_message("Записи не найдены.")
-            self._view.update_view()
         except Exception as e:
             self._view.show_error(f"Ошибка при удалении студентов: {e}")
     
     def save_to_file(self) -> None:
         file_path = self._current_file_path or filedialog.asksaveasfilename(
             defaultextension=".xml",
-            filetypes=[("XML files", "*.xml")]
+            filetypes=self._FILE_TYPES
         )
         
         if not file_path:
             return
-            
-        try:
-            self._model.save_to_file(file_path)
+        
+        save = self._model.save_snapshot if self._is_snapshot(file_path) else self._model.save_to_file
+        
+        def on_success() -> None:
             self._current_file_path = file_path
             self._view.show_message("Данные успешно сохранены!")
-        except Exception as e:
-            self._view.show_error(f"Ошибка при сохранении данных: {e}")
+        
+        self._run_file_operation("Сохранение данных", lambda progress: save(file_path, progress),
+                                 on_success, "Ошибка при сохранении данных")
     
     def load_from_file(self) -> None:
-        file_path = filedialog.askopenfilename(filetypes=[("XML files", "*.xml")])
+        file_path = filedialog.askopenfilename(filetypes=self._FILE_TYPES)
         if not file_path:
             return
-            
-        try:
-            self._model.load_from_file(file_path)
+        
+        load = self._model.load_snapshot if self._is_snapshot(file_path) else self._model.load_from_file
+        
+        def on_success() -> None:
             self._current_file_path = file_path
             self._view.show_message("Данные успешно загружены!")
-            self._view.update_view()
-        except Exception as e:
-            self._view.show_error(f"Ошибка при загрузке данных: {e}")
+            self._view.on_students_loaded()
+        
+        self._run_file_operation("Загрузка данных", lambda progress: load(file_path, progress),
+                                 on_success, "Ошибка при загрузке данных")
+    
+    def cancel_file_operation(self) -> None:
+        if self._file_task is not None:
+            self._file_task.cancel()
+    
+    def _run_file_operation(self, title: str, work: Callable[[Callable[[float], None]], None],
+                            on_success: Callable[[], None], error_message: str) -> None:
+        """Выполняет операцию с файлом в рабочем потоке, показывая окно с ходом выполнения."""
+        if self._file_task is not None:
+            self._view.show_error("Дождитесь завершения текущей операции с файлом.")
+            return
+        
+        progress_dialog = self._view.show_progress(title)
+        
+        def on_done(result, error: Optional[BaseException]) -> None:
+            self._file_task = None
+            progress_dialog.close()
+            if isinstance(error, OperationCancelled):
+                self._view.show_message("Операция отменена.")
+            elif error is not None:
+                self._view.show_error(f"{error_message}: {error}")
+            else:
+                on_success()
+        
+        self._file_task = BackgroundTask(self._view.after, work, progress_dialog.set_progress, on_done)
+        self._file_task.start()
+    
+    @staticmethod
+    def _is_snapshot(file_path: str) -> bool:
+        return file_path.lower().endswith(SNAPSHOT_EXTENSION)
     
     def get_paginated_students(self, page: int, page_size: int) -> List[Student]:
         try:
@@ -69,11 +120,27 @@ class StudentController:
             self._view.show_error(f"Ошибка при получении данных: {e}")
             return []
     
+    def get_students_range(self, offset: int, count: int) -> List[Student]:
+        try:
+            return self._model.get_students_range(offset, count)
+        except Exception as e:
+            self._view.show_error(f"Ошибка при получении данных: {e}")
+            return []
+    
     def get_total_students(self) -> int:
         return self._model.get_total_students()
     
-    def get_search_results(self, criteria: Dict[str, str]) -> List[Student]:
+    def get_search_results(self, criteria: Criteria) -> List[Student]:
         return self._model.search_students(criteria)
     
+    def get_search_cursor(self, criteria: Criteria) -> SearchCursor:
+        return self._model.search_cursor(criteria)
+    
+    def create_live_search(self, on_results: Callable[[SearchCursor], None],
+                           on_error: Callable[[Exception], None]) -> LiveSearch:
+        """Создаёт поиск по мере ввода: запросы выполняются в рабочем потоке, результаты передаются в on_results."""
+        return LiveSearch(self._view.after, IncrementalSearch(self._model.search_cursor, self._model.get_version), on_results, on_error,
+                          self._model.prepare_search)
+    
     def get_unique_values(self, field: str) -> List[str]:
         return self._model.get_unique_values(field)
\ No newline at end of file
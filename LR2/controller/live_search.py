@@ -0,0 +1,77 @@
+from typing import Any, Callable, Optional
+
+from controller.background import BackgroundTask
+from model.incremental_search import IncrementalSearch
+from model.query import Query
+from model.repositories import SearchCursor
+
+
+class LiveSearch:
+    """Поиск по мере ввода, выполняемый в рабочем потоке.
+
+    Одновременно выполняется не больше одного поиска: хранилище не
+    рассчитано на поиск из нескольких потоков сразу. Запрос, пришедший во
+    время поиска, запоминается и запускается после него, а результат
+    устаревшего поиска не показывается. Промежуточные запросы, пришедшие за
+    время одного поиска, отбрасываются — выполняется только последний.
+    Перед запуском поиска в потоке Tk вызывается prepare (например, строит
+    индексы хранилища), чтобы рабочий поток только читал хранилище.
+    """
+
+    def __init__(self, schedule: Callable[[int, Callable[[], None]], Any], search: IncrementalSearch,
+                 on_results: Callable[[SearchCursor], None], on_error: Callable[[Exception], None],
+                 prepare: Optional[Callable[[], None]] = None):
+        self._schedule = schedule
+        self._prepare = prepare
+        self._search = search
+        self._on_results = on_results
+        self._on_error = on_error
+        self._task: Optional[BackgroundTask] = None
+        # Поиск, ожидающий завершения текущего
+        self._pending: Optional[Callable[[], SearchCursor]] = None
+        # Результат выполняющегося поиска больше не нужен
+        self._stale = False
+        self._closed = False
+
+    def search(self, key: str, value: str) -> None:
+        self._enqueue(lambda: self._search.search(key, value))
+
+    def search_query(self, query: Query) -> None:
+        self._enqueue(lambda: self._search.search_query(query))
+
+    def discard(self) -> None:
+        """Отменяет ожидающий запрос; результат выполняющегося поиска не будет передан."""
+        self._pending = None
+        self._stale = self._task is not None
+
+    def close(self) -> None:
+        """Прекращает поиск: после закрытия результаты не передаются."""
+        self._closed = True
+        self._pending = None
+
+    def _enqueue(self, search: Callable[[], SearchCursor]) -> None:
+        self._pending = search
+        if self._task is None:
+            self._start_next()
+
+    def _start_next(self) -> None:
+        search, self._pending = self._pending, None
+        self._stale = False
+        if self._prepare is not None:
+            self._prepare()
+        self._task = BackgroundTask(self._schedule, lambda report: search(),
+                                    lambda fraction: None, self._on_done)
+        self._task.start()
+
+    def _on_done(self, result: Optional[SearchCursor], error: Optional[BaseException]) -> None:
+        self._task = None
+        if self._closed:
+            return
+        if self._pending is not None:
+            self._start_next()
+        elif self._stale:
+            self._stale = False
+        elif error is not None:
+            self._on_error(error)
+        else:
+            self._on_results(result)
@@ -0,0 +1,20 @@
+import argparse
+
+from model.snapshot_handler import SNAPSHOT_EXTENSION, snapshot_to_xml, xml_to_snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=f"Преобразование файла студентов из XML в снимок ({SNAPSHOT_EXTENSION}) и обратно.")
+    parser.add_argument("source", help="исходный файл; снимок определяется по расширению")
+    parser.add_argument("target", help="файл результата")
+    args = parser.parse_args()
+
+    if args.source.lower().endswith(SNAPSHOT_EXTENSION):
+        snapshot_to_xml(args.source, args.target)
+    else:
+        xml_to_snapshot(args.source, args.target)
+
+
+if __name__ == "__main__":
+    main()
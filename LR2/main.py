@@ -1,18 +1,30 @@
+import argparse
 import tkinter as tk
 
 from controller.controller import StudentController
 from view.view import StudentView
 from model.service import StudentModel
-from model.repositories import InMemoryStudentRepository
+from model.repositories import ColumnarStudentRepository, InMemoryStudentRepository, SqliteStudentRepository
 from model.validators import BasicStudentValidator
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Управление студентами.")
+    storage = parser.add_mutually_exclusive_group()
+    storage.add_argument("--db", help="файл базы данных SQLite; без него студенты хранятся в памяти")
+    storage.add_argument("--columnar", action="store_true", help="компактное хранение студентов в памяти по столбцам")
+    args = parser.parse_args()
+
     root = tk.Tk()
     root.title("Управление студентами")
     
     # Создаем цепочку зависимостей
-    repository = InMemoryStudentRepository()
+    if args.db:
+        repository = SqliteStudentRepository(args.db)
+    elif args.columnar:
+        repository = ColumnarStudentRepository()
+    else:
+        repository = InMemoryStudentRepository()
     validator = BasicStudentValidator()
     model = StudentModel(repository, validator)
     view = StudentView(root)
@@ -0,0 +1,169 @@
+from array import array
+import sys
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+class IntColumn:
+    """Столбец целых чисел в массиве array.
+
+    Сначала числа хранятся в элементах типа typecode (по умолчанию
+    однобайтовые беззнаковые), а когда очередное число в них не помещается,
+    массив расширяется до следующего подходящего типа: двух- и
+    четырёхбайтовых беззнаковых, затем восьмибайтовых знаковых.
+    """
+
+    # Типы элементов в порядке расширения
+    _WIDER = ('B', 'H', 'I', 'q')
+
+    def __init__(self, values: Iterable[int] = (), typecode: str = 'B'):
+        self._values = array(typecode)
+        for value in values:
+            self.append(value)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getitem__(self, row: int) -> int:
+        return self._values[row]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._values)
+
+    def append(self, value: int) -> None:
+        try:
+            self._values.append(value)
+        except OverflowError:
+            self._widen(value)
+
+    def _widen(self, value: int) -> None:
+        for typecode in self._WIDER[self._WIDER.index(self._values.typecode) + 1:]:
+            try:
+                values = array(typecode, self._values)
+                values.append(value)
+            except OverflowError:
+                continue
+            self._values = values
+            return
+        raise OverflowError(f"Число {value} не помещается в столбец")
+
+    def sum(self, start: int, stop: int) -> int:
+        """Сумма чисел строк с номерами от start до stop (не включая stop)."""
+        return sum(self._values[start:stop])
+
+    def take(self, rows: Iterable[int]) -> "IntColumn":
+        """Новый столбец из строк с номерами rows."""
+        return IntColumn(map(self._values.__getitem__, rows), self._values.typecode)
+
+
+class StringColumn:
+    """Столбец строк без отдельного объекта на строку.
+
+    Строки хранятся подряд в одном bytearray в кодировке UTF-8. Строки
+    разбиты на блоки по BLOCK_SIZE: для блока хранится смещение его начала,
+    а для строки — смещение её конца от начала блока (обычно два байта).
+    Строка декодируется только при обращении к ней.
+    """
+
+    BLOCK_SIZE = 256
+
+    def __init__(self, values: Iterable[str] = ()):
+        self._data = bytearray()
+        self._starts = array('q')
+        # Смещения внутри блока помещаются в два байта, пока блок меньше 64 КБ
+        self._ends = IntColumn(typecode='H')
+        for value in values:
+            self.append(value)
+
+    def __len__(self) -> int:
+        return len(self._ends)
+
+    def __getitem__(self, row: int) -> str:
+        ends = self._ends
+        end = ends[row]
+        if row < 0:
+            row += len(ends)
+        offset = row % self.BLOCK_SIZE
+        base = self._starts[row // self.BLOCK_SIZE]
+        return self._data[base + ends[row - 1] if offset else base:base + end].decode()
+
+    def __iter__(self) -> Iterator[str]:
+        data, starts, size = self._data, self._starts, self.BLOCK_SIZE
+        for row, end in enumerate(self._ends):
+            offset = row % size
+            if not offset:
+                base, start = starts[row // size], 0
+            yield data[base + start:base + end].decode()
+            start = end
+
+    def _bounds(self, row: int) -> Tuple[int, int]:
+        """Смещения начала и конца строки row в буфере."""
+        end = self._ends[row]
+        if row < 0:
+            row += len(self._ends)
+        block, offset = divmod(row, self.BLOCK_SIZE)
+        base = self._starts[block]
+        return base + (self._ends[row - 1] if offset else 0), base + end
+
+    def append(self, value: str) -> None:
+        self._append_encoded(value.encode())
+
+    def _append_encoded(self, encoded: bytes) -> None:
+        if len(self._ends) % self.BLOCK_SIZE == 0:
+            self._starts.append(len(self._data))
+        self._data += encoded
+        self._ends.append(len(self._data) - self._starts[-1])
+
+    def take(self, rows: Iterable[int]) -> "StringColumn":
+        """Новый столбец из строк с номерами rows."""
+        column, data = StringColumn(), self._data
+        # Строки копируются без декодирования
+        for row in rows:
+            start, end = self._bounds(row)
+            column._append_encoded(data[start:end])
+        return column
+
+
+class InternedColumn:
+    """Столбец строк с небольшим числом различных значений.
+
+    Каждое различное значение хранится один раз (и интернируется), а для
+    строк столбца хранятся только номера значений.
+    """
+
+    def __init__(self, values: Iterable[str] = ()):
+        self._values: List[str] = []
+        self._codes_by_value: Dict[str, int] = {}
+        self._codes = IntColumn()
+        for value in values:
+            self.append(value)
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __getitem__(self, row: int) -> str:
+        return self._values[self._codes[row]]
+
+    def __iter__(self) -> Iterator[str]:
+        values = self._values
+        return (values[code] for code in self._codes)
+
+    @property
+    def values(self) -> List[str]:
+        """Различные значения; номер значения — его позиция в списке."""
+        return self._values
+
+    @property
+    def codes(self) -> IntColumn:
+        """Номера значений строк столбца."""
+        return self._codes
+
+    def append(self, value: str) -> None:
+        code = self._codes_by_value.get(value)
+        if code is None:
+            code = self._codes_by_value[value] = len(self._values)
+            self._values.append(sys.intern(value))
+        self._codes.append(code)
+
+    def take(self, rows: Iterable[int]) -> "InternedColumn":
+        """Новый столбец из строк с номерами rows."""
+        return InternedColumn(map(self.__getitem__, rows))
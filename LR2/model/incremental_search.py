@@ -0,0 +1,66 @@
+from operator import attrgetter
+from typing import Callable, Dict, Optional, Tuple
+
+from model.query import Criteria, Query
+from model.repositories import FilterSearchCursor, SearchCursor
+
+
+class IncrementalSearch:
+    """Поиск по одному критерию, значение которого вводится по символу.
+
+    Для критериев с поиском по подстроке значение, содержащее предыдущее,
+    находит подмножество прежних студентов. Если результатов последнего
+    поиска в хранилище не больше REFINE_LIMIT, новые отбираются из них
+    курсором FilterSearchCursor без обращения к хранилищу; иначе (и для
+    остальных запросов) выполняется обычный поиск через курсор. Ни в одном
+    случае результаты не собираются в список. Прежние результаты уточняются,
+    только если хранилище не менялось после их поиска: version() возвращает
+    номер версии хранилища.
+    """
+
+    # Наибольшее число прежних результатов, которые уточняются без обращения к хранилищу
+    REFINE_LIMIT = 10_000
+
+    # Критерии с поиском по подстроке (без учёта регистра) -> значение поля студента
+    _SUBSTRING_FIELDS: Dict[str, Callable] = {
+        "FullName": attrgetter("full_name"),
+        "Group": attrgetter("group"),
+        "ProgrammingLanguage": attrgetter("programming_language"),
+    }
+
+    def __init__(self, search_cursor: Callable[[Criteria], SearchCursor], version: Callable[[], int]):
+        self._search_cursor = search_cursor
+        self._version = version
+        # Последний поиск в хранилище: (критерий, значение в нижнем регистре, результаты, версия хранилища).
+        # Уточнённые результаты сюда не попадают: следующее значение тоже отбирается из результатов поиска
+        self._last: Optional[Tuple[str, str, SearchCursor, int]] = None
+
+    def search(self, key: str, value: str) -> SearchCursor:
+        """Возвращает результаты поиска по критерию key; число результатов уже подсчитано."""
+        needle = value.lower()
+        # Версия читается до поиска: изменение во время поиска не даст уточнять его результаты
+        version = self._version()
+        if self._can_refine(key, needle, version):
+            field = self._SUBSTRING_FIELDS[key]
+            cursor = FilterSearchCursor(self._last[2], lambda student: needle in field(student).lower())
+            cursor.count()
+            return cursor
+        cursor = self._search_cursor({key: value})
+        cursor.count()
+        self._last = (key, needle, cursor, version)
+        return cursor
+
+    def search_query(self, query: Query) -> SearchCursor:
+        """Возвращает результаты составного запроса; число результатов уже подсчитано."""
+        cursor = self._search_cursor(query)
+        cursor.count()
+        # Составной запрос не уточняет поиск по одному критерию
+        self._last = None
+        return cursor
+
+    def _can_refine(self, key: str, needle: str, version: int) -> bool:
+        if self._last is None or key not in self._SUBSTRING_FIELDS:
+            return False
+        last_key, last_needle, last_results, last_version = self._last
+        return (key == last_key and last_needle in needle and last_version == version
+                and last_results.count() <= self.REFINE_LIMIT)
@@ -0,0 +1,85 @@
+from array import array
+from typing import Dict, Iterator, List, Optional
+
+
+class NGramIndex:
+    """Инвертированный индекс n-грамм для поиска строк по подстроке.
+
+    Каждой добавленной строке присваивается номер, а для каждой n-граммы
+    хранится массив номеров строк, в которых она встречается. Поиск берёт
+    самый короткий из массивов n-грамм запроса и проверяет подстроку только
+    у этих строк. Удалённые строки помечаются и не возвращаются; когда их
+    набирается больше, чем живых, индекс перестраивается.
+    """
+
+    def __init__(self, n: int = 3):
+        self._n = n
+        self._keys: List[Optional[str]] = []
+        self._ids: Dict[str, int] = {}
+        self._postings: Dict[str, array] = {}
+        self._removed = 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._ids
+
+    def add(self, key: str) -> None:
+        if key in self._ids:
+            return
+        key_id = len(self._keys)
+        self._keys.append(key)
+        self._ids[key] = key_id
+        for gram in set(self._grams(key)):
+            posting = self._postings.get(gram)
+            if posting is None:
+                posting = self._postings[gram] = array('i')
+            posting.append(key_id)
+
+    def discard(self, key: str) -> None:
+        key_id = self._ids.pop(key, None)
+        if key_id is None:
+            return
+        self._keys[key_id] = None
+        self._removed += 1
+        if self._removed > len(self._ids):
+            self._rebuild()
+
+    def estimate(self, needle: str) -> int:
+        """Оценка сверху числа строк, содержащих подстроку (размер проверяемого списка кандидатов)."""
+        candidates = self._candidates(needle)
+        return len(self._ids) if candidates is None else len(candidates)
+
+    def search(self, needle: str) -> List[str]:
+        """Возвращает все строки индекса, содержащие подстроку needle."""
+        candidates = self._candidates(needle)
+        if candidates is None:
+            # Короткий запрос не содержит ни одной n-граммы: проверяются все строки
+            return [key for key in self._ids if needle in key]
+
+        keys = self._keys
+        return [keys[key_id] for key_id in candidates
+                if keys[key_id] is not None and needle in keys[key_id]]
+
+    def _candidates(self, needle: str) -> Optional[array]:
+        """Самый короткий список номеров строк среди n-грамм запроса (None, если запрос короче n)."""
+        if len(needle) < self._n:
+            return None
+        shortest = None
+        for gram in set(self._grams(needle)):
+            posting = self._postings.get(gram)
+            if posting is None:
+                return array('i')
+            if shortest is None or len(posting) < len(shortest):
+                shortest = posting
+        return shortest
+
+    def _grams(self, text: str) -> Iterator[str]:
+        return (text[i:i + self._n] for i in range(len(text) - self._n + 1))
+
+    def _rebuild(self) -> None:
+        keys = list(self._ids)
+        self._keys, self._ids, self._postings, self._removed = [], {}, {}, 0
+        for key in keys:
+            self.add(key)
@@ -0,0 +1,206 @@
+import operator
+import re
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple, Union
+
+
+# Числовые поля критериев -> значение поля студента
+NUMERIC_FIELDS: Dict[str, Callable[[Any], int]] = {
+    "Course": attrgetter("course"),
+    "TotalWorks": attrgetter("total_works"),
+    "CompletedWorks": attrgetter("completed_works"),
+    "NotCompletedWorks": attrgetter("not_completed_works"),
+}
+# Строковые поля критериев (сравниваются без учёта регистра) -> значение поля студента
+STRING_FIELDS: Dict[str, Callable[[Any], str]] = {
+    "FullName": attrgetter("full_name"),
+    "Group": attrgetter("group"),
+    "ProgrammingLanguage": attrgetter("programming_language"),
+}
+
+CONTAINS = "contains"
+# Сравнения: для числовых полей — все, для строковых — только = и !=
+COMPARISONS: Dict[str, Callable[[Any, Any], bool]] = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+# Имена полей в тексте запроса -> поле критерия
+FIELD_NAMES: Dict[str, str] = {
+    "full_name": "FullName", "фио": "FullName",
+    "course": "Course", "курс": "Course",
+    "group": "Group", "группа": "Group",
+    "total_works": "TotalWorks", "всего_работ": "TotalWorks",
+    "completed_works": "CompletedWorks", "выполнено_работ": "CompletedWorks",
+    "not_completed_works": "NotCompletedWorks", "не_выполнено_работ": "NotCompletedWorks",
+    "programming_language": "ProgrammingLanguage", "language": "ProgrammingLanguage", "язык": "ProgrammingLanguage",
+}
+_CONTAINS_WORDS = ("contains", "содержит")
+_AND_WORDS = ("and", "и")
+_OR_WORDS = ("or", "или")
+
+
+class Condition(NamedTuple):
+    """Условие на одно поле студента.
+
+    Для числовых полей op — сравнение с числом value. Для строковых полей op —
+    CONTAINS (подстрока) или =, != (равенство); value хранится в нижнем
+    регистре, и значения сравниваются без учёта регистра. Условия создаются
+    функцией condition, которая проверяет и приводит значение.
+    """
+    key: str
+    op: str
+    value: Any
+
+    def matches(self, student) -> bool:
+        if self.key in NUMERIC_FIELDS:
+            return COMPARISONS[self.op](NUMERIC_FIELDS[self.key](student), self.value)
+        value = STRING_FIELDS[self.key](student).lower()
+        if self.op == CONTAINS:
+            return self.value in value
+        return COMPARISONS[self.op](value, self.value)
+
+
+class And(NamedTuple):
+    """Выполняются все условия operands (пустой And выполняется всегда)."""
+    operands: Tuple["Query", ...]
+
+    def matches(self, student) -> bool:
+        return all(operand.matches(student) for operand in self.operands)
+
+
+class Or(NamedTuple):
+    """Выполняется хотя бы одно из условий operands."""
+    operands: Tuple["Query", ...]
+
+    def matches(self, student) -> bool:
+        return any(operand.matches(student) for operand in self.operands)
+
+
+Query = Union[Condition, And, Or]
+# Критерии поиска и удаления: словарь «поле: значение» или запрос
+Criteria = Union[Dict[str, str], Query]
+
+
+def condition(key: str, op: str, value: Any) -> Condition:
+    """Создаёт условие, проверяя поле и сравнение и приводя значение к типу поля."""
+    if key in NUMERIC_FIELDS:
+        if op not in COMPARISONS:
+            raise ValueError(f"Сравнение «{op}» не применимо к числовому полю {key}")
+        try:
+            return Condition(key, op, int(value))
+        except ValueError:
+            raise ValueError(f"Значение поля {key} должно быть целым числом: {value}") from None
+    if key in STRING_FIELDS:
+        if op not in (CONTAINS, "=", "!="):
+            raise ValueError(f"Сравнение «{op}» не применимо к строковому полю {key}")
+        return Condition(key, op, str(value).lower())
+    raise ValueError(f"Неизвестное поле: {key}")
+
+
+def from_criteria(criteria: Dict[str, str]) -> And:
+    """Запрос для словаря критериев: числовые поля сравниваются на равенство,
+    строковые ищутся по подстроке. Неизвестные критерии не учитываются."""
+    return And(tuple(condition(key, "=" if key in NUMERIC_FIELDS else CONTAINS, value)
+                     for key, value in criteria.items() if key in NUMERIC_FIELDS or key in STRING_FIELDS))
+
+
+def as_query(criteria: Criteria) -> Query:
+    return from_criteria(criteria) if isinstance(criteria, dict) else criteria
+
+
+_TOKEN = re.compile(r'\s*(?:(<=|>=|!=|=|<|>|\(|\))|"((?:[^"]|"")*)"|([^\s()<>=!"]+))')
+
+
+def parse_query(text: str) -> Query:
+    """Разбирает текст запроса.
+
+    Условие — «поле сравнение значение», например completed_works >= 5 или
+    full_name contains "иван". Сравнения: =, !=, <, <=, >, >=, contains
+    (содержит). Условия объединяются словами AND (И) и OR (ИЛИ), AND
+    связывает сильнее OR, порядок меняется скобками. Значение с пробелами
+    заключается в кавычки, кавычка внутри значения удваивается.
+    """
+    tokens = []
+    position = 0
+    text = text.strip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"Ошибка в запросе: непонятный символ в позиции {position + 1}")
+        symbol, quoted, word = match.groups()
+        if symbol is not None:
+            tokens.append(("symbol", symbol))
+        elif quoted is not None:
+            tokens.append(("value", quoted.replace('""', '"')))
+        else:
+            tokens.append(("word", word))
+        position = match.end()
+    if not tokens:
+        raise ValueError("Ошибка в запросе: запрос пуст")
+    parser = _Parser(tokens)
+    query = parser.parse_or()
+    if parser.position < len(tokens):
+        raise ValueError(f"Ошибка в запросе: лишнее «{tokens[parser.position][1]}»")
+    return query
+
+
+class _Parser:
+    """Разбор списка лексем методом рекурсивного спуска."""
+
+    def __init__(self, tokens: List[Tuple[str, str]]):
+        self.tokens = tokens
+        self.position = 0
+
+    def _peek_word(self, words: Tuple[str, ...]) -> bool:
+        if self.position < len(self.tokens):
+            kind, text = self.tokens[self.position]
+            return kind == "word" and text.lower() in words
+        return False
+
+    def _next(self, expected: str) -> Tuple[str, str]:
+        if self.position >= len(self.tokens):
+            raise ValueError(f"Ошибка в запросе: ожидается {expected}")
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def parse_or(self) -> Query:
+        operands = [self.parse_and()]
+        while self._peek_word(_OR_WORDS):
+            self.position += 1
+            operands.append(self.parse_and())
+        return operands[0] if len(operands) == 1 else Or(tuple(operands))
+
+    def parse_and(self) -> Query:
+        operands = [self.parse_operand()]
+        while self._peek_word(_AND_WORDS):
+            self.position += 1
+            operands.append(self.parse_operand())
+        return operands[0] if len(operands) == 1 else And(tuple(operands))
+
+    def parse_operand(self) -> Query:
+        kind, text = self._next("условие")
+        if (kind, text) == ("symbol", "("):
+            query = self.parse_or()
+            if self._next("«)»") != ("symbol", ")"):
+                raise ValueError("Ошибка в запросе: ожидается «)»")
+            return query
+        if kind != "word" or text.lower() not in FIELD_NAMES:
+            raise ValueError(f"Ошибка в запросе: неизвестное поле «{text}»")
+        key = FIELD_NAMES[text.lower()]
+
+        kind, op = self._next("сравнение")
+        if kind == "word" and op.lower() in _CONTAINS_WORDS:
+            op = CONTAINS
+        elif kind != "symbol" or op not in COMPARISONS:
+            raise ValueError(f"Ошибка в запросе: ожидается сравнение после «{text}»")
+
+        kind, value = self._next("значение")
+        if kind == "symbol":
+            raise ValueError(f"Ошибка в запросе: ожидается значение, а не «{value}»")
+        return condition(key, op, value)
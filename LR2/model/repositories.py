@@ -1,23 +1,211 @@
-from typing import List, Dict
+from typing import Any, Callable, Iterable, Iterator, List, Dict, NamedTuple, Optional, Tuple
 from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from copy import copy
+import heapq
+from itertools import chain, islice
+from operator import attrgetter
+import sqlite3
 from xml.etree import ElementTree as ET
 from xml.dom import minidom
 import xml.sax
 
-from model.student import Student
+from model.columns import IntColumn, InternedColumn, StringColumn
+from model.ngram_index import NGramIndex
+from model.query import COMPARISONS, CONTAINS, And, Condition, Criteria, Or, Query, as_query
+from model.student import Student, StudentRow
+
+
+class StudentChange(NamedTuple):
+    """Изменение хранилища, о котором сообщается подписчикам.
+
+    positions — позиции студентов в порядке хранилища по возрастанию:
+    для INSERTED — позиции добавленных студентов, для REMOVED — позиции
+    удалённых студентов до удаления. RESET означает, что содержимое
+    заменено целиком (replace_all, clear), позиции не передаются.
+    """
+    kind: str
+    positions: Tuple[int, ...] = ()
+
+    INSERTED = "inserted"
+    REMOVED = "removed"
+    RESET = "reset"
+
+
+class SearchCursor(ABC):
+    """Результаты поиска, которые читаются по частям.
+
+    count возвращает число найденных студентов, а get_range — не более count
+    студентов начиная с позиции offset среди результатов, так что в памяти
+    оказываются только прочитанные студенты.
+    """
+
+    @abstractmethod
+    def count(self) -> int:
+        pass
+
+    @abstractmethod
+    def get_range(self, offset: int, count: int) -> List[Student]:
+        pass
+
+
+class ListSearchCursor(SearchCursor):
+    """Результаты поиска, уже собранные в список."""
+
+    def __init__(self, students: List[Student]):
+        self._students = students
+
+    def count(self) -> int:
+        return len(self._students)
+
+    def get_range(self, offset: int, count: int) -> List[Student]:
+        if count <= 0:
+            return []
+        offset = max(0, offset)
+        return self._students[offset:offset + count]
+
+
+class ScanSearchCursor(SearchCursor):
+    """Результаты поиска, которые находятся проверкой строк 0..size-1 по порядку.
+
+    Строка подходит, если её номер проходит все проверки checks. Подсчёт
+    результатов проходит строки один раз и запоминает номер строки каждого
+    CHECKPOINT_STRIDE-го результата. Диапазон результатов ищется от ближайшей
+    такой контрольной точки, поэтому память курсора — одно число на
+    CHECKPOINT_STRIDE результатов.
+    """
+
+    CHECKPOINT_STRIDE = 256
+
+    def __init__(self, size: int, checks: List[Callable[[int], bool]], make_row: Callable[[int], Student]):
+        self._size = size
+        self._checks = checks
+        self._make_row = make_row
+        self._count: Optional[int] = None
+        self._checkpoints = array('q')
+
+    def _matching_rows(self, start: int) -> Iterator[int]:
+        """Номера подходящих строк начиная со строки start."""
+        rows = iter(range(start, self._size))
+        for check in self._checks:
+            rows = filter(check, rows)
+        return rows
+
+    def count(self) -> int:
+        if self._count is None:
+            count, stride = 0, self.CHECKPOINT_STRIDE
+            rows = self._matching_rows(0)
+            for row in rows:
+                self._checkpoints.append(row)
+                count += 1 + len(list(islice(rows, stride - 1)))
+            self._count = count
+        return self._count
+
+    def get_range(self, offset: int, count: int) -> List[Student]:
+        offset = max(0, offset)
+        if count <= 0 or offset >= self.count():
+            return []
+        checkpoint, skip = divmod(offset, self.CHECKPOINT_STRIDE)
+        rows = self._matching_rows(self._checkpoints[checkpoint])
+        return list(map(self._make_row, islice(rows, skip, skip + count)))
+
+
+class FilterSearchCursor(SearchCursor):
+    """Результаты курсора source, которые проходят проверку check.
+
+    Результаты source читаются частями по CHUNK_SIZE. Как и в ScanSearchCursor,
+    подсчёт проходит их один раз и запоминает позицию в source каждого
+    CHECKPOINT_STRIDE-го результата, а диапазон ищется от ближайшей такой
+    контрольной точки, поэтому отобранные студенты не собираются в список.
+    """
+
+    CHECKPOINT_STRIDE = 256
+    CHUNK_SIZE = 1024
+
+    def __init__(self, source: SearchCursor, check: Callable[[Student], bool]):
+        self._source = source
+        self._check = check
+        self._count: Optional[int] = None
+        self._checkpoints = array('q')
+
+    def _matching(self, start: int) -> Iterator[Tuple[int, Student]]:
+        """Пары (позиция в source, студент) подходящих результатов source начиная с позиции start."""
+        for offset in range(start, self._source.count(), self.CHUNK_SIZE):
+            for position, student in enumerate(self._source.get_range(offset, self.CHUNK_SIZE), offset):
+                if self._check(student):
+                    yield position, student
+
+    def count(self) -> int:
+        if self._count is None:
+            count, stride = 0, self.CHECKPOINT_STRIDE
+            for position, _ in self._matching(0):
+                if count % stride == 0:
+                    self._checkpoints.append(position)
+                count += 1
+            self._count = count
+        return self._count
+
+    def get_range(self, offset: int, count: int) -> List[Student]:
+        offset = max(0, offset)
+        if count <= 0 or offset >= self.count():
+            return []
+        checkpoint, skip = divmod(offset, self.CHECKPOINT_STRIDE)
+        matches = self._matching(self._checkpoints[checkpoint])
+        return [student for _, student in islice(matches, skip, skip + count)]
 
 
 class StudentRepository(ABC):
+    """Хранилище студентов.
+
+    Методы поиска и удаления принимают критерии — словарь «поле: значение»
+    (все условия должны выполняться; числа сравниваются на равенство,
+    строки ищутся по подстроке) или составной запрос из model.query.
+    """
+
+    def __init__(self):
+        self._listeners: List[Callable[[StudentChange], None]] = []
+
+    def subscribe(self, listener: Callable[[StudentChange], None]) -> None:
+        """Подписывает listener на изменения хранилища.
+
+        Слушатели вызываются в потоке, изменившем хранилище.
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[StudentChange], None]) -> None:
+        self._listeners.remove(listener)
+
+    def _notify(self, kind: str, positions: Tuple[int, ...] = ()) -> None:
+        change = StudentChange(kind, tuple(positions))
+        for listener in list(self._listeners):
+            listener(change)
+
     @abstractmethod
     def add_student(self, student: Student) -> None:
         pass
     
     @abstractmethod
-    def search_students(self, criteria: Dict[str, str]) -> List[Student]:
+    def search_students(self, criteria: Criteria) -> List[Student]:
         pass
     
+    def search_cursor(self, criteria: Criteria) -> SearchCursor:
+        """Возвращает результаты поиска по критериям, которые читаются по частям.
+
+        Реализация по умолчанию оборачивает список search_students.
+        """
+        return ListSearchCursor(self.search_students(criteria))
+    
+    def prepare_search(self) -> None:
+        """Готовит хранилище к поиску из рабочего потока.
+
+        Вызывается в потоке, который изменяет хранилище, перед запуском
+        поиска, чтобы поиск только читал хранилище. По умолчанию ничего не делает.
+        """
+    
     @abstractmethod
-    def delete_students(self, criteria: Dict[str, str]) -> int:
+    def delete_students(self, criteria: Criteria) -> int:
         pass
     
     @abstractmethod
@@ -28,6 +216,19 @@ class StudentRepository(ABC):
     def get_paginated_students(self, page: int, page_size: int) -> List[Student]:
         pass
     
+    def get_students_range(self, offset: int, count: int) -> List[Student]:
+        """Возвращает не более count студентов, начиная с позиции offset.
+
+        Реализация по умолчанию собирает диапазон из двух страниц размера count.
+        """
+        if count <= 0:
+            return []
+        page, start = divmod(offset, count)
+        students = self.get_paginated_students(page + 1, count)
+        if start:
+            students = students[start:] + self.get_paginated_students(page + 2, count)[:start]
+        return students
+    
     @abstractmethod
     def get_total_students(self) -> int:
         pass
@@ -36,61 +237,864 @@ class StudentRepository(ABC):
     def get_unique_values(self, field: str) -> List[str]:
         pass
 
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    def iter_students(self) -> Iterator[Student]:
+        """Поочерёдно возвращает всех студентов, не собирая их в список.
+
+        Реализация по умолчанию перебирает get_all_students().
+        """
+        return iter(self.get_all_students())
+
+    def replace_all(self, students: List[Student]) -> None:
+        """Заменяет всех студентов хранилища списком students.
+
+        Реализации заменяют содержимое целиком: при ошибке хранилище остаётся
+        прежним. Реализация по умолчанию очищает хранилище и добавляет
+        студентов по одному.
+        """
+        self.clear()
+        for student in students:
+            self.add_student(student)
+
 class InMemoryStudentRepository(StudentRepository):
+    """Хранилище студентов в памяти с индексами для поиска.
+
+    Для полей с поиском по точному значению (курс, число работ) поддерживаются
+    хеш-индексы значение -> студенты. Для полей с поиском по подстроке (ФИО,
+    группа, язык программирования) индекс строится по значению в нижнем
+    регистре, а подстрока ищется среди различных значений поля: для ФИО и
+    группы — через индекс триграмм, для языка (значений мало) — перебором.
+    Индексы обновляются в add_student и delete_students; списки студентов
+    в индексах идут в порядке добавления.
+
+    Каждый студент получает постоянный номер (в порядке добавления) и место
+    в списке _slots. При удалении место помечается пустым (None), поэтому
+    удаление k студентов занимает O(k). Страницы отсчитываются по живым
+    студентам с помощью отсортированного списка пустых мест, а когда пустых
+    мест становится больше COMPACTION_RATIO от всех, список уплотняется.
+    Порядок студентов всегда совпадает с порядком добавления.
+
+    replace_all (и конструктор) только запоминают студентов, а индексы
+    строятся одним проходом при первом поиске, удалении или запросе
+    уникальных значений — так загрузка большого файла не ждёт построения
+    индексов.
+    """
+
+    # Доля пустых мест, при которой список студентов уплотняется
+    COMPACTION_RATIO = 0.5
+    # Во сколько раз список совпадений условия может быть длиннее кандидатов,
+    # чтобы кандидаты пересекались с ним, а не проверялись по одному
+    INTERSECTION_RATIO = 4
+    # Наибольшая оценка числа совпадений, при которой search_cursor собирает их в список
+    CURSOR_LIST_LIMIT = 4096
+
+    # Критерии с поиском по точному значению
+    _EQUALITY_FIELDS: Dict[str, Callable[[Student], Any]] = {
+        "Course": attrgetter("course"),
+        "TotalWorks": attrgetter("total_works"),
+        "CompletedWorks": attrgetter("completed_works"),
+        "NotCompletedWorks": attrgetter("not_completed_works"),
+    }
+    # Критерии с поиском по подстроке среди различных значений поля
+    _SUBSTRING_FIELDS: Dict[str, Callable[[Student], str]] = {
+        "FullName": lambda s: s.full_name.lower(),
+        "Group": lambda s: s.group.lower(),
+        "ProgrammingLanguage": lambda s: s.programming_language.lower(),
+    }
+    # Поля, различные значения которых ищутся по подстроке через индекс триграмм
+    _NGRAM_FIELDS = ("FullName", "Group")
+    # Поля, для которых get_unique_values возвращает различные значения
+    _UNIQUE_FIELDS: Dict[str, Callable[[Student], Any]] = {
+        "Язык программирования": attrgetter("programming_language"),
+        "Общее число работ": attrgetter("total_works"),
+        "Количество выполненных работ": attrgetter("completed_works"),
+    }
+
     def __init__(self, students: List[Student] = None):
-        self._students = students or []
+        super().__init__()
+        # Номер изменения хранилища: по нему курсоры поиска замечают изменения
+        self._version = 0
+        self.clear()
+        if students:
+            self.replace_all(students)
+
+    def clear(self) -> None:
+        self.replace_all([])
+
+    def replace_all(self, students: List[Student]) -> None:
+        slots = list(students)
+        ids = dict(zip(slots, range(len(slots))))
+        if len(ids) != len(slots):
+            # Один и тот же объект встречается несколько раз: повторы заменяются копиями
+            seen = set()
+            for slot, student in enumerate(slots):
+                if student in seen:
+                    slots[slot] = copy(student)
+                seen.add(student)
+            ids = dict(zip(slots, range(len(slots))))
+        # Места студентов в порядке добавления; None — удалённый студент
+        self._slots: List[Optional[Student]] = slots
+        # Постоянные номера студентов и места по номеру
+        self._ids: Dict[Student, int] = ids
+        self._slot_by_id: Dict[int, int] = dict(zip(range(len(slots)), range(len(slots))))
+        self._next_id = len(slots)
+        # Отсортированные номера пустых мест
+        self._tombstones: List[int] = []
+        self._indexed = False
+        self._version += 1
+        self._notify(StudentChange.RESET)
+
+    def _ensure_indexes(self) -> None:
+        """Строит индексы по всем студентам, если они ещё не построены."""
+        if self._indexed:
+            return
+        # Пока индексов нет, студенты не удаляются, поэтому пустых мест в _slots нет
+        slots = self._slots
+        # Значения полей с поиском по подстроке в нижнем регистре, в том же порядке, что и _slots
+        self._columns: Dict[str, List[str]] = {
+            field: list(map(getter, slots)) for field, getter in self._SUBSTRING_FIELDS.items()
+        }
+        # Списки студентов в индексах хранятся как словари с порядком добавления (удаление за O(1))
+        self._indexes: Dict[str, Dict[Any, Dict[Student, None]]] = {}
+        for field in (*self._EQUALITY_FIELDS, *self._SUBSTRING_FIELDS):
+            values = self._columns[field] if field in self._columns else map(self._EQUALITY_FIELDS[field], slots)
+            index = self._indexes[field] = {}
+            for student, value in zip(slots, values):
+                students = index.get(value)
+                if students is None:
+                    students = index[value] = {}
+                students[student] = None
+        self._ngrams: Dict[str, NGramIndex] = {field: NGramIndex() for field in self._NGRAM_FIELDS}
+        for field, ngrams in self._ngrams.items():
+            for value in self._indexes[field]:
+                ngrams.add(value)
+        # Мультимножества значение -> число студентов и кэш отсортированных значений
+        self._value_counts: Dict[str, Dict[Any, int]] = {
+            field: dict(Counter(map(getter, slots))) for field, getter in self._UNIQUE_FIELDS.items()
+        }
+        self._unique_values: Dict[str, List[Any]] = {}
+        self._indexed = True
     
     def add_student(self, student: Student) -> None:
-        self._students.append(student)
+        if student in self._ids:
+            # Студенты различаются по объекту, поэтому повторно добавленный объект
+            # хранится копией (студенты неизменяемы, копия неотличима от оригинала)
+            student = copy(student)
+        student_id = self._next_id
+        self._next_id += 1
+        self._ids[student] = student_id
+        self._slot_by_id[student_id] = len(self._slots)
+        self._slots.append(student)
+        self._version += 1
+        self._notify(StudentChange.INSERTED, (self.get_total_students() - 1,))
+        if not self._indexed:
+            # Студент попадёт в индексы при их построении
+            return
+        for field, column in self._columns.items():
+            column.append(self._SUBSTRING_FIELDS[field](student))
+        for field, index in self._indexes.items():
+            value = self._field_value(field, student)
+            students = index.get(value)
+            if students is None:
+                students = index[value] = {}
+                if field in self._ngrams:
+                    self._ngrams[field].add(value)
+            students[student] = None
+        for field, counts in self._value_counts.items():
+            value = self._UNIQUE_FIELDS[field](student)
+            if value not in counts:
+                counts[value] = 0
+                self._unique_values.pop(field, None)
+            counts[value] += 1
+
+    def prepare_search(self) -> None:
+        # Индексы строятся при первом поиске; их построение изменяет хранилище
+        self._ensure_indexes()
+
+    def get_student_id(self, student: Student) -> int:
+        """Постоянный номер студента в хранилище (не меняется при удалении других студентов)."""
+        return self._ids[student]
     
-    def search_students(self, criteria: Dict[str, str]) -> List[Student]:
-        result = []
-        for student in self._students:
-            match = True
-            for key, value in criteria.items():
-                if key == "FullName" and value.lower() not in student.full_name.lower():
-                    match = False
-                elif key == "Course" and int(value) != student.course:
-                    match = False
-                elif key == "Group" and value.lower() not in student.group.lower():
-                    match = False
-                elif key == "ProgrammingLanguage" and value.lower() not in student.programming_language.lower():
-                    match = False
-                elif key == "CompletedWorks" and int(value) != student.completed_works:
-                    match = False
-                elif key == "TotalWorks" and int(value) != student.total_works:
-                    match = False
-                elif key == "NotCompletedWorks" and int(value) != student.not_completed_works:
-                    match = False
-            if match:
-                result.append(student)
+    def search_students(self, criteria: Criteria) -> List[Student]:
+        self._ensure_indexes()
+        query = as_query(criteria)
+        if isinstance(query, And) and not query.operands:
+            return self.get_all_students()
+        return list(self._plan(query)[1]())
+
+    def search_cursor(self, criteria: Criteria) -> SearchCursor:
+        self._ensure_indexes()
+        query = as_query(criteria)
+        estimate, fetch, _ = self._plan(query)
+        if estimate <= self.CURSOR_LIST_LIMIT:
+            # Совпадений немного: ссылки на них берутся из индексов сразу
+            return ListSearchCursor(list(fetch()))
+        return InMemorySearchCursor(self, query)
+
+    def _slot_checks(self, query: Query) -> List[Callable[[int], bool]]:
+        """Проверки номера места для ScanSearchCursor по текущим спискам мест и столбцов.
+
+        Условия на поля с поиском по подстроке проверяются по столбцам значений
+        в нижнем регистре, чтобы не приводить значение к нижнему регистру
+        у каждого студента.
+        """
+        slots = self._slots
+        checks = [lambda slot: slots[slot] is not None]
+        for operand in (query.operands if isinstance(query, And) else (query,)):
+            if isinstance(operand, Condition) and operand.key in self._columns:
+                column, value = self._columns[operand.key], operand.value
+                if operand.op == CONTAINS:
+                    checks.append(lambda slot, column=column, value=value: value in column[slot])
+                else:
+                    checks.append(lambda slot, column=column, compare=COMPARISONS[operand.op], value=value:
+                                  compare(column[slot], value))
+            else:
+                checks.append(lambda slot, matches=operand.matches: matches(slots[slot]))
+        return checks
+
+    def _plan(self, query: Query) -> Tuple[int, Callable[[], Iterable[Student]], Callable[[Student], bool]]:
+        """План выполнения запроса: (оценка числа совпадений, получение совпадений в порядке добавления,
+        проверка студента)."""
+        if isinstance(query, Condition):
+            return self._plan_condition(query)
+
+        plans = [self._plan(operand) for operand in query.operands]
+        checks = [check for _, _, check in plans]
+        if isinstance(query, And):
+            if not plans:
+                return self.get_total_students(), self.get_all_students, lambda student: True
+            # Первым выполняется самое избирательное условие
+            plans.sort(key=lambda plan: plan[0])
+            return plans[0][0], lambda: self._intersect(plans), lambda student: all(check(student) for check in checks)
+
+        any_check = lambda student: any(check(student) for check in checks)
+        estimate = min(self.get_total_students(), sum(plan[0] for plan in plans))
+        if estimate * 4 < self.get_total_students():
+            # Or: объединение совпадений условий, упорядоченное по номерам студентов
+            return estimate, lambda: sorted(set(chain.from_iterable(fetch() for _, fetch, _ in plans)),
+                                            key=self._ids.__getitem__), any_check
+        return estimate, lambda: self._scan(any_check), any_check
+
+    def _plan_condition(self, condition: Condition) -> Tuple[int, Callable[[], Iterable[Student]],
+                                                             Callable[[Student], bool]]:
+        key, op, value = condition
+        getter = self._SUBSTRING_FIELDS.get(key) or self._EQUALITY_FIELDS[key]
+        if op == CONTAINS:
+            return (self._estimate(key, value), lambda: self._substring_matches(key, value),
+                    lambda student: value in getter(student))
+
+        compare = COMPARISONS[op]
+        check = lambda student: compare(getter(student), value)
+        index = self._indexes[key]
+        if op == "=":
+            matched = index.get(value, {})
+            return len(matched), lambda: matched, check
+        # Диапазон или неравенство: объединение списков студентов подходящих значений индекса
+        postings = [students for indexed_value, students in index.items() if compare(indexed_value, value)]
+        estimate = sum(map(len, postings))
+        if len(postings) == 1:
+            return estimate, lambda: postings[0], check
+        if estimate * 4 < self.get_total_students():
+            return estimate, lambda: sorted(chain.from_iterable(postings), key=self._ids.__getitem__), check
+        return estimate, lambda: self._scan(check), check
+
+    def _intersect(self, plans: List[Tuple[int, Callable[[], Iterable[Student]], Callable[[Student], bool]]]
+                   ) -> List[Student]:
+        """Пересечение совпадений условий And; plans отсортированы по оценке числа совпадений."""
+        result = list(plans[0][1]())
+        for estimate, fetch, check in plans[1:]:
+            if not result:
+                break
+            if estimate <= len(result) * self.INTERSECTION_RATIO:
+                # Список совпадений условия не намного длиннее кандидатов: пересечение
+                # по членству дешевле, чем проверка каждого кандидата
+                matched = fetch()
+                if not isinstance(matched, (dict, set)):
+                    matched = set(matched)
+                result = [student for student in result if student in matched]
+            else:
+                result = list(filter(check, result))
         return result
+
+    def _scan(self, check: Callable[[Student], bool]) -> List[Student]:
+        return [student for student in self._slots if student is not None and check(student)]
     
-    def delete_students(self, criteria: Dict[str, str]) -> int:
+    def delete_students(self, criteria: Criteria) -> int:
         students_to_delete = self.search_students(criteria)
+        if not students_to_delete:
+            return 0
+
+        freed = []
         for student in students_to_delete:
-            self._students.remove(student)
+            slot = self._slot_by_id.pop(self._ids.pop(student))
+            self._slots[slot] = None
+            freed.append(slot)
+        self._version += 1
+
+        for field, index in self._indexes.items():
+            getter = self._EQUALITY_FIELDS.get(field) or self._SUBSTRING_FIELDS[field]
+            for student in students_to_delete:
+                value = getter(student)
+                students = index[value]
+                del students[student]
+                if not students:
+                    del index[value]
+                    if field in self._ngrams:
+                        self._ngrams[field].discard(value)
+
+        for field, counts in self._value_counts.items():
+            getter = self._UNIQUE_FIELDS[field]
+            for student in students_to_delete:
+                value = getter(student)
+                counts[value] -= 1
+                if not counts[value]:
+                    del counts[value]
+                    self._unique_values.pop(field, None)
+
+        # Результаты поиска идут в порядке добавления, поэтому freed уже отсортирован
+        tombstones = self._tombstones
+        self._tombstones = list(heapq.merge(tombstones, freed))
+        if len(self._tombstones) > len(self._slots) * self.COMPACTION_RATIO:
+            self._compact()
+        if self._listeners:
+            # Позиция до удаления: место минус число пустых мест перед ним
+            self._notify(StudentChange.REMOVED, [slot - bisect_left(tombstones, slot) for slot in freed])
         return len(students_to_delete)
-    
+
+    def _compact(self) -> None:
+        """Уплотнение: удаление пустых мест. Номера студентов и их порядок не меняются."""
+        kept = [slot for slot, student in enumerate(self._slots) if student is not None]
+        self._slots = [self._slots[slot] for slot in kept]
+        for field, column in self._columns.items():
+            self._columns[field] = [column[slot] for slot in kept]
+        self._slot_by_id = {self._ids[student]: slot for slot, student in enumerate(self._slots)}
+        self._tombstones = []
+
+    def _slot_of_position(self, position: int) -> int:
+        """Место студента с порядковым номером position среди живых студентов."""
+        tombstones = self._tombstones
+        # Ищем наименьшее место slot, перед которым ровно position живых студентов
+        low, high = position, position + len(tombstones)
+        while low < high:
+            middle = (low + high) // 2
+            if middle - bisect_right(tombstones, middle) < position:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _field_value(self, field: str, student: Student) -> Any:
+        if field in self._EQUALITY_FIELDS:
+            return self._EQUALITY_FIELDS[field](student)
+        return self._SUBSTRING_FIELDS[field](student)
+
+    def _estimate(self, field: str, needle: str) -> int:
+        """Оценка числа студентов, у которых значение поля содержит подстроку."""
+        index = self._indexes[field]
+        if field in self._ngrams:
+            # Для индекса триграмм известно число строк-кандидатов, а не студентов
+            return self._ngrams[field].estimate(needle) * self.get_total_students() // max(1, len(index))
+        return sum(len(students) for value, students in index.items() if needle in value)
+
+    def _substring_matches(self, field: str, needle: str) -> List[Student]:
+        """Студенты, у которых значение поля содержит подстроку, в порядке добавления."""
+        index = self._indexes[field]
+        if field not in self._ngrams:
+            values = [value for value in index if needle in value]
+        elif self._ngrams[field].estimate(needle) * 4 < len(index):
+            values = self._ngrams[field].search(needle)
+        else:
+            values = None
+
+        if values is not None:
+            if len(values) == 1:
+                return index[values[0]]
+            postings = [index[value] for value in values]
+            if sum(map(len, postings)) * 4 < self.get_total_students():
+                return sorted(chain.from_iterable(postings), key=self._ids.__getitem__)
+        # Совпадает большая часть студентов: быстрее пройти по столбцу значений в нижнем регистре
+        return [student for student, value in zip(self._slots, self._columns[field])
+                if needle in value and student is not None]
+
     def get_all_students(self) -> List[Student]:
-        return self._students
+        if not self._tombstones:
+            return list(self._slots)
+        return [student for student in self._slots if student is not None]
+
+    def iter_students(self) -> Iterator[Student]:
+        return (student for student in self._slots if student is not None)
     
     def get_paginated_students(self, page: int, page_size: int) -> List[Student]:
-        start = (page - 1) * page_size
-        end = start + page_size
-        return self._students[start:end]
+        return self.get_students_range((page - 1) * page_size, page_size)
+    
+    def get_students_range(self, offset: int, count: int) -> List[Student]:
+        if count <= 0:
+            return []
+        offset = max(0, offset)
+        if not self._tombstones:
+            return self._slots[offset:offset + count]
+
+        result = []
+        slot = self._slot_of_position(offset)
+        while len(result) < count and slot < len(self._slots):
+            if self._slots[slot] is not None:
+                result.append(self._slots[slot])
+            slot += 1
+        return result
     
     def get_total_students(self) -> int:
-        return len(self._students)
+        return len(self._ids)
     
     def get_unique_values(self, field: str) -> List[None]:
-        field_mapping = {
-            "Язык программирования": lambda s: s.programming_language,
-            "Общее число работ": lambda s: int(s.total_works),
-            "Количество выполненных работ": lambda s: int(s.completed_works)
-        }
-        
-        if field not in field_mapping:
+        if field not in self._UNIQUE_FIELDS:
+            return []
+        self._ensure_indexes()
+
+        # Список пересчитывается, только если значение появилось или исчезло
+        if field not in self._unique_values:
+            self._unique_values[field] = sorted(self._value_counts[field])
+        return list(self._unique_values[field])
+
+
+
+class InMemorySearchCursor(SearchCursor):
+    """Результаты поиска в InMemoryStudentRepository, которые находятся проверкой мест по порядку.
+
+    Места проверяет ScanSearchCursor, поэтому найденные студенты не собираются
+    в список. Курсор видит текущее содержимое хранилища: после изменения
+    хранилища результаты ищутся заново.
+    """
+
+    def __init__(self, repository: InMemoryStudentRepository, query: Query):
+        self._repository = repository
+        self._query = query
+        # (номер изменения хранилища, курсор по его местам)
+        self._scan: Optional[Tuple[int, ScanSearchCursor]] = None
+
+    def _current(self) -> ScanSearchCursor:
+        version = self._repository._version
+        if self._scan is None or self._scan[0] != version:
+            # Уплотнение заменяет списки мест и столбцов, поэтому проверки запоминают текущие списки
+            slots = self._repository._slots
+            self._scan = (version, ScanSearchCursor(len(slots), self._repository._slot_checks(self._query),
+                                                    slots.__getitem__))
+        return self._scan[1]
+
+    def count(self) -> int:
+        return self._current().count()
+
+    def get_range(self, offset: int, count: int) -> List[Student]:
+        return self._current().get_range(offset, count)
+
+
+class SqliteStudentRepository(StudentRepository):
+    """Хранилище студентов в базе данных SQLite.
+
+    Студенты хранятся в таблице students, порядок задаётся первичным ключом
+    id (порядок добавления). Для поиска по точному значению построены
+    B-tree индексы по курсу, числу работ и числу не выполненных работ, для
+    списков уникальных значений — индексы по языку программирования и числу
+    работ. ФИО, группа и язык дополнительно хранятся в нижнем регистре
+    (приводятся в Python, чтобы совпадать с InMemoryStudentRepository и для
+    кириллицы); ФИО и группа индексируются таблицей FTS5 с токенизатором
+    trigram, запросы короче трёх символов проверяются функцией instr.
+
+    Страницы и результаты поиска читаются курсором SqliteSearchCursor:
+    через LIMIT/OFFSET, а при последовательном листании — поиском по ключу
+    (id > последнего id предыдущей страницы).
+    """
+
+    # Критерии с поиском по точному значению -> выражение SQL
+    _EQUALITY_COLUMNS: Dict[str, str] = {
+        "Course": "course",
+        "TotalWorks": "total_works",
+        "CompletedWorks": "completed_works",
+        "NotCompletedWorks": "total_works - completed_works",
+    }
+    # Критерии с поиском по подстроке -> столбец со значением в нижнем регистре
+    _SUBSTRING_COLUMNS: Dict[str, str] = {
+        "FullName": "full_name_lower",
+        "Group": "group_lower",
+        "ProgrammingLanguage": "language_lower",
+    }
+    # Столбцы, проиндексированные триграммами в таблице students_fts
+    _FTS_COLUMNS = ("full_name_lower", "group_lower")
+    # Поля, для которых get_unique_values возвращает различные значения
+    _UNIQUE_COLUMNS: Dict[str, str] = {
+        "Язык программирования": "programming_language",
+        "Общее число работ": "total_works",
+        "Количество выполненных работ": "completed_works",
+    }
+    _STUDENT_COLUMNS = "full_name, course, group_name, total_works, completed_works, programming_language"
+
+    def __init__(self, path: str = ":memory:", students: List[Student] = None):
+        super().__init__()
+        # Операции с файлами выполняются в рабочем потоке, а не в потоке Tk
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._create_schema()
+        # Номер изменения содержимого: по нему курсоры узнают, что прочитанное ими устарело
+        self._version = 0
+        self._all_students = SqliteSearchCursor(self, "", [])
+        if students:
+            self.replace_all(students)
+
+    def _schema(self) -> List[str]:
+        """Команды создания таблицы students; индексы и таблица FTS5 идут после таблицы."""
+        fts_columns = ", ".join(self._FTS_COLUMNS)
+        return [
+            """CREATE TABLE IF NOT EXISTS students (
+                id INTEGER PRIMARY KEY,
+                full_name TEXT NOT NULL,
+                course INTEGER NOT NULL,
+                group_name TEXT NOT NULL,
+                total_works INTEGER NOT NULL,
+                completed_works INTEGER NOT NULL,
+                programming_language TEXT NOT NULL,
+                full_name_lower TEXT NOT NULL,
+                group_lower TEXT NOT NULL,
+                language_lower TEXT NOT NULL
+            )""",
+            "CREATE INDEX IF NOT EXISTS students_course ON students (course)",
+            "CREATE INDEX IF NOT EXISTS students_total_works ON students (total_works)",
+            "CREATE INDEX IF NOT EXISTS students_completed_works ON students (completed_works)",
+            "CREATE INDEX IF NOT EXISTS students_not_completed_works ON students (total_works - completed_works)",
+            "CREATE INDEX IF NOT EXISTS students_language ON students (programming_language)",
+            f"""CREATE VIRTUAL TABLE IF NOT EXISTS students_fts USING fts5 (
+                {fts_columns}, content='students', content_rowid='id', tokenize='trigram case_sensitive 1'
+            )""",
+            f"""CREATE TRIGGER IF NOT EXISTS students_fts_insert AFTER INSERT ON students BEGIN
+                INSERT INTO students_fts (rowid, {fts_columns})
+                VALUES (new.id, {", ".join("new." + column for column in self._FTS_COLUMNS)});
+            END""",
+            f"""CREATE TRIGGER IF NOT EXISTS students_fts_delete AFTER DELETE ON students BEGIN
+                INSERT INTO students_fts (students_fts, rowid, {fts_columns})
+                VALUES ('delete', old.id, {", ".join("old." + column for column in self._FTS_COLUMNS)});
+            END""",
+        ]
+
+    def _create_schema(self) -> None:
+        with self._connection:
+            for statement in self._schema():
+                self._connection.execute(statement)
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def _insert(self, students: List[Student]) -> None:
+        rows = ((s.full_name, s.course, s.group, s.total_works, s.completed_works, s.programming_language,
+                 s.full_name.lower(), s.group.lower(), s.programming_language.lower()) for s in students)
+        self._connection.executemany(
+            f"INSERT INTO students ({self._STUDENT_COLUMNS}, full_name_lower, group_lower, language_lower) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        self._version += 1
+
+    def add_student(self, student: Student) -> None:
+        with self._connection:
+            self._insert([student])
+        if self._listeners:
+            self._notify(StudentChange.INSERTED, (self.get_total_students() - 1,))
+
+    def _where(self, criteria: Criteria) -> Tuple[str, List[Any]]:
+        """Условие WHERE и его параметры для критериев поиска."""
+        query = as_query(criteria)
+        if isinstance(query, And) and not query.operands:
+            return "", []
+        parameters = []
+        return " WHERE " + self._condition_sql(query, parameters), parameters
+
+    def _condition_sql(self, query: Query, parameters: List[Any]) -> str:
+        """Выражение SQL для запроса; параметры добавляются в parameters.
+
+        Порядок проверки условий и выбор индексов (B-tree для чисел и
+        диапазонов, FTS5 для подстрок) выполняет планировщик SQLite по
+        статистике ANALYZE.
+        """
+        if isinstance(query, (And, Or)):
+            if not query.operands:
+                # Пустой And выполняется всегда, пустой Or — никогда
+                return "1" if isinstance(query, And) else "0"
+            operator = " AND " if isinstance(query, And) else " OR "
+            return "(" + operator.join(self._condition_sql(operand, parameters) for operand in query.operands) + ")"
+
+        key, op, value = query
+        if key in self._EQUALITY_COLUMNS:
+            parameters.append(value)
+            return f"{self._EQUALITY_COLUMNS[key]} {op} ?"
+        column = self._SUBSTRING_COLUMNS[key]
+        parameters.append(value)
+        if op != CONTAINS:
+            return f"{column} {op} ?"
+        if column in self._FTS_COLUMNS and len(value) >= 3:
+            # Запрос — фраза FTS5 по одному столбцу; кавычки внутри удваиваются
+            parameters[-1] = f'{column} : "{value.replace(chr(34), chr(34) * 2)}"'
+            return "id IN (SELECT rowid FROM students_fts WHERE students_fts MATCH ?)"
+        return f"instr({column}, ?) > 0"
+
+    def _select(self, sql: str, parameters: List[Any] = ()) -> List[Student]:
+        cursor = self._connection.execute(f"SELECT {self._STUDENT_COLUMNS} FROM students{sql}", parameters)
+        return [Student(*row) for row in cursor]
+
+    def search_students(self, criteria: Criteria) -> List[Student]:
+        where, parameters = self._where(criteria)
+        return self._select(where + " ORDER BY id", parameters)
+
+    def search_cursor(self, criteria: Criteria) -> SearchCursor:
+        return SqliteSearchCursor(self, *self._where(criteria))
+
+    def delete_students(self, criteria: Criteria) -> int:
+        where, parameters = self._where(criteria)
+        positions = []
+        with self._connection:
+            if self._listeners:
+                # Позиции удаляемых студентов считаются в той же транзакции до удаления
+                positions = [position for position, in self._connection.execute(
+                    "SELECT position FROM (SELECT id, ROW_NUMBER() OVER (ORDER BY id) - 1 AS position FROM students) "
+                    f"WHERE id IN (SELECT id FROM students{where}) ORDER BY position", parameters)]
+            deleted = self._connection.execute("DELETE FROM students" + where, parameters).rowcount
+        if deleted:
+            self._version += 1
+            self._notify(StudentChange.REMOVED, positions)
+        return deleted
+
+    def get_all_students(self) -> List[Student]:
+        return self._select(" ORDER BY id")
+
+    def iter_students(self) -> Iterator[Student]:
+        cursor = self._connection.execute(f"SELECT {self._STUDENT_COLUMNS} FROM students ORDER BY id")
+        return (Student(*row) for row in cursor)
+
+    def get_paginated_students(self, page: int, page_size: int) -> List[Student]:
+        return self.get_students_range((page - 1) * page_size, page_size)
+
+    def get_students_range(self, offset: int, count: int) -> List[Student]:
+        return self._all_students.get_range(offset, count)
+
+    def get_total_students(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM students").fetchone()[0]
+
+    def get_unique_values(self, field: str) -> List[Any]:
+        column = self._UNIQUE_COLUMNS.get(field)
+        if column is None:
+            return []
+        cursor = self._connection.execute(f"SELECT DISTINCT {column} FROM students ORDER BY {column}")
+        return [value for value, in cursor]
+
+    def clear(self) -> None:
+        self.replace_all([])
+
+    def replace_all(self, students: List[Student]) -> None:
+        # Всё выполняется в одной транзакции: при ошибке остаются прежние студенты.
+        # Таблица пересоздаётся, студенты вставляются до создания индексов,
+        # а таблица FTS5 заполняется одной командой rebuild.
+        schema = self._schema()
+        with self._connection:
+            self._connection.execute("BEGIN")
+            for table in ("students_fts", "students"):
+                self._connection.execute(f"DROP TABLE IF EXISTS {table}")
+            self._connection.execute(schema[0])
+            self._insert(students)
+            for statement in schema[1:]:
+                self._connection.execute(statement)
+            self._connection.execute("INSERT INTO students_fts (students_fts) VALUES ('rebuild')")
+            # Статистика для выбора индексов планировщиком; по выборке строк, чтобы не читать всю таблицу
+            self._connection.execute("PRAGMA analysis_limit = 1000")
+            self._connection.execute("ANALYZE")
+        self._version += 1
+        self._notify(StudentChange.RESET)
+
+
+class SqliteSearchCursor(SearchCursor):
+    """Результаты поиска в SqliteStudentRepository, читаемые запросами по мере надобности.
+
+    Число результатов считается COUNT(*), диапазон — LIMIT/OFFSET, а диапазон,
+    продолжающий прочитанный, — поиском по ключу. Курсор видит текущее
+    содержимое базы: после изменения хранилища число результатов
+    пересчитывается.
+    """
+
+    def __init__(self, repository: SqliteStudentRepository, where: str, parameters: List[Any]):
+        self._repository = repository
+        self._where = where
+        self._parameters = list(parameters)
+        # (номер изменения хранилища, число результатов)
+        self._count: Optional[Tuple[int, int]] = None
+        # Последний прочитанный диапазон: (номер изменения хранилища, позиция за его концом, id последнего студента)
+        self._last_range: Optional[Tuple[int, int, int]] = None
+
+    def count(self) -> int:
+        version = self._repository._version
+        if self._count is None or self._count[0] != version:
+            cursor = self._repository._connection.execute("SELECT COUNT(*) FROM students" + self._where,
+                                                          self._parameters)
+            self._count = (version, cursor.fetchone()[0])
+        return self._count[1]
+
+    def get_range(self, offset: int, count: int) -> List[Student]:
+        if count <= 0:
+            return []
+        offset = max(0, offset)
+        version = self._repository._version
+        select = f"SELECT id, {SqliteStudentRepository._STUDENT_COLUMNS} FROM students{self._where}"
+        if self._last_range is not None and self._last_range[:2] == (version, offset):
+            # Продолжение прошлого диапазона: поиск по ключу вместо пропуска OFFSET строк
+            condition = " AND id > ?" if self._where else " WHERE id > ?"
+            rows = self._repository._connection.execute(
+                f"{select}{condition} ORDER BY id LIMIT ?",
+                self._parameters + [self._last_range[2], count]).fetchall()
+        else:
+            rows = self._repository._connection.execute(
+                f"{select} ORDER BY id LIMIT ? OFFSET ?", self._parameters + [count, offset]).fetchall()
+        self._last_range = (version, offset + len(rows), rows[-1][0]) if rows else None
+        return [Student(*row[1:]) for row in rows]
+
+
+class ColumnarStudentRepository(StudentRepository):
+    """Компактное хранилище студентов в памяти: каждое поле — отдельный столбец.
+
+    ФИО и группы хранятся в StringColumn (строки UTF-8 подряд в одном
+    буфере), языки программирования — в InternedColumn (номера
+    интернированных значений), числа — в IntColumn (массивы array). Объекты Student
+    не хранятся: методы чтения возвращают StudentRow — представления строк
+    с тем же набором свойств. Индексов нет, поиск проверяет строки
+    столбцов, поэтому хранилище подходит для больших наборов данных, когда
+    важнее память, а не скорость поиска.
+    """
+
+    # Критерии с поиском по точному значению -> номер столбца
+    _EQUALITY_FIELDS = {"Course": 1, "TotalWorks": 3, "CompletedWorks": 4}
+    # Критерии с поиском по подстроке -> номер столбца
+    _SUBSTRING_FIELDS = {"FullName": 0, "Group": 2, "ProgrammingLanguage": 5}
+    # Поля, для которых get_unique_values возвращает различные значения -> номер столбца
+    _UNIQUE_FIELDS = {"Язык программирования": 5, "Общее число работ": 3, "Количество выполненных работ": 4}
+
+    def __init__(self, students: List[Student] = None):
+        super().__init__()
+        self.replace_all(students or [])
+
+    def clear(self) -> None:
+        self.replace_all([])
+
+    def replace_all(self, students: List[Student]) -> None:
+        # Столбцы в порядке свойств StudentRow: ФИО, курс, группа, всего работ, выполнено, язык
+        table = (StringColumn(), IntColumn(), StringColumn(), IntColumn(), IntColumn(), InternedColumn())
+        for student in students:
+            self._append(table, student)
+        # Новые столбцы подменяют прежние одним присваиванием
+        self._table = table
+        self._notify(StudentChange.RESET)
+
+    def add_student(self, student: Student) -> None:
+        self._append(self._table, student)
+        self._notify(StudentChange.INSERTED, (len(self._table[1]) - 1,))
+
+    @staticmethod
+    def _append(table: tuple, student: Student) -> None:
+        full_names, courses, groups, total_works, completed_works, languages = table
+        full_names.append(student.full_name)
+        courses.append(student.course)
+        groups.append(student.group)
+        total_works.append(student.total_works)
+        completed_works.append(student.completed_works)
+        languages.append(student.programming_language)
+
+    def _checks(self, table: tuple, criteria: Criteria) -> List[Callable[[int], bool]]:
+        """Проверки номера строки table по критериям, от самых дешёвых к самым дорогим."""
+        query = as_query(criteria)
+        operands = query.operands if isinstance(query, And) else (query,)
+        return [check for _, check in sorted((self._check(table, operand) for operand in operands),
+                                             key=lambda plan: plan[0])]
+
+    def _check(self, table: tuple, query: Query) -> Tuple[int, Callable[[int], bool]]:
+        """Проверка номера строки по запросу и её относительная стоимость.
+
+        Индексов нет, поэтому условия упорядочиваются по стоимости проверки:
+        числа и номера языков сравниваются сразу, а строки ФИО и групп
+        приходится декодировать.
+        """
+        if isinstance(query, (And, Or)):
+            plans = sorted((self._check(table, operand) for operand in query.operands), key=lambda plan: plan[0])
+            checks = [check for _, check in plans]
+            cost = sum(cost for cost, _ in plans)
+            if isinstance(query, And):
+                return cost, lambda row: all(check(row) for check in checks)
+            return cost, lambda row: any(check(row) for check in checks)
+
+        key, op, value = query
+        compare = COMPARISONS.get(op)
+        if key in self._EQUALITY_FIELDS:
+            column = table[self._EQUALITY_FIELDS[key]]
+            return 1, lambda row: compare(column[row], value)
+        if key == "NotCompletedWorks":
+            total_works, completed_works = table[3], table[4]
+            return 2, lambda row: compare(total_works[row] - completed_works[row], value)
+
+        def matches(text: str) -> bool:
+            return value in text.lower() if op == CONTAINS else compare(text.lower(), value)
+
+        if key == "ProgrammingLanguage":
+            languages = table[5]
+            # Условие проверяется у различных значений, а строки сравниваются по номеру значения
+            codes = {code for code, language in enumerate(languages.values) if matches(language)}
+            return 1, lambda row: languages.codes[row] in codes
+        column = table[self._SUBSTRING_FIELDS[key]]
+        if op == CONTAINS:
+            return 10, lambda row: value in column[row].lower()
+        return 10, lambda row: compare(column[row].lower(), value)
+
+    def _matching_rows(self, criteria: Criteria) -> List[int]:
+        """Номера строк, подходящих под критерии, по возрастанию."""
+        rows = range(len(self._table[1]))
+        for check in self._checks(self._table, criteria):
+            rows = list(filter(check, rows))
+        return list(rows)
+
+    def search_students(self, criteria: Criteria) -> List[StudentRow]:
+        return [StudentRow(self._table, row) for row in self._matching_rows(criteria)]
+
+    def search_cursor(self, criteria: Criteria) -> SearchCursor:
+        # Курсор запоминает текущие столбцы: удаление создаёт новые, а добавление
+        # дописывает строки после size, поэтому результаты курсора не меняются
+        table = self._table
+        return ScanSearchCursor(len(table[1]), self._checks(table, criteria), lambda row: StudentRow(table, row))
+
+    def delete_students(self, criteria: Criteria) -> int:
+        rows = self._matching_rows(criteria)
+        if not rows:
+            return 0
+
+        deleted = set(rows)
+        kept = [row for row in range(len(self._table[1])) if row not in deleted]
+        # Создаются новые столбцы, чтобы выданные ранее StudentRow не изменились
+        self._table = tuple(column.take(kept) for column in self._table)
+        self._notify(StudentChange.REMOVED, rows)
+        return len(rows)
+
+    def get_all_students(self) -> List[StudentRow]:
+        return list(self.iter_students())
+
+    def iter_students(self) -> Iterator[StudentRow]:
+        table = self._table
+        return (StudentRow(table, row) for row in range(len(table[1])))
+
+    def get_paginated_students(self, page: int, page_size: int) -> List[StudentRow]:
+        return self.get_students_range((page - 1) * page_size, page_size)
+
+    def get_students_range(self, offset: int, count: int) -> List[StudentRow]:
+        if count <= 0:
+            return []
+        rows = range(len(self._table[1]))[max(0, offset):offset + count]
+        return [StudentRow(self._table, row) for row in rows]
+
+    def get_total_students(self) -> int:
+        return len(self._table[1])
+
+    def get_unique_values(self, field: str) -> List[Any]:
+        if field not in self._UNIQUE_FIELDS:
             return []
-            
-        return sorted(list(set(field_mapping[field](student) for student in self._students)))
\ No newline at end of file
+        column = self._table[self._UNIQUE_FIELDS[field]]
+        if isinstance(column, InternedColumn):
+            return sorted(column.values[code] for code in set(column.codes))
+        return sorted(set(column))
@@ -1,18 +1,35 @@
-from typing import List, Dict
+import gc
+import os
+import threading
+from typing import Callable, List, Dict, Optional
 from xml.etree import ElementTree as ET
 from xml.dom import minidom
-import xml.sax
 
-from model.repositories import StudentRepository
+from model.query import Criteria
+from model.repositories import SearchCursor, StudentChange, StudentRepository
 from model.validators import StudentValidator
 from model.student import Student
 from model.student_handler import SaxHandler, DomHandler
+from model.snapshot_handler import SnapshotHandler
 
 
 class StudentModel:
+    """Модель: проверка и форматирование студентов и доступ к хранилищу.
+
+    Хранилища не рассчитаны на работу из нескольких потоков, а поиск по мере
+    ввода выполняется в рабочем потоке, поэтому обращения к хранилищу
+    выполняются под общей блокировкой: изменение ждёт завершения поиска.
+    Запись в файл читает хранилище без блокировки — пока она выполняется,
+    окно хода выполнения не даёт изменять студентов.
+    """
+
     def __init__(self, repository: StudentRepository, validator: StudentValidator):
         self._repository = repository
         self._validator = validator
+        self._lock = threading.RLock()
+        # Номер версии студентов: увеличивается при каждом изменении хранилища
+        self._version = 0
+        repository.subscribe(self._on_students_changed)
     
     def add_student(self, student_data: Dict[str, str]) -> None:
         self._validator.validate(student_data)
@@ -25,40 +42,113 @@ class StudentModel:
             completed_works=int(student_data["CompletedWorks"]),
             programming_language=student_data["ProgrammingLanguage"]
         )
-        self._repository.add_student(student)
+        with self._lock:
+            self._repository.add_student(student)
+    
+    def subscribe(self, listener: Callable[[StudentChange], None]) -> None:
+        self._repository.subscribe(listener)
+    
+    def get_version(self) -> int:
+        """Номер версии студентов: меняется при каждом изменении хранилища."""
+        return self._version
+    
+    def _on_students_changed(self, change: StudentChange) -> None:
+        self._version += 1
+    
+    def search_students(self, criteria: Criteria) -> List[Student]:
+        with self._lock:
+            return self._repository.search_students(criteria)
     
-    def search_students(self, criteria: Dict[str, str]) -> List[Student]:
-        return self._repository.search_students(criteria)
+    def search_cursor(self, criteria: Criteria) -> SearchCursor:
+        with self._lock:
+            cursor = self._repository.search_cursor(criteria)
+            # Курсор может искать лениво: число результатов считается, пока хранилище не меняется
+            cursor.count()
+            return cursor
     
-    def delete_students(self, criteria: Dict[str, str]) -> int:
-        return self._repository.delete_students(criteria)
+    def prepare_search(self) -> None:
+        with self._lock:
+            self._repository.prepare_search()
+    
+    def delete_students(self, criteria: Criteria) -> int:
+        with self._lock:
+            return self._repository.delete_students(criteria)
     
     def get_paginated_students(self, page: int, page_size: int) -> List[Student]:
-        return self._repository.get_paginated_students(page, page_size)
+        with self._lock:
+            return self._repository.get_paginated_students(page, page_size)
+    
+    def get_students_range(self, offset: int, count: int) -> List[Student]:
+        with self._lock:
+            return self._repository.get_students_range(offset, count)
     
     def get_total_students(self) -> int:
-        return self._repository.get_total_students()
+        with self._lock:
+            return self._repository.get_total_students()
     
     def get_unique_values(self, field: str) -> List[str]:
-        return self._repository.get_unique_values(field)
+        with self._lock:
+            return self._repository.get_unique_values(field)
+    
+    def save_to_file(self, file_path: str, progress: Optional[Callable[[float], None]] = None) -> None:
+        self._write_file(DomHandler(), file_path, progress)
+    
+    def load_from_file(self, file_path: str, progress: Optional[Callable[[float], None]] = None) -> None:
+        # Файл разбирается в столбцы полей, которые проверяются все сразу; студенты
+        # строятся из проверенных столбцов, и хранилище заменяется целиком. Создаваемые
+        # строки и студенты не образуют циклов, поэтому сборщик мусора на это время
+        # отключается: иначе он многократно обходит все уже созданные объекты
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            columns = SaxHandler(self._format_fio).parse_columns(file_path, progress)
+            self._validator.validate_columns(columns)
+            students = list(map(Student, *columns))
+        finally:
+            if gc_enabled:
+                gc.enable()
+        self._replace_students(students, progress)
+    
+    def save_snapshot(self, file_path: str, progress: Optional[Callable[[float], None]] = None) -> None:
+        self._write_file(SnapshotHandler(), file_path, progress)
+    
+    def load_snapshot(self, file_path: str, progress: Optional[Callable[[float], None]] = None) -> None:
+        # Снимок может быть изменён вне приложения, поэтому студенты тоже проверяются
+        students = SnapshotHandler().read_students_from_file(file_path)
+        self._validator.validate_students(students)
+        self._replace_students(students, progress)
     
-    def save_to_file(self, file_path: str) -> None:
-        handler = DomHandler()
-        handler.write_students_to_file(self._repository.get_all_students(), file_path)
+    def _replace_students(self, students: List[Student], progress: Optional[Callable[[float], None]]) -> None:
+        # Последний отчёт о ходе выполнения — до замены студентов: отмена
+        # операции (исключение из progress) не затронет хранилище
+        if progress:
+            progress(1.0)
+        with self._lock:
+            self._repository.replace_all(students)
     
-    def load_from_file(self, file_path: str) -> None:
-        handler = SaxHandler()
-        parser = xml.sax.make_parser()
-        parser.setContentHandler(handler)
-        parser.parse(file_path)
+    def _write_file(self, handler, file_path: str, progress: Optional[Callable[[float], None]]) -> None:
+        """Записывает студентов во временный файл и заменяет им file_path.
 
-        self._repository._students = []
-        
-        for student_data in handler.students:
-            self.add_student(student_data)
+        При ошибке или отмене прежний файл остаётся нетронутым.
+        """
+        total = max(1, self._repository.get_total_students())
+        temporary_path = file_path + ".tmp"
+        try:
+            handler.write_students_to_file(self._repository.iter_students(), temporary_path,
+                                           progress and (lambda written: progress(written / total)))
+            # Последний отчёт — до замены файла, чтобы отмена не затронула прежний файл
+            if progress:
+                progress(1.0)
+            os.replace(temporary_path, file_path)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
     
     @staticmethod
     def _format_fio(full_name: str) -> str:
         if not full_name:
             return full_name
-        return ' '.join(word.capitalize() for word in full_name.split())
\ No newline at end of file
+        # Для слов из букв title() совпадает с capitalize() каждого слова, но быстрее;
+        # ФИО с другими символами не проходят валидацию
+        return ' '.join(full_name.split()).title()
\ No newline at end of file
@@ -0,0 +1,132 @@
+from array import array
+from contextlib import ExitStack
+import mmap
+import os
+import struct
+import sys
+from typing import Callable, Dict, Iterable, List, Optional
+
+from model.student import Student
+from model.student_handler import DomHandler, SaxHandler
+
+
+# Расширение файлов снимков; остальные файлы читаются и пишутся как XML
+SNAPSHOT_EXTENSION = ".students"
+
+
+class SnapshotHandler:
+    """Запись и чтение студентов в двоичном столбцовом снимке.
+
+    Формат (все числа little-endian, все разделы выровнены по своему типу):
+    - заголовок: сигнатура, версия, число строк в таблице строк, число студентов;
+    - концы строк таблицы строк в байтах (uint64);
+    - столбцы курса, общего числа и числа выполненных работ (int64);
+    - столбцы номеров ФИО, группы и языка в таблице строк (uint32);
+    - таблица строк: строки UTF-8 подряд.
+    Каждая различная строка хранится один раз. Файл читается через mmap:
+    числовые столбцы используются прямо из отображённой памяти.
+    """
+
+    _MAGIC = b"STUDSNAP"
+    _VERSION = 1
+    _HEADER = struct.Struct("<8sHHIQ")
+
+    # Через сколько обработанных студентов вызывается progress
+    PROGRESS_STEP = 10000
+
+    def write_students_to_file(self, students: Iterable[Student], file_path: str,
+                               progress: Optional[Callable[[int], None]] = None) -> None:
+        """Сохраняет студентов в файл снимка.
+
+        Каждые PROGRESS_STEP студентов вызывается progress с числом уже
+        обработанных студентов.
+        """
+        strings: Dict[str, int] = {}
+        string_id = strings.setdefault
+        ints = (array('q'), array('q'), array('q'))
+        ids = (array('I'), array('I'), array('I'))
+        for student in students:
+            ints[0].append(student.course)
+            ints[1].append(student.total_works)
+            ints[2].append(student.completed_works)
+            ids[0].append(string_id(student.full_name, len(strings)))
+            ids[1].append(string_id(student.group, len(strings)))
+            ids[2].append(string_id(student.programming_language, len(strings)))
+            if progress and len(ints[0]) % self.PROGRESS_STEP == 0:
+                progress(len(ints[0]))
+
+        encoded = [value.encode() for value in strings]
+        ends = array('Q')
+        end = 0
+        for value in encoded:
+            end += len(value)
+            ends.append(end)
+
+        with open(file_path, "wb") as file:
+            file.write(self._HEADER.pack(self._MAGIC, self._VERSION, 0, len(ends), len(ints[0])))
+            for column in (ends, *ints, *ids):
+                if sys.byteorder == "big":
+                    column.byteswap()
+                file.write(column.tobytes())
+            file.write(b"".join(encoded))
+
+    def read_students_from_file(self, file_path: str) -> List[Student]:
+        """Загружает студентов из файла снимка."""
+        with open(file_path, "rb") as file:
+            if os.fstat(file.fileno()).st_size < self._HEADER.size:
+                raise ValueError("Файл не является снимком студентов")
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return self._read_students(data)
+
+    def _read_students(self, data: mmap.mmap) -> List[Student]:
+        magic, version, _, string_count, count = self._HEADER.unpack_from(data)
+        if magic != self._MAGIC or version != self._VERSION:
+            raise ValueError("Файл не является снимком студентов")
+
+        # Представления памяти освобождаются (в обратном порядке) до закрытия mmap
+        with ExitStack() as views:
+            memory = views.enter_context(memoryview(data))
+            offset = self._HEADER.size
+            columns = []
+            for typecode, size in (('Q', string_count), ('q', count), ('q', count), ('q', count),
+                                   ('I', count), ('I', count), ('I', count)):
+                length = size * array(typecode).itemsize
+                if offset + length > len(data):
+                    raise ValueError("Файл снимка повреждён")
+                columns.append(self._column(views, memory[offset:offset + length], typecode))
+                offset += length
+            ends, courses, total_works, completed_works, full_names, groups, languages = columns
+
+            if offset + (ends[-1] if string_count else 0) != len(data):
+                raise ValueError("Файл снимка повреждён")
+            strings, start = [], offset
+            for end in ends:
+                strings.append(data[start:offset + end].decode())
+                start = offset + end
+
+            string = strings.__getitem__
+            try:
+                return list(map(Student, map(string, full_names), courses, map(string, groups),
+                                total_works, completed_works, map(string, languages)))
+            except IndexError:
+                raise ValueError("Файл снимка повреждён") from None
+
+    @staticmethod
+    def _column(views: ExitStack, view: memoryview, typecode: str):
+        """Числовой столбец из памяти файла (на big-endian — перевёрнутая копия)."""
+        views.enter_context(view)
+        if sys.byteorder == "big":
+            column = array(typecode, view.tobytes())
+            column.byteswap()
+            return column
+        return views.enter_context(view.cast(typecode))
+
+
+def xml_to_snapshot(xml_path: str, snapshot_path: str) -> None:
+    """Преобразует XML-файл студентов в снимок."""
+    SnapshotHandler().write_students_to_file(SaxHandler().parse(xml_path), snapshot_path)
+
+
+def snapshot_to_xml(snapshot_path: str, xml_path: str) -> None:
+    """Преобразует снимок в XML-файл студентов."""
+    DomHandler().write_students_to_file(SnapshotHandler().read_students_from_file(snapshot_path), xml_path)
@@ -1,4 +1,10 @@
+from typing import List, Optional, Tuple
+
+
 class Student:
+    # Без __dict__ у каждого экземпляра студент занимает заметно меньше памяти
+    __slots__ = ("_full_name", "_course", "_group", "_total_works", "_completed_works", "_programming_language")
+
     def __init__(self, full_name: str, course: int, group: str, 
                  total_works: int, completed_works: int, programming_language: str):
         self._full_name = full_name
@@ -39,4 +45,58 @@ class Student:
     def __str__(self):
         return (f"Student(full_name={self._full_name}, course={self._course}, group={self._group}, "
                 f"total_works={self._total_works}, completed_works={self._completed_works}, "
-                f"programming_language={self._programming_language})")
\ No newline at end of file
+                f"programming_language={self._programming_language})")
+
+
+class StudentRow:
+    """Лёгкое представление студента, хранящегося в ColumnarStudentRepository.
+
+    Хранит только ссылку на столбцы хранилища и номер строки, а значения
+    читает из столбцов при обращении. Свойства те же, что у Student.
+    Удаление студентов создаёт в хранилище новые столбцы, поэтому уже
+    выданные представления продолжают показывать прежние данные.
+    """
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: tuple, row: int):
+        self._table = table
+        self._row = row
+
+    @property
+    def full_name(self) -> str:
+        return self._table[0][self._row]
+
+    @property
+    def course(self) -> int:
+        return self._table[1][self._row]
+
+    @property
+    def group(self) -> str:
+        return self._table[2][self._row]
+
+    @property
+    def total_works(self) -> int:
+        return self._table[3][self._row]
+
+    @property
+    def completed_works(self) -> int:
+        return self._table[4][self._row]
+
+    @property
+    def programming_language(self) -> str:
+        return self._table[5][self._row]
+
+    @property
+    def not_completed_works(self) -> int:
+        return self.total_works - self.completed_works
+
+    def __str__(self):
+        return (f"Student(full_name={self.full_name}, course={self.course}, group={self.group}, "
+                f"total_works={self.total_works}, completed_works={self.completed_works}, "
+                f"programming_language={self.programming_language})")
+
+
+# Столбцы полей студентов в порядке аргументов Student: ФИО, курсы, группы, общее число работ,
+# выполненные работы, языки программирования. Отсутствующее числовое поле — None
+StudentColumns = Tuple[List[str], List[Optional[int]], List[str], List[Optional[int]], List[Optional[int]], List[str]]
@@ -1,61 +1,238 @@
+import codecs
+import os
+import re
 import xml.sax
+from itertools import chain
 from tkinter import filedialog
-from xml.dom import minidom
-from typing import List, Dict
+from xml.parsers import expat
+from xml.sax.saxutils import escape, unescape
+from typing import Callable, Iterable, List, Dict, Optional, Tuple
 
-from model.student import Student
+from model.student import Student, StudentColumns
 
 
 # Обработчик SAX
 class SaxHandler(xml.sax.ContentHandler):
-    def __init__(self):
-        self.students = []
-        self.current_student = None
-        self.current_element = None
+    """Разбирает XML-файл со студентами в столбцы значений полей.
+
+    Файл в разметке, которую пишет DomHandler, разбирается по блокам одним
+    регулярным выражением: на каждого студента не вызывается ни одного
+    метода Python. Любой другой файл разбирается парсером expat, события
+    которого передаются методам обработчика напрямую, минуя обёртку
+    xml.sax. Текст элемента может прийти несколькими вызовами characters,
+    поэтому он накапливается и разбирается в конце элемента. Данные
+    студентов не проверяются: это делает валидатор для всех столбцов сразу.
+    """
+
+    _FIELDS = ("FullName", "Course", "Group", "TotalWorks", "CompletedWorks", "ProgrammingLanguage")
+    _INT_FIELDS = ("Course", "TotalWorks", "CompletedWorks")
+    # Размер блока, который читается из файла за один раз
+    CHUNK_SIZE = 1 << 20
+
+    # Разметка DomHandler. Текст полей — символы, допустимые в XML, кроме '<'
+    # ('\r' парсер заменил бы на '\n'); ссылки на сущности проверяются отдельно
+    _HEADER = '<?xml version="1.0" ?>\n<Students>\n'
+    _FOOTER = "</Students>\n"
+    _STUDENT_END = "  </Student>\n"
+    _STUDENT = re.compile((
+        "  <Student>\n"
+        "    <FullName>{0}</FullName>\n"
+        "    <Course>{0}</Course>\n"
+        "    <Group>{0}</Group>\n"
+        "    <TotalWorks>{0}</TotalWorks>\n"
+        "    <CompletedWorks>{0}</CompletedWorks>\n"
+        "    <ProgrammingLanguage>{0}</ProgrammingLanguage>\n"
+        "  </Student>\n"
+    ).format(r"([^<\r\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]*)"))
+    # Ссылка, которую нельзя раскрыть заменой пяти стандартных сущностей
+    _OTHER_REFERENCE = re.compile(r"&(?!(?:amp|lt|gt|quot|apos);)")
+    _ENTITIES = {"&quot;": '"', "&apos;": "'"}
+    # Наибольшая длина студента в разметке DomHandler (в символах)
+    _MAX_STUDENT_LENGTH = 1 << 16
+
+    def __init__(self, format_full_name: Optional[Callable[[str], str]] = None):
+        super().__init__()
+        self._format_full_name = format_full_name
+        self._columns: List[List[str]] = [[] for _ in self._FIELDS]
+        self._fields: Dict[str, str] = {}
+        self._text: List[str] = []
+
+    def parse(self, file_path: str, progress: Optional[Callable[[float], None]] = None) -> List[Student]:
+        """Разбирает XML-файл и возвращает список студентов."""
+        return list(map(Student, *self.parse_columns(file_path, progress)))
+
+    def parse_columns(self, file_path: str, progress: Optional[Callable[[float], None]] = None) -> StudentColumns:
+        """Разбирает XML-файл и возвращает столбцы полей студентов в порядке _FIELDS.
+
+        Отсутствующее или пустое числовое поле — None (об этом сообщит
+        валидатор). После каждого прочитанного блока вызывается progress с
+        долей прочитанного файла.
+        """
+        if not self._parse_dom_layout(file_path, progress):
+            self._columns = [[] for _ in self._FIELDS]
+            self._parse_expat(file_path, progress)
+        full_names, courses, groups, total_works, completed_works, languages = self._columns
+        self._columns = [[] for _ in self._FIELDS]
+        full_names = list(map(self._format_full_name or str.strip, full_names))
+        courses, total_works, completed_works = self._int_columns((courses, total_works, completed_works))
+        return (full_names, courses, list(map(str.strip, groups)), total_works, completed_works,
+                list(map(str.strip, languages)))
+
+    def _parse_dom_layout(self, file_path: str, progress: Optional[Callable[[float], None]]) -> bool:
+        """Разбирает файл в разметке DomHandler; False, если разметка другая."""
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        columns = self._columns
+        with open(file_path, "rb") as file:
+            size = max(1, os.fstat(file.fileno()).st_size)
+            text = ""
+            header = True
+            while True:
+                chunk = file.read(self.CHUNK_SIZE)
+                try:
+                    text += decoder.decode(chunk, not chunk)
+                except UnicodeDecodeError:
+                    return False
+                if header:
+                    if len(text) < len(self._HEADER) and chunk:
+                        continue
+                    if not text.startswith(self._HEADER):
+                        return False
+                    text, header = text[len(self._HEADER):], False
+                # Разбирается текст до конца последнего целого студента, остаток ждёт следующего блока
+                if chunk:
+                    end = text.rfind(self._STUDENT_END)
+                    if end < 0 and len(text) > self._MAX_STUDENT_LENGTH:
+                        # Без конца студента текст копился бы до конца файла: разметка другая
+                        return False
+                    end = end + len(self._STUDENT_END) if end >= 0 else 0
+                elif text.endswith(self._FOOTER):
+                    end = len(text) - len(self._FOOTER)
+                else:
+                    return False
+                students, text = text[:end], text[end:]
+                if students:
+                    parts = self._STUDENT.split(students)
+                    # Между студентами не должно быть ничего: split оставляет там пустые строки
+                    if parts[0] or any(parts[7::7]) or "]]>" in students:
+                        return False
+                    if "&" in students:
+                        if self._OTHER_REFERENCE.search(students):
+                            return False
+                        parts = [unescape(part, self._ENTITIES) if "&" in part else part for part in parts]
+                    for index, column in enumerate(columns, 1):
+                        column.extend(parts[index::7])
+                if not chunk:
+                    return True
+                if progress:
+                    progress(file.tell() / size)
+
+    def _parse_expat(self, file_path: str, progress: Optional[Callable[[float], None]]) -> None:
+        parser = expat.ParserCreate()
+        # Соседние фрагменты текста передаются одним вызовом
+        parser.buffer_text = True
+        parser.buffer_size = 1 << 16
+        parser.CharacterDataHandler = self.characters
+        parser.EndElementHandler = self.endElement
+        with open(file_path, "rb") as file:
+            size = max(1, os.fstat(file.fileno()).st_size)
+            while True:
+                chunk = file.read(self.CHUNK_SIZE)
+                parser.Parse(chunk, not chunk)
+                if not chunk:
+                    break
+                if progress:
+                    progress(file.tell() / size)
 
     def startElement(self, name, attrs):
-        if name == "Student":
-            self.current_student = {}
-        self.current_element = name
+        self._text.clear()
 
     def characters(self, content):
-        if self.current_element and content.strip():
-            if self.current_element in ["FullName", "Group", "ProgrammingLanguage"]:
-                self.current_student[self.current_element] = content
-            elif self.current_element in ["Course", "TotalWorks", "CompletedWorks"]:
-                self.current_student[self.current_element] = int(content)
+        self._text.append(content)
 
     def endElement(self, name):
         if name == "Student":
-            self.students.append(self.current_student)
-        self.current_element = None
+            for field, column in zip(self._FIELDS, self._columns):
+                column.append(self._fields.get(field, ""))
+            self._fields = {}
+        elif name != "Students":
+            # Пробелы между элементами попадают в начало текста и отбрасываются
+            self._fields[name] = "".join(self._text).strip()
+        self._text.clear()
+
+    def _int_columns(self, columns: Tuple[List[str], ...]) -> List[List[Optional[int]]]:
+        """Преобразует столбцы числовых полей (в порядке _INT_FIELDS) в целые числа."""
+        try:
+            return [list(map(int, column)) for column in columns]
+        except ValueError:
+            pass
+        # Поле пустое или не число: проходим по студентам, чтобы сообщить о первом неверном поле
+        result = [[] for _ in columns]
+        for number, values in enumerate(zip(*columns), 1):
+            for name, value, converted in zip(self._INT_FIELDS, values, result):
+                converted.append(self._int_value(number, name, value))
+        return result
+
+    @staticmethod
+    def _int_value(number: int, name: str, value: str) -> Optional[int]:
+        """Целое значение поля; None, если поле пустое (это сообщит валидатор)."""
+        if not value.strip():
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            raise ValueError(f"Студент №{number}: поле {name} должно быть целым числом") from None
 
 
-# Обработчик DOM
+# Запись XML
 class DomHandler:
-    def write_students_to_file(self, students: List[Student], file_path: str) -> None:
-        """Сохраняет список студентов в XML-файл с использованием DOM."""
-        doc = minidom.Document()
-        root = doc.createElement("Students")
-        doc.appendChild(root)
-
-        for student in students:
-            student_elem = doc.createElement("Student")
-            
-            self._add_text_element(doc, student_elem, "FullName", student.full_name)
-            self._add_text_element(doc, student_elem, "Course", str(student.course))
-            self._add_text_element(doc, student_elem, "Group", student.group)
-            self._add_text_element(doc, student_elem, "TotalWorks", str(student.total_works))
-            self._add_text_element(doc, student_elem, "CompletedWorks", str(student.completed_works))
-            self._add_text_element(doc, student_elem, "ProgrammingLanguage", student.programming_language)
-            
-            root.appendChild(student_elem)
-
-        with open(file_path, "w", encoding="utf-8") as file:
-            file.write(doc.toprettyxml(indent="  "))
-    
-    def _add_text_element(self, doc, parent, name, text):
-        """Создает текстовый элемент и добавляет его к родительскому."""
-        elem = doc.createElement(name)
-        elem.appendChild(doc.createTextNode(text))
-        parent.appendChild(elem)      
\ No newline at end of file
+    """Потоковая запись студентов в XML-файл.
+
+    Документ не строится в памяти: каждый студент сразу записывается в
+    буферизованный файл по шаблону. Разметка и экранирование совпадают с
+    тем, что выводил minidom.toprettyxml(indent="  "), поэтому файлы
+    остаются прежними байт в байт.
+    """
+
+    # Кавычки экранируются так же, как это делал minidom
+    _ENTITIES = {'"': "&quot;"}
+    _STUDENT_TEMPLATE = (
+        "  <Student>\n"
+        "    <FullName>{}</FullName>\n"
+        "    <Course>{}</Course>\n"
+        "    <Group>{}</Group>\n"
+        "    <TotalWorks>{}</TotalWorks>\n"
+        "    <CompletedWorks>{}</CompletedWorks>\n"
+        "    <ProgrammingLanguage>{}</ProgrammingLanguage>\n"
+        "  </Student>\n"
+    )
+
+    # Через сколько записанных студентов вызывается progress
+    PROGRESS_STEP = 10000
+
+    def write_students_to_file(self, students: Iterable[Student], file_path: str,
+                               progress: Optional[Callable[[int], None]] = None) -> None:
+        """Сохраняет студентов в XML-файл, перебирая их по одному.
+
+        Каждые PROGRESS_STEP студентов вызывается progress с числом уже
+        записанных студентов.
+        """
+        students = iter(students)
+        first = next(students, None)
+        with open(file_path, "w", encoding="utf-8", buffering=1 << 20) as file:
+            file.write('<?xml version="1.0" ?>\n')
+            if first is None:
+                file.write("<Students/>\n")
+                return
+            file.write("<Students>\n")
+            for number, student in enumerate(chain([first], students), 1):
+                file.write(self._format_student(student))
+                if progress and number % self.PROGRESS_STEP == 0:
+                    progress(number)
+            file.write("</Students>\n")
+
+    def _format_student(self, student: Student) -> str:
+        """Возвращает элемент <Student> с отступами."""
+        return self._STUDENT_TEMPLATE.format(
+            escape(student.full_name, self._ENTITIES), student.course, escape(student.group, self._ENTITIES),
+            student.total_works, student.completed_works, escape(student.programming_language, self._ENTITIES)
+        )
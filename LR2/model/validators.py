@@ -1,11 +1,36 @@
 from abc import ABC, abstractmethod
-from typing import Dict
+from itertools import repeat
+from operator import attrgetter, le
+from typing import Dict, List
+
+from model.student import Student, StudentColumns
 
 class StudentValidator(ABC):
     @abstractmethod
     def validate(self, student_data: Dict[str, str]) -> None:
         pass
 
+    def validate_students(self, students: List[Student]) -> None:
+        """Проверяет список студентов; в сообщении об ошибке указывается номер студента."""
+        for number, student in enumerate(students, 1):
+            student_data = {
+                "FullName": student.full_name, "Course": student.course, "Group": student.group,
+                "TotalWorks": student.total_works, "CompletedWorks": student.completed_works,
+                "ProgrammingLanguage": student.programming_language
+            }
+            try:
+                # Отсутствующие поля (None) не передаются, чтобы validate сообщил о них
+                self.validate({field: value for field, value in student_data.items() if value is not None})
+            except ValueError as e:
+                raise ValueError(f"Студент №{number}: {e}") from None
+
+    def validate_columns(self, columns: StudentColumns) -> None:
+        """Проверяет студентов, заданных столбцами полей (см. StudentColumns).
+
+        Реализация по умолчанию строит объекты Student и вызывает validate_students.
+        """
+        self.validate_students(list(map(Student, *columns)))
+
 class BasicStudentValidator(StudentValidator):
     def validate(self, student_data: Dict[str, str]) -> None:
         required_fields = ["FullName", "Course", "Group", "TotalWorks", "CompletedWorks", "ProgrammingLanguage"]
@@ -30,4 +55,52 @@ class BasicStudentValidator(StudentValidator):
                 raise ValueError("ФИО должно содержать ровно 3 слова")
                 
         except ValueError as e:
-            raise ValueError(str(e))
\ No newline at end of file
+            raise ValueError(str(e))
+
+    def validate_students(self, students: List[Student]) -> None:
+        # Быстрая проверка без словарей и int(): значения уже разобраны. Сообщение
+        # об ошибке готовится отдельно, только для первого неверного студента
+        values = attrgetter("full_name", "course", "group", "total_works", "completed_works", "programming_language")
+        for number, (full_name, course, group, total, completed, language) in enumerate(map(values, students), 1):
+            try:
+                if (1 <= course <= 4 and 0 <= completed <= total and group.strip() and language.strip()
+                        and self._is_full_name(full_name)):
+                    continue
+            except (TypeError, AttributeError):
+                pass
+            raise ValueError(f"Студент №{number}: {self._student_error(full_name, course, group, total, completed, language)}")
+
+    def validate_columns(self, columns: StudentColumns) -> None:
+        # Каждое условие проверяется для целого столбца встроенными функциями. ФИО,
+        # в которых слова разделены одним пробелом, проверяются без split; если какое-то
+        # условие не выполнено, студенты проверяются по одному, чтобы найти первого неверного
+        full_names, courses, groups, total_works, completed_works, languages = columns
+        try:
+            if (not full_names or min(courses) >= 1 and max(courses) <= 4 and min(completed_works) >= 0
+                    and all(map(le, completed_works, total_works)) and all(map(str.strip, groups))
+                    and all(map(str.strip, languages))
+                    and list(map(str.count, full_names, repeat(" "))).count(2) == len(full_names)
+                    and all(map(str.isalpha, map(str.replace, full_names, repeat(" "), repeat(""))))):
+                return
+        except TypeError:
+            # Отсутствующее числовое поле (None)
+            pass
+        super().validate_columns(columns)
+
+    @staticmethod
+    def _is_full_name(full_name: str) -> bool:
+        parts = full_name.split()
+        return len(parts) == 3 and all(part.isalpha() for part in parts)
+
+    def _student_error(self, full_name, course, group, total, completed, language) -> str:
+        for field, value in (("FullName", full_name), ("Course", course), ("Group", group),
+                             ("TotalWorks", total), ("CompletedWorks", completed), ("ProgrammingLanguage", language)):
+            if value is None or not str(value).strip():
+                return f"Отсутствует обязательное поле: {field}"
+        if not 1 <= course <= 4:
+            return "Курс должен быть от 1 до 4"
+        if total < 0 or completed < 0:
+            return "Количество работ должно быть неотрицательным"
+        if completed > total:
+            return "Выполненных работ не может быть больше общего количества"
+        return "ФИО должно содержать ровно 3 слова"
@@ -0,0 +1,304 @@
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from controller.background import BackgroundTask, OperationCancelled
+from controller.controller import StudentController
+from controller.live_search import LiveSearch
+from model.repositories import InMemoryStudentRepository, StudentChange
+from model.incremental_search import IncrementalSearch
+from model.service import StudentModel
+from model.student import Student
+from model.validators import BasicStudentValidator
+
+
+class FakeScheduler:
+    """Заменяет root.after: вызовы выполняются в run_until_idle."""
+
+    def __init__(self):
+        self.callbacks = []
+
+    def after(self, delay, callback):
+        self.callbacks.append(callback)
+
+    def run_until_idle(self, timeout=5):
+        deadline = time.monotonic() + timeout
+        while self.callbacks and time.monotonic() < deadline:
+            callbacks, self.callbacks = self.callbacks, []
+            for callback in callbacks:
+                callback()
+            time.sleep(0.001)
+
+
+class FakeProgressDialog:
+    def __init__(self):
+        self.progress = []
+        self.closed = False
+
+    def set_progress(self, fraction):
+        self.progress.append(fraction)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeView(FakeScheduler):
+    def __init__(self):
+        super().__init__()
+        self.messages, self.errors, self.changes, self.updates, self.loads = [], [], [], 0, 0
+        self.dialog = FakeProgressDialog()
+
+    def set_controller(self, controller):
+        self.controller = controller
+
+    def show_progress(self, title):
+        return self.dialog
+
+    def show_message(self, message):
+        self.messages.append(message)
+
+    def show_error(self, error):
+        self.errors.append(error)
+
+    def on_students_changed(self, change):
+        self.changes.append(change)
+
+    def update_view(self):
+        self.updates += 1
+
+    def on_students_loaded(self):
+        self.loads += 1
+
+
+class TestBackgroundTask(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = FakeScheduler()
+        self.done = []
+        self.progress = []
+
+    def start(self, work):
+        task = BackgroundTask(self.scheduler.after, work, self.progress.append,
+                              lambda result, error: self.done.append((result, error)))
+        task.start()
+        return task
+
+    def test_result_and_progress(self):
+        def work(report):
+            self.assertNotEqual(threading.current_thread(), threading.main_thread())
+            report(0.5)
+            return 42
+
+        self.start(work)
+        self.scheduler.run_until_idle()
+        self.assertEqual(self.done, [(42, None)])
+        self.assertIn(self.progress, ([], [0.5]))
+
+    def test_error(self):
+        def work(report):
+            raise ValueError("плохой файл")
+
+        self.start(work)
+        self.scheduler.run_until_idle()
+        self.assertIsInstance(self.done[0][1], ValueError)
+
+    def test_cancel(self):
+        started = threading.Event()
+
+        def work(report):
+            started.set()
+            while True:
+                report(0.1)
+                time.sleep(0.001)
+
+        task = self.start(work)
+        started.wait(5)
+        task.cancel()
+        self.scheduler.run_until_idle()
+        self.assertIsInstance(self.done[0][1], OperationCancelled)
+
+
+class TestControllerFileOperations(unittest.TestCase):
+
+    def setUp(self):
+        self.path = "test_background.xml"
+        self.repository = InMemoryStudentRepository([Student("Иванов Иван Иванович", 1, "421701", 10, 7, "Python")])
+        self.view = FakeView()
+        self.controller = StudentController(StudentModel(self.repository, BasicStudentValidator()), self.view)
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def test_save_and_load_in_background(self):
+        with patch("controller.controller.filedialog.asksaveasfilename", return_value=self.path):
+            self.controller.save_to_file()
+        self.view.run_until_idle()
+        self.assertEqual(self.view.messages, ["Данные успешно сохранены!"])
+        self.assertTrue(self.view.dialog.closed)
+
+        self.repository.clear()
+        with patch("controller.controller.filedialog.askopenfilename", return_value=self.path):
+            self.controller.load_from_file()
+        self.view.run_until_idle()
+        self.assertEqual(self.view.messages[-1], "Данные успешно загружены!")
+        self.assertEqual((self.view.loads, self.view.updates), (1, 0))
+        self.assertEqual(self.repository.get_total_students(), 1)
+        # Замена студентов при загрузке в рабочем потоке не передаётся представлению
+        self.assertEqual(self.view.changes, [StudentChange(StudentChange.RESET)])
+
+    def test_changes_are_passed_to_view(self):
+        self.controller.add_student({"FullName": "петров пётр петрович", "Course": "2", "Group": "421702",
+                                     "TotalWorks": "12", "CompletedWorks": "5", "ProgrammingLanguage": "Java"})
+        self.controller.delete_students({"FullName": "Иванов"})
+        self.assertEqual(self.view.changes, [StudentChange(StudentChange.INSERTED, (1,)),
+                                             StudentChange(StudentChange.REMOVED, (0,))])
+        self.assertEqual(self.view.updates, 0)
+
+    def test_cancelled_save_keeps_file(self):
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write("прежнее содержимое")
+        # Сохранение начинается только после отмены
+        release = threading.Event()
+        save_to_file = StudentModel.save_to_file
+
+        def delayed_save(model, file_path, progress):
+            release.wait(5)
+            save_to_file(model, file_path, progress)
+
+        with patch("controller.controller.filedialog.asksaveasfilename", return_value=self.path), \
+                patch.object(StudentModel, "save_to_file", delayed_save):
+            self.controller.save_to_file()
+        self.controller.cancel_file_operation()
+        release.set()
+        self.view.run_until_idle()
+
+        self.assertEqual(self.view.messages, ["Операция отменена."])
+        with open(self.path, encoding="utf-8") as file:
+            self.assertEqual(file.read(), "прежнее содержимое")
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+
+class TestLiveSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.repository = InMemoryStudentRepository([
+            Student("Иванов Иван Иванович", 1, "421701", 10, 7, "Python"),
+            Student("Петров Пётр Петрович", 2, "421702", 12, 12, "Java"),
+        ])
+        self.scheduler = FakeScheduler()
+        self.results, self.errors = [], []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+        self.live_search = LiveSearch(self.scheduler.after, IncrementalSearch(self.search_cursor, lambda: 0),
+                                      self.on_results, self.errors.append)
+
+    def search_cursor(self, criteria):
+        self.started.set()
+        self.release.wait(5)
+        return self.repository.search_cursor(criteria)
+
+    def on_results(self, cursor):
+        self.results.append([student.full_name for student in cursor.get_range(0, cursor.count())])
+
+    def test_results(self):
+        self.live_search.search("FullName", "петров")
+        self.scheduler.run_until_idle()
+        self.assertEqual(self.results, [["Петров Пётр Петрович"]])
+
+    def test_only_latest_query_runs_after_current(self):
+        self.release.clear()
+        self.live_search.search("FullName", "и")
+        self.started.wait(5)
+        self.live_search.search("FullName", "п")
+        self.live_search.search("Group", "421701")
+        self.release.set()
+        self.scheduler.run_until_idle()
+        self.assertEqual(self.results, [["Иванов Иван Иванович"]])
+
+    def test_error(self):
+        self.live_search.search("Course", "один")
+        self.scheduler.run_until_idle()
+        self.assertEqual(self.results, [])
+        self.assertIsInstance(self.errors[0], ValueError)
+
+    def test_discarded_and_closed_searches_report_nothing(self):
+        self.live_search.search("FullName", "и")
+        self.live_search.discard()
+        self.scheduler.run_until_idle()
+        self.live_search.search("FullName", "и")
+        self.live_search.close()
+        self.scheduler.run_until_idle()
+        self.assertEqual(self.results, [])
+
+
+class TestLiveSearchWithChanges(unittest.TestCase):
+    """Поиск в рабочем потоке одновременно с изменением хранилища в потоке Tk."""
+
+    def setUp(self):
+        self.repository = InMemoryStudentRepository([
+            Student("Иванов Иван Иванович", 1, "421701", 10, 7, "Python"),
+            Student("Петров Пётр Петрович", 2, "421702", 12, 12, "Java"),
+        ])
+        self.model = StudentModel(self.repository, BasicStudentValidator())
+        self.scheduler = FakeScheduler()
+        self.results = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.index_threads = []
+        self.live_search = LiveSearch(self.scheduler.after, IncrementalSearch(self.model.search_cursor, self.model.get_version),
+                                      self.on_results, self.fail, self.model.prepare_search)
+
+    def on_results(self, cursor):
+        self.results.append([student.full_name for student in cursor.get_range(0, cursor.count())])
+
+    def test_changes_wait_for_running_search(self):
+        ensure_indexes, search_cursor = self.repository._ensure_indexes, self.repository.search_cursor
+
+        def recording_ensure_indexes():
+            if not self.repository._indexed:
+                self.index_threads.append(threading.current_thread())
+            ensure_indexes()
+
+        def slow_search_cursor(criteria):
+            self.started.set()
+            self.release.wait(5)
+            return search_cursor(criteria)
+
+        with patch.object(self.repository, "_ensure_indexes", recording_ensure_indexes), \
+                patch.object(self.repository, "search_cursor", slow_search_cursor):
+            self.live_search.search("FullName", "иван")
+            # Индексы построены в потоке Tk до запуска поиска
+            self.assertEqual(self.index_threads, [threading.current_thread()])
+            self.assertTrue(self.started.wait(5))
+
+            def change():
+                self.model.add_student({"FullName": "иваненко олег петрович", "Course": "3", "Group": "121703",
+                                        "TotalWorks": "10", "CompletedWorks": "5", "ProgrammingLanguage": "Go"})
+                self.model.delete_students({"FullName": "Иванов"})
+
+            writer = threading.Thread(target=change)
+            writer.start()
+            writer.join(0.2)
+            # Изменение ждёт завершения поиска
+            self.assertTrue(writer.is_alive())
+            self.release.set()
+            writer.join(5)
+            self.scheduler.run_until_idle()
+
+        self.assertFalse(writer.is_alive())
+        self.assertEqual(self.results, [["Иванов Иван Иванович"]])
+        students = self.model.search_students({})
+        self.assertEqual([student.full_name for student in self.model.search_students({"FullName": "иван"})],
+                         [student.full_name for student in students if "иван" in student.full_name.lower()])
+        self.assertEqual(self.model.get_unique_values("Язык программирования"), ["Go", "Java"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.incremental_search import IncrementalSearch
+from model.query import parse_query
+from model.repositories import ColumnarStudentRepository, FilterSearchCursor, InMemoryStudentRepository
+from model.service import StudentModel
+from model.student import Student
+from model.validators import BasicStudentValidator
+
+
+class TestIncrementalSearch(unittest.TestCase):
+
+    def make_repository(self, students):
+        return InMemoryStudentRepository(students)
+
+    def setUp(self):
+        self.model = StudentModel(self.make_repository([
+            Student("Иванов Иван Иванович", 1, "421701", 10, 7, "Python"),
+            Student("Иваненко Олег Петрович", 3, "121703", 10, 5, "python"),
+            Student("Петров Пётр Петрович", 2, "421702", 12, 12, "Java"),
+        ]), BasicStudentValidator())
+        self.queries = []
+        self.search = IncrementalSearch(self.search_cursor, self.model.get_version)
+
+    def search_cursor(self, criteria):
+        self.queries.append(criteria)
+        return self.model.search_cursor(criteria)
+
+    def names(self, cursor):
+        return [student.full_name for student in cursor.get_range(0, cursor.count())]
+
+    def test_extended_query_refines_previous_results(self):
+        self.assertEqual(len(self.names(self.search.search("FullName", "ив"))), 2)
+        cursor = self.search.search("FullName", "Иванов")
+        self.assertIsInstance(cursor, FilterSearchCursor)
+        self.assertEqual(self.names(cursor), ["Иванов Иван Иванович"])
+        self.assertEqual(self.names(self.search.search("FullName", "иванов и")), ["Иванов Иван Иванович"])
+        self.assertEqual(self.names(self.search.search("FullName", "иван")),
+                         ["Иванов Иван Иванович", "Иваненко Олег Петрович"])
+        self.assertEqual(self.queries, [{"FullName": "ив"}])
+
+    def test_other_query_searches_repository(self):
+        self.search.search("FullName", "иван")
+        self.assertEqual(self.names(self.search.search("FullName", "петр")),
+                         ["Иваненко Олег Петрович", "Петров Пётр Петрович"])
+        self.assertEqual(self.names(self.search.search("Group", "петр")), [])
+        self.assertEqual(len(self.queries), 3)
+
+    def test_query_is_not_refined(self):
+        self.search.search("FullName", "иван")
+        query = parse_query("full_name contains иван and course > 1")
+        self.assertEqual(self.names(self.search.search_query(query)), ["Иваненко Олег Петрович"])
+        self.search.search("FullName", "иванов")
+        self.assertEqual(self.queries, [{"FullName": "иван"}, query, {"FullName": "иванов"}])
+
+    def test_equality_criteria_are_not_refined(self):
+        self.search.search("Course", "1")
+        self.assertEqual(self.names(self.search.search("Course", "12")), [])
+        self.assertEqual(len(self.queries), 2)
+
+    def test_large_results_are_not_refined(self):
+        self.search.REFINE_LIMIT = 1
+        self.search.search("FullName", "ив")
+        self.assertEqual(len(self.names(self.search.search("FullName", "иван"))), 2)
+        self.assertEqual(len(self.queries), 2)
+
+    def test_changed_repository_is_searched_again(self):
+        self.assertEqual(len(self.names(self.search.search("FullName", "ив"))), 2)
+        self.model.add_student({"FullName": "ивашов илья ильич", "Course": "1", "Group": "421701",
+                                "TotalWorks": "5", "CompletedWorks": "5", "ProgrammingLanguage": "Go"})
+        self.assertEqual(self.names(self.search.search("FullName", "ива")),
+                         ["Иванов Иван Иванович", "Иваненко Олег Петрович", "Ивашов Илья Ильич"])
+
+        self.model.delete_students({"FullName": "иваненко"})
+        self.assertEqual(self.names(self.search.search("FullName", "иван")), ["Иванов Иван Иванович"])
+        self.assertEqual(len(self.queries), 3)
+
+
+class TestIncrementalSearchColumnar(TestIncrementalSearch):
+
+    def make_repository(self, students):
+        return ColumnarStudentRepository(students)
+
+
+if __name__ == '__main__':
+    unittest.main()
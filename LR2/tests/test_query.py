@@ -0,0 +1,52 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.query import CONTAINS, And, Condition, Or, as_query, parse_query
+from model.student import Student
+
+
+class TestParseQuery(unittest.TestCase):
+
+    def test_condition(self):
+        self.assertEqual(parse_query("completed_works >= 5"), Condition("CompletedWorks", ">=", 5))
+        self.assertEqual(parse_query("ФИО содержит Иван"), Condition("FullName", CONTAINS, "иван"))
+        self.assertEqual(parse_query('language = "C++"'), Condition("ProgrammingLanguage", "=", "c++"))
+        self.assertEqual(parse_query('full_name contains "Пётр ""Петя"""'),
+                         Condition("FullName", CONTAINS, 'пётр "петя"'))
+
+    def test_and_binds_tighter_than_or(self):
+        course, group, language = (Condition("Course", "=", 1), Condition("Group", CONTAINS, "4217"),
+                                   Condition("ProgrammingLanguage", "=", "go"))
+        self.assertEqual(parse_query("course = 1 or group contains 4217 and language = go"),
+                         Or((course, And((group, language)))))
+        self.assertEqual(parse_query("(курс = 1 ИЛИ группа содержит 4217) И язык = go"),
+                         And((Or((course, group)), language)))
+
+    def test_errors(self):
+        for text in ["", "course", "course >=", "course ~ 1", "age = 20", "course = один",
+                     "full_name > а", "(course = 1", "course = 1 )", "course = 1 course = 2", "course = ("]:
+            with self.subTest(query=text), self.assertRaises(ValueError):
+                parse_query(text)
+
+
+class TestQueryMatches(unittest.TestCase):
+
+    def setUp(self):
+        self.student = Student("Иванов Иван Иванович", 2, "421701", 10, 7, "Python")
+
+    def test_matches(self):
+        self.assertTrue(parse_query("not_completed_works = 3 and language = python").matches(self.student))
+        self.assertTrue(parse_query("course > 3 or full_name contains ИВАН").matches(self.student))
+        self.assertFalse(parse_query("course != 2 or group contains 3217").matches(self.student))
+
+    def test_criteria_dictionary(self):
+        self.assertEqual(as_query({"Course": "2", "FullName": "Иван", "Unknown": "1"}),
+                         And((Condition("Course", "=", 2), Condition("FullName", CONTAINS, "иван"))))
+        self.assertTrue(as_query({}).matches(self.student))
+
+
+if __name__ == '__main__':
+    unittest.main()
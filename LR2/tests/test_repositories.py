@@ -0,0 +1,352 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.repositories import (ColumnarStudentRepository, FilterSearchCursor, InMemorySearchCursor,
+                                InMemoryStudentRepository, ListSearchCursor, ScanSearchCursor,
+                                SqliteStudentRepository, StudentChange)
+from model.query import And, Or, parse_query
+from model.student import Student
+
+
+STUDENTS = [
+    ("Иванов Иван Иванович", 1, "421701", 10, 7, "Python"),
+    ("Петров Пётр Петрович", 2, "421702", 12, 12, "Java"),
+    ("Сидорова Анна Сергеевна", 1, "321701", 8, 3, "C++"),
+    ("Иваненко Олег Петрович", 3, "121703", 10, 5, "python"),
+    ("Кузнецов Дмитрий Олегович", 4, "421701", 15, 10, "Go"),
+]
+
+
+def fields(students):
+    return [(s.full_name, s.course, s.group, s.total_works, s.completed_works, s.programming_language)
+            for s in students]
+
+
+class RepositoryContract:
+    """Проверки, которые должна проходить любая реализация StudentRepository."""
+
+    def make_repository(self, students=None):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.repository = self.make_repository([Student(*row) for row in STUDENTS])
+
+    def test_get_all_students_keeps_insertion_order(self):
+        self.assertEqual(fields(self.repository.get_all_students()), STUDENTS)
+        self.assertEqual(self.repository.get_total_students(), 5)
+
+    def test_add_student(self):
+        self.repository.add_student(Student("Орлова Мария Ивановна", 2, "521702", 6, 6, "C#"))
+        self.assertEqual(self.repository.get_total_students(), 6)
+        self.assertEqual(fields(self.repository.get_all_students())[-1],
+                         ("Орлова Мария Ивановна", 2, "521702", 6, 6, "C#"))
+
+    def test_add_same_student_twice(self):
+        student = Student("Орлова Мария Ивановна", 2, "521702", 6, 6, "C#")
+        self.repository.add_student(student)
+        self.repository.search_students({"Course": "1"})
+        self.repository.add_student(student)
+        self.assertEqual(self.repository.get_total_students(), 7)
+        self.assertEqual(len(self.repository.get_all_students()), 7)
+        self.assertEqual(len(self.repository.search_students({"FullName": "орлова"})), 2)
+        self.assertEqual(fields(self.repository.get_students_range(5, 5)), [fields([student])[0]] * 2)
+        self.assertEqual(self.repository.delete_students({"FullName": "орлова"}), 2)
+        self.assertEqual(self.repository.get_total_students(), 5)
+
+        self.repository.replace_all([student, student])
+        self.assertEqual(self.repository.get_total_students(), 2)
+        self.assertEqual(len(self.repository.search_students({"Course": "2"})), 2)
+
+    def test_search_by_equality(self):
+        self.assertEqual(fields(self.repository.search_students({"Course": "1"})), [STUDENTS[0], STUDENTS[2]])
+        self.assertEqual(fields(self.repository.search_students({"TotalWorks": "10"})), [STUDENTS[0], STUDENTS[3]])
+        self.assertEqual(fields(self.repository.search_students({"NotCompletedWorks": "0"})), [STUDENTS[1]])
+
+    def test_search_by_substring_ignores_case(self):
+        self.assertEqual(fields(self.repository.search_students({"FullName": "иван"})), [STUDENTS[0], STUDENTS[3]])
+        self.assertEqual(fields(self.repository.search_students({"FullName": "ПЕТРОВИЧ"})),
+                         [STUDENTS[1], STUDENTS[3]])
+        self.assertEqual(fields(self.repository.search_students({"Group": "4217"})),
+                         [STUDENTS[0], STUDENTS[1], STUDENTS[4]])
+        self.assertEqual(fields(self.repository.search_students({"ProgrammingLanguage": "PYTHON"})),
+                         [STUDENTS[0], STUDENTS[3]])
+        self.assertEqual(fields(self.repository.search_students({"Group": "1"})), STUDENTS)
+        self.assertEqual(self.repository.search_students({"FullName": "нет такого"}), [])
+
+    def test_search_by_several_criteria(self):
+        self.assertEqual(fields(self.repository.search_students({"Group": "421701", "Course": "4"})), [STUDENTS[4]])
+        self.assertEqual(self.repository.search_students({"FullName": "Иван", "Course": "2"}), [])
+
+    def test_search_without_criteria_returns_everyone(self):
+        self.assertEqual(fields(self.repository.search_students({})), STUDENTS)
+
+    def test_search_by_query(self):
+        queries = [
+            "completed_works >= 5",
+            "course = 1 and completed_works > 5",
+            "course = 4 or language contains python",
+            "(course < 2 or course >= 3) and full_name contains иван",
+            "not_completed_works <= 2 and group != 421701",
+            'language = "PYTHON" or full_name = "петров пётр петрович"',
+            "total_works != 10 and (language contains java or course > 3) and completed_works < 12",
+            "group contains 4217 and group contains 701",
+            "course > 4",
+        ]
+        students = [Student(*row) for row in STUDENTS]
+        for text in queries:
+            with self.subTest(query=text):
+                query = parse_query(text)
+                expected = fields([student for student in students if query.matches(student)])
+                self.assertEqual(fields(self.repository.search_students(query)), expected)
+                cursor = self.repository.search_cursor(query)
+                self.assertEqual(cursor.count(), len(expected))
+                self.assertEqual(fields(cursor.get_range(0, len(STUDENTS))), expected)
+
+    def test_search_by_empty_query(self):
+        self.assertEqual(fields(self.repository.search_students(And(()))), STUDENTS)
+        self.assertEqual(self.repository.search_students(Or(())), [])
+        self.assertEqual(self.repository.search_cursor(Or(())).count(), 0)
+        self.assertEqual(fields(self.repository.search_students(Or((parse_query("course = 4"), Or(()))))),
+                         [STUDENTS[4]])
+        self.assertEqual(self.repository.delete_students(Or(())), 0)
+
+    def test_delete_by_query(self):
+        self.assertEqual(self.repository.delete_students(parse_query("course = 4 or completed_works < 5")), 2)
+        self.assertEqual(fields(self.repository.get_all_students()), [STUDENTS[0], STUDENTS[1], STUDENTS[3]])
+
+    def test_delete_students(self):
+        self.assertEqual(self.repository.delete_students({"Course": "1"}), 2)
+        self.assertEqual(self.repository.delete_students({"Course": "1"}), 0)
+        self.assertEqual(fields(self.repository.get_all_students()), [STUDENTS[1], STUDENTS[3], STUDENTS[4]])
+        self.assertEqual(self.repository.get_total_students(), 3)
+        self.assertEqual(self.repository.search_students({"FullName": "иванов"}), [])
+
+    def test_pagination(self):
+        self.assertEqual(fields(self.repository.get_paginated_students(1, 2)), STUDENTS[0:2])
+        self.assertEqual(fields(self.repository.get_paginated_students(2, 2)), STUDENTS[2:4])
+        self.assertEqual(fields(self.repository.get_paginated_students(3, 2)), STUDENTS[4:])
+        self.assertEqual(self.repository.get_paginated_students(4, 2), [])
+        self.assertEqual(fields(self.repository.get_paginated_students(2, 3)), STUDENTS[3:])
+
+    def test_pagination_after_delete(self):
+        self.repository.get_paginated_students(1, 2)
+        self.repository.delete_students({"FullName": "Петров Пётр"})
+        self.assertEqual(fields(self.repository.get_paginated_students(2, 2)), [STUDENTS[3], STUDENTS[4]])
+        self.repository.add_student(Student("Орлова Мария Ивановна", 2, "521702", 6, 6, "C#"))
+        self.assertEqual(fields(self.repository.get_paginated_students(3, 2)),
+                         [("Орлова Мария Ивановна", 2, "521702", 6, 6, "C#")])
+
+    def test_students_range(self):
+        self.assertEqual(fields(self.repository.get_students_range(1, 3)), STUDENTS[1:4])
+        self.assertEqual(fields(self.repository.get_students_range(4, 3)), STUDENTS[4:])
+        self.assertEqual(fields(self.repository.get_students_range(0, 10)), STUDENTS)
+        self.assertEqual(self.repository.get_students_range(5, 3), [])
+        self.assertEqual(self.repository.get_students_range(2, 0), [])
+
+    def test_students_range_after_delete(self):
+        self.repository.get_students_range(0, 2)
+        self.repository.delete_students({"FullName": "Петров Пётр"})
+        self.assertEqual(fields(self.repository.get_students_range(2, 2)), [STUDENTS[3], STUDENTS[4]])
+
+    def test_search_cursor(self):
+        cursor = self.repository.search_cursor({"FullName": "иван"})
+        self.assertEqual(cursor.count(), 2)
+        self.assertEqual(fields(cursor.get_range(0, 1)), [STUDENTS[0]])
+        self.assertEqual(fields(cursor.get_range(1, 5)), [STUDENTS[3]])
+        self.assertEqual(cursor.get_range(2, 5), [])
+
+        cursor = self.repository.search_cursor({})
+        self.assertEqual(cursor.count(), len(STUDENTS))
+        self.assertEqual(fields(cursor.get_range(0, 2) + cursor.get_range(2, 2) + cursor.get_range(4, 2)), STUDENTS)
+        self.assertEqual(fields(cursor.get_range(3, 1)), [STUDENTS[3]])
+
+    def test_changes_are_reported(self):
+        changes = []
+        self.repository.subscribe(changes.append)
+        self.repository.add_student(Student("Орлова Мария Ивановна", 2, "521702", 6, 6, "C#"))
+        self.repository.delete_students({"Course": "1"})
+        self.repository.delete_students({"Course": "5"})
+        self.repository.replace_all([])
+        self.assertEqual(changes, [
+            StudentChange(StudentChange.INSERTED, (5,)),
+            StudentChange(StudentChange.REMOVED, (0, 2)),
+            StudentChange(StudentChange.RESET),
+        ])
+
+    def test_removed_positions_skip_earlier_deletions(self):
+        self.repository.delete_students({"FullName": "Петров Пётр"})
+        changes = []
+        self.repository.subscribe(changes.append)
+        self.repository.delete_students({"Group": "421701"})
+        self.assertEqual(changes, [StudentChange(StudentChange.REMOVED, (0, 3))])
+        self.repository.unsubscribe(changes.append)
+        self.repository.clear()
+        self.assertEqual(len(changes), 1)
+
+    def test_get_unique_values(self):
+        self.assertEqual(self.repository.get_unique_values("Язык программирования"),
+                         ["C++", "Go", "Java", "Python", "python"])
+        self.assertEqual(self.repository.get_unique_values("Общее число работ"), [8, 10, 12, 15])
+        self.assertEqual(self.repository.get_unique_values("Количество выполненных работ"), [3, 5, 7, 10, 12])
+        self.assertEqual(self.repository.get_unique_values("Неизвестное поле"), [])
+
+        self.repository.delete_students({"ProgrammingLanguage": "java"})
+        self.assertEqual(self.repository.get_unique_values("Общее число работ"), [8, 10, 15])
+
+    def test_replace_all(self):
+        self.repository.get_paginated_students(1, 2)
+        self.repository.replace_all([Student(*STUDENTS[4]), Student(*STUDENTS[1])])
+        self.assertEqual(fields(self.repository.get_all_students()), [STUDENTS[4], STUDENTS[1]])
+        self.assertEqual(fields(self.repository.get_paginated_students(2, 1)), [STUDENTS[1]])
+        self.assertEqual(fields(self.repository.search_students({"Course": "2"})), [STUDENTS[1]])
+        self.assertEqual(self.repository.get_unique_values("Язык программирования"), ["Go", "Java"])
+
+    def test_clear(self):
+        self.repository.clear()
+        self.assertEqual(self.repository.get_total_students(), 0)
+        self.assertEqual(self.repository.get_all_students(), [])
+        self.assertEqual(self.repository.get_unique_values("Язык программирования"), [])
+        self.repository.add_student(Student(*STUDENTS[0]))
+        self.assertEqual(fields(self.repository.search_students({"FullName": "иван"})), [STUDENTS[0]])
+
+
+class TestScanSearchCursor(unittest.TestCase):
+
+    def setUp(self):
+        self.cursor = ScanSearchCursor(100, [lambda row: row % 3 == 0], lambda row: row)
+        self.cursor.CHECKPOINT_STRIDE = 4
+
+    def test_count(self):
+        self.assertEqual(self.cursor.count(), 34)
+
+    def test_get_range_from_checkpoints(self):
+        for offset in range(0, 40, 3):
+            self.assertEqual(self.cursor.get_range(offset, 5), list(range(0, 100, 3))[offset:offset + 5])
+        self.assertEqual(self.cursor.get_range(-2, 2), [0, 3])
+        self.assertEqual(self.cursor.get_range(5, 0), [])
+
+
+class TestFilterSearchCursor(unittest.TestCase):
+
+    def setUp(self):
+        self.cursor = FilterSearchCursor(ListSearchCursor(list(range(100))), lambda row: row % 3 == 0)
+        self.cursor.CHECKPOINT_STRIDE = 4
+        self.cursor.CHUNK_SIZE = 7
+
+    def test_count(self):
+        self.assertEqual(self.cursor.count(), 34)
+
+    def test_get_range_from_checkpoints(self):
+        for offset in range(0, 40, 3):
+            self.assertEqual(self.cursor.get_range(offset, 5), list(range(0, 100, 3))[offset:offset + 5])
+        self.assertEqual(self.cursor.get_range(-2, 2), [0, 3])
+        self.assertEqual(self.cursor.get_range(5, 0), [])
+
+
+class TestInMemoryStudentRepository(RepositoryContract, unittest.TestCase):
+
+    def make_repository(self, students=None):
+        return InMemoryStudentRepository(students)
+
+
+    def test_query_plans_agree_with_scan(self):
+        # На большом наборе планировщик пересекает списки индексов и объединяет их
+        students = [Student(f"Студент{i} Фамилия{i % 97}", i % 4 + 1, str(100000 + i % 1000), 20, i % 21,
+                            ("Python", "Java", "Go")[i % 3]) for i in range(3000)]
+        repository = self.make_repository(students)
+        queries = [
+            "course = 2 and completed_works >= 18",
+            "full_name contains фамилия1 and course != 3",
+            "group = 100007 and language = go",
+            "completed_works < 2 or group contains 10099",
+            "(course = 1 or course = 2) and completed_works = 20 and language != java",
+        ]
+        for text in queries:
+            with self.subTest(query=text):
+                query = parse_query(text)
+                self.assertEqual(repository.search_students(query),
+                                 [student for student in students if query.matches(student)])
+
+    def test_broad_search_cursor_scans_slots(self):
+        students = [Student(f"Студент{i}", i % 4 + 1, "421701", 20, i % 21, "Python") for i in range(1000)]
+        repository = self.make_repository(students)
+        repository.CURSOR_LIST_LIMIT = 100
+        self.assertIsInstance(repository.search_cursor({"CompletedWorks": "3"}), ListSearchCursor)
+
+        cursor = repository.search_cursor(parse_query("course != 1"))
+        self.assertIsInstance(cursor, InMemorySearchCursor)
+        expected = [student for student in students if student.course != 1]
+        self.assertEqual(cursor.count(), len(expected))
+        self.assertEqual(cursor.get_range(300, 20), expected[300:320])
+
+        # Курсор видит удаление и уплотнение хранилища
+        repository.delete_students(parse_query("course = 2 or completed_works < 15"))
+        expected = repository.search_students(parse_query("course != 1"))
+        self.assertEqual(cursor.count(), len(expected))
+        self.assertEqual(cursor.get_range(100, 20), expected[100:120])
+
+
+class TestColumnarStudentRepository(RepositoryContract, unittest.TestCase):
+
+    def make_repository(self, students=None):
+        return ColumnarStudentRepository(students)
+
+    def test_rows_survive_delete(self):
+        rows = self.repository.get_paginated_students(1, 2)
+        self.repository.delete_students({"Course": "1"})
+        self.assertEqual(fields(rows), STUDENTS[0:2])
+        self.assertEqual(rows[0].not_completed_works, 3)
+        self.assertEqual(str(rows[1]), str(Student(*STUDENTS[1])))
+
+    def test_large_values_widen_columns(self):
+        long_name = "Иванов " * 6000 + "Иван Иванович"
+        self.repository.add_student(Student(long_name, 300, "421701", 70000, -1, "Go"))
+        self.repository.add_student(Student(*STUDENTS[0]))
+        rows = self.repository.get_students_range(5, 2)
+        self.assertEqual(fields(rows), [(long_name, 300, "421701", 70000, -1, "Go"), STUDENTS[0]])
+        self.assertEqual(len(self.repository.search_students({"TotalWorks": "70000"})), 1)
+
+    def test_rows_across_string_blocks(self):
+        students = [Student(f"Студент{row} Иван Иванович", 1, str(row), 10, 5, "Go") for row in range(600)]
+        repository = self.make_repository(students)
+        self.assertEqual([row.group for row in repository.get_students_range(250, 10)],
+                         [str(row) for row in range(250, 260)])
+        repository.delete_students({"Group": "5"})
+        groups = [str(row) for row in range(600) if "5" not in str(row)]
+        self.assertEqual([row.group for row in repository.get_all_students()], groups)
+        self.assertEqual(repository.get_students_range(300, 1)[0].group, groups[300])
+
+
+class TestSqliteStudentRepository(RepositoryContract, unittest.TestCase):
+
+    def make_repository(self, students=None):
+        return SqliteStudentRepository(students=students)
+
+    def tearDown(self):
+        self.repository.close()
+
+    def test_replace_all_keeps_students_on_error(self):
+        with self.assertRaises(AttributeError):
+            self.repository.replace_all([Student(*STUDENTS[0]), Student(None, 1, "421701", 1, 1, "Go")])
+        self.assertEqual(fields(self.repository.get_all_students()), STUDENTS)
+        self.assertEqual(fields(self.repository.search_students({"FullName": "олегович"})), [STUDENTS[4]])
+
+    def test_data_persists_in_file(self):
+        path = "test_students.db"
+        try:
+            repository = SqliteStudentRepository(path, [Student(*row) for row in STUDENTS])
+            repository.close()
+            repository = SqliteStudentRepository(path)
+            self.assertEqual(fields(repository.get_all_students()), STUDENTS)
+            self.assertEqual(fields(repository.search_students({"FullName": "олегович"})), [STUDENTS[4]])
+            repository.close()
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
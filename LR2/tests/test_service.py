@@ -0,0 +1,153 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+from xml.parsers import expat
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.repositories import InMemoryStudentRepository
+from model.service import StudentModel
+from model.student import Student
+from model.student_handler import DomHandler, SaxHandler
+from model.validators import BasicStudentValidator
+
+
+def fields(students):
+    return [(s.full_name, s.course, s.group, s.total_works, s.completed_works, s.programming_language)
+            for s in students]
+
+
+class TestStudentModelLoad(unittest.TestCase):
+
+    def setUp(self):
+        self.path = "test_students.xml"
+        self.repository = InMemoryStudentRepository([Student("Иванов Иван Иванович", 1, "421701", 10, 7, "Python")])
+        self.model = StudentModel(self.repository, BasicStudentValidator())
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def write(self, students):
+        DomHandler().write_students_to_file(students, self.path)
+
+    def test_load_replaces_students(self):
+        students = [Student("Петров Пётр Петрович", 2, "421702", 12, 12, "Java"),
+                    Student("сидорова анна сергеевна", 1, "321701", 8, 3, "C++")]
+        self.write(students)
+        self.model.load_from_file(self.path)
+        self.assertEqual(fields(self.repository.get_all_students()), [
+            ("Петров Пётр Петрович", 2, "421702", 12, 12, "Java"),
+            ("Сидорова Анна Сергеевна", 1, "321701", 8, 3, "C++"),
+        ])
+        self.assertEqual(fields(self.repository.search_students({"FullName": "анна"})),
+                         [("Сидорова Анна Сергеевна", 1, "321701", 8, 3, "C++")])
+
+    def test_load_large_file(self):
+        # Текст элементов на границах блоков парсера приходит частями
+        students = [Student(f"Иванов Иван {'Иванович' + 'а' * (index % 7)}", index % 4 + 1, str(100000 + index),
+                            index % 20 + 10, index % 10, "Python") for index in range(5000)]
+        self.write(students)
+        self.model.load_from_file(self.path)
+        self.assertEqual(fields(self.repository.get_all_students()), fields(students))
+
+    def test_load_in_small_blocks(self):
+        # Студенты и многобайтовые символы разрезаются границами блоков
+        students = [Student(f"Иванов Иван {'Иванович' + 'а' * (index % 7)}", index % 4 + 1, f"A&B <{index}>",
+                            index % 20 + 10, index % 10, 'C "sharp"') for index in range(300)]
+        self.write(students)
+        with patch.object(SaxHandler, "CHUNK_SIZE", 97), \
+                patch.object(SaxHandler, "_parse_expat", side_effect=AssertionError) as parse_expat:
+            self.model.load_from_file(self.path)
+        parse_expat.assert_not_called()
+        self.assertEqual(fields(self.repository.get_all_students()), fields(students))
+
+    def test_other_layout_is_parsed_by_expat(self):
+        expected = [("Петров Пётр Петрович", 2, "A1", 12, 12, "Java"), ("Сидорова Анна Сергеевна", 1, "B", 8, 3, "Go")]
+        layouts = [
+            "<Students><Student><FullName>петров пётр петрович</FullName><Course>2</Course><Group>&#65;1</Group>"
+            "<TotalWorks>12</TotalWorks><CompletedWorks>12</CompletedWorks><ProgrammingLanguage>Java"
+            "</ProgrammingLanguage></Student><Student><ProgrammingLanguage>Go</ProgrammingLanguage>"
+            "<FullName>Сидорова Анна Сергеевна</FullName><Course> 1 </Course><Group>B</Group>"
+            "<TotalWorks>8</TotalWorks><CompletedWorks>3</CompletedWorks></Student></Students>",
+        ]
+        # Разметка DomHandler, которая ломается в середине файла
+        self.write([Student("петров пётр петрович", 2, "A1", 12, 12, "Java")])
+        with open(self.path, encoding="utf-8") as file:
+            layouts.append(file.read().replace("</Students>", "  <Student>\n    <FullName>Сидорова Анна Сергеевна"
+                                               "</FullName>\n    <Course>1</Course><Group>B</Group>"
+                                               "<TotalWorks>8</TotalWorks><CompletedWorks>3</CompletedWorks>"
+                                               "<ProgrammingLanguage>Go</ProgrammingLanguage></Student></Students>"))
+        for layout in layouts:
+            with self.subTest(layout=layout):
+                with open(self.path, "w", encoding="utf-8") as file:
+                    file.write(layout)
+                self.model.load_from_file(self.path)
+                self.assertEqual(fields(self.repository.get_all_students()), expected)
+
+    def test_malformed_file_keeps_repository(self):
+        self.write([Student("Петров Пётр Петрович", 2, "421702", 12, 12, "Java")])
+        with open(self.path, encoding="utf-8") as file:
+            text = file.read()
+        for malformed in (text.replace("421702", "42&1702"), text.replace("421702", "]]>"), text[:-5]):
+            with self.subTest(malformed=malformed):
+                with open(self.path, "w", encoding="utf-8") as file:
+                    file.write(malformed)
+                with self.assertRaises(expat.ExpatError):
+                    self.model.load_from_file(self.path)
+        self.assertEqual(fields(self.repository.get_all_students()),
+                         [("Иванов Иван Иванович", 1, "421701", 10, 7, "Python")])
+
+    def test_invalid_student_keeps_repository(self):
+        self.write([Student("Петров Пётр Петрович", 2, "421702", 12, 12, "Java"),
+                    Student("Петров Пётр Петрович", 5, "421702", 12, 12, "Java")])
+        with self.assertRaisesRegex(ValueError, "Студент №2: Курс должен быть от 1 до 4"):
+            self.model.load_from_file(self.path)
+        self.write([Student("Петров Пётр Петрович", 2, "421702", 12, 12, "Java"),
+                    Student("Петров Пётр", 2, "421702", 12, 12, "Java"),
+                    Student("Петров Пётр Петрович", 2, "421702", 12, 13, "Java")])
+        with self.assertRaisesRegex(ValueError, "Студент №2: ФИО должно содержать ровно 3 слова"):
+            self.model.load_from_file(self.path)
+        self.assertEqual(fields(self.repository.get_all_students()),
+                         [("Иванов Иван Иванович", 1, "421701", 10, 7, "Python")])
+
+    def test_missing_and_malformed_fields(self):
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write("<Students><Student><FullName>Петров Пётр Петрович</FullName><Course>2</Course>"
+                       "<TotalWorks>3</TotalWorks><CompletedWorks>1</CompletedWorks>"
+                       "<ProgrammingLanguage>Go</ProgrammingLanguage></Student></Students>")
+        with self.assertRaisesRegex(ValueError, "Студент №1: Отсутствует обязательное поле: Group"):
+            self.model.load_from_file(self.path)
+
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write("<Students><Student><FullName>Петров Пётр Петрович</FullName><Course>два</Course>"
+                       "</Student></Students>")
+        with self.assertRaisesRegex(ValueError, "поле Course должно быть целым числом"):
+            self.model.load_from_file(self.path)
+        self.assertEqual(self.repository.get_total_students(), 1)
+
+
+    def test_save_and_load_round_trip(self):
+        self.repository.add_student(Student("Петров Пётр Петрович", 2, "A&B <1>", 12, 12, 'C "sharp"'))
+        self.model.save_to_file(self.path)
+        with open(self.path, encoding="utf-8") as file:
+            self.assertEqual(file.read(), (
+                '<?xml version="1.0" ?>\n<Students>\n'
+                '  <Student>\n    <FullName>Иванов Иван Иванович</FullName>\n    <Course>1</Course>\n'
+                '    <Group>421701</Group>\n    <TotalWorks>10</TotalWorks>\n    <CompletedWorks>7</CompletedWorks>\n'
+                '    <ProgrammingLanguage>Python</ProgrammingLanguage>\n  </Student>\n'
+                '  <Student>\n    <FullName>Петров Пётр Петрович</FullName>\n    <Course>2</Course>\n'
+                '    <Group>A&amp;B &lt;1&gt;</Group>\n    <TotalWorks>12</TotalWorks>\n    <CompletedWorks>12</CompletedWorks>\n'
+                '    <ProgrammingLanguage>C &quot;sharp&quot;</ProgrammingLanguage>\n  </Student>\n'
+                '</Students>\n'
+            ))
+
+        saved = fields(self.repository.get_all_students())
+        self.repository.clear()
+        self.model.load_from_file(self.path)
+        self.assertEqual(fields(self.repository.get_all_students()), saved)
+
+
+if __name__ == '__main__':
+    unittest.main()
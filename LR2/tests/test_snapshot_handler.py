@@ -0,0 +1,84 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.repositories import InMemoryStudentRepository
+from model.service import StudentModel
+from model.snapshot_handler import SnapshotHandler, snapshot_to_xml, xml_to_snapshot
+from model.student import Student
+from model.student_handler import DomHandler
+from model.validators import BasicStudentValidator
+
+
+STUDENTS = [
+    ("Иванов Иван Иванович", 1, "421701", 10, 7, "Python"),
+    ("Петров Пётр Петрович", 2, "007", 2 ** 40, 0, "C# & \"F#\""),
+    ("Иванов Иван Иванович", 1, "421701", 10, 7, "Python"),
+    ("Zoë Ünal Ærø", 4, "", 0, 0, "日本語"),
+]
+
+
+def fields(students):
+    return [(s.full_name, s.course, s.group, s.total_works, s.completed_works, s.programming_language)
+            for s in students]
+
+
+class TestSnapshotHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.snapshot_path = "test_students.students"
+        self.xml_path = "test_students.xml"
+        self.handler = SnapshotHandler()
+
+    def tearDown(self):
+        for path in (self.snapshot_path, self.xml_path, self.xml_path + ".copy"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_round_trip(self):
+        self.handler.write_students_to_file([Student(*row) for row in STUDENTS], self.snapshot_path)
+        self.assertEqual(fields(self.handler.read_students_from_file(self.snapshot_path)), STUDENTS)
+
+    def test_empty_snapshot(self):
+        self.handler.write_students_to_file([], self.snapshot_path)
+        self.assertEqual(self.handler.read_students_from_file(self.snapshot_path), [])
+
+    def test_invalid_files(self):
+        with open(self.snapshot_path, "wb") as file:
+            file.write(b"<Students/>")
+        with self.assertRaisesRegex(ValueError, "не является снимком"):
+            self.handler.read_students_from_file(self.snapshot_path)
+
+        self.handler.write_students_to_file([Student(*row) for row in STUDENTS], self.snapshot_path)
+        with open(self.snapshot_path, "rb") as file:
+            data = file.read()
+        with open(self.snapshot_path, "wb") as file:
+            file.write(data[:-3])
+        with self.assertRaisesRegex(ValueError, "повреждён"):
+            self.handler.read_students_from_file(self.snapshot_path)
+
+    def test_xml_conversion_is_lossless(self):
+        DomHandler().write_students_to_file([Student(*row) for row in STUDENTS], self.xml_path)
+        xml_to_snapshot(self.xml_path, self.snapshot_path)
+        self.assertEqual(fields(self.handler.read_students_from_file(self.snapshot_path)), STUDENTS)
+
+        snapshot_to_xml(self.snapshot_path, self.xml_path + ".copy")
+        with open(self.xml_path, "rb") as original, open(self.xml_path + ".copy", "rb") as copy:
+            self.assertEqual(copy.read(), original.read())
+
+    def test_model_validates_snapshot(self):
+        model = StudentModel(InMemoryStudentRepository(), BasicStudentValidator())
+        self.handler.write_students_to_file([Student(*STUDENTS[0])], self.snapshot_path)
+        model.load_snapshot(self.snapshot_path)
+        self.assertEqual(fields(model.search_students({})), [STUDENTS[0]])
+
+        self.handler.write_students_to_file([Student(*STUDENTS[0]), Student(*STUDENTS[3])], self.snapshot_path)
+        with self.assertRaisesRegex(ValueError, "Студент №2"):
+            model.load_snapshot(self.snapshot_path)
+        self.assertEqual(model.get_total_students(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
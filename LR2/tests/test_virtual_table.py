@@ -0,0 +1,77 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from view.virtual_table import RowCache, RowSelection
+
+
+class TestRowCache(unittest.TestCase):
+    def setUp(self):
+        self.rows = list(range(25))
+        self.requests = []
+        self.cache = RowCache(self.fetch, window_size=10, max_windows=2)
+
+    def fetch(self, offset, count):
+        self.requests.append((offset, count))
+        return self.rows[offset:offset + count]
+
+    def test_get_spans_windows(self):
+        self.assertEqual(self.cache.get(8, 5), [8, 9, 10, 11, 12])
+        self.assertEqual(self.requests, [(0, 10), (10, 10)])
+
+    def test_get_stops_at_end_of_source(self):
+        self.assertEqual(self.cache.get(22, 10), [22, 23, 24])
+        self.assertEqual(self.cache.get(30, 5), [])
+
+    def test_windows_are_reused(self):
+        self.cache.get(0, 5)
+        self.cache.get(3, 5)
+        self.assertEqual(self.requests, [(0, 10)])
+
+    def test_least_recently_used_window_is_evicted(self):
+        self.cache.get(0, 1)
+        self.cache.get(10, 1)
+        self.cache.get(0, 1)
+        self.cache.get(20, 1)
+        self.cache.get(0, 1)
+        self.assertEqual(self.requests, [(0, 10), (10, 10), (20, 10)])
+        self.cache.get(10, 1)
+        self.assertEqual(self.requests[-1], (10, 10))
+
+    def test_invalidate_from_keeps_earlier_windows(self):
+        self.cache.get(5, 10)
+        self.cache.invalidate_from(12)
+        self.cache.get(5, 10)
+        self.assertEqual(self.requests, [(0, 10), (10, 10), (10, 10)])
+
+    def test_clear_fetches_rows_again(self):
+        self.cache.get(0, 5)
+        self.rows[0] = "изменено"
+        self.cache.clear()
+        self.assertEqual(self.cache.get(0, 1), ["изменено"])
+
+
+class TestRowSelection(unittest.TestCase):
+    def setUp(self):
+        self.selection = RowSelection()
+
+    def test_selection_outside_visible_rows_is_kept(self):
+        self.selection.update(0, 10, [2, 5])
+        self.selection.update(20, 10, [21])
+        self.assertEqual(self.selection.rows(), [2, 5, 21])
+        self.assertEqual(self.selection.visible(4, 10), [5])
+
+        # Снятие выделения среди видимых строк не трогает остальные
+        self.selection.update(0, 10, [5])
+        self.assertEqual(self.selection.rows(), [5, 21])
+
+    def test_invalidate_from(self):
+        self.selection.update(0, 30, [3, 15, 29])
+        self.selection.invalidate_from(15)
+        self.assertEqual(self.selection.rows(), [3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,8 +3,11 @@ import tkinter as tk
 from tkinter import messagebox, ttk
 from typing import List, Callable, Dict
 
+from model.query import parse_query
+from model.repositories import ListSearchCursor
 from model.student import Student
 from view.pagination import PaginatedView
+from view.virtual_table import VirtualTable, student_values
 
 
 class StudentDialog(ABC):
@@ -33,10 +36,30 @@ class StudentDialog(ABC):
         messagebox.showerror("Ошибка", error, parent=self._dialog)
 
 class StudentSearchDialog(StudentDialog, PaginatedView):
+    # Поиск по мере ввода начинается, когда значение не меняется столько мс
+    LIVE_SEARCH_DELAY = 300
+    
+    _CRITERIA_MAP = {
+        "ФИО": "FullName",
+        "Курс": "Course",
+        "Группа": "Group",
+        "Язык программирования": "ProgrammingLanguage",
+        "Общее число работ": "TotalWorks",
+        "Количество выполненных работ": "CompletedWorks",
+        "Количество не выполненных работ": "NotCompletedWorks"
+    }
+    
     def __init__(self, parent, controller):
         StudentDialog.__init__(self, parent, controller, "Поиск студентов")
         PaginatedView.__init__(self)
-        self._search_results = []
+        # Результаты читаются из курсора постранично, а не хранятся списком
+        self._search_results = ListSearchCursor([])
+        # Значения, из которых выбирается значение критерия (None — значение вводится)
+        self._value_options = None
+        self._live_search = None
+        self._live_search_id = None
+        # Поиск запущен кнопкой «Найти»: об ошибке и пустом результате сообщается
+        self._explicit_search = False
     
     def _create_widgets(self) -> None:
         self._dialog.geometry("1200x500")
@@ -48,13 +71,16 @@ class StudentSearchDialog(StudentDialog, PaginatedView):
         columns = ("FullName", "Course", "Group", "TotalWorks", "CompletedWorks", "ProgrammingLanguage")
         headings = ("ФИО", "Курс", "Группа", "Общее число работ", "Количество выполненных работ", "Язык программирования")
         
-        self._table = ttk.Treeview(self._dialog, columns=columns, show="headings")
-        for col, heading in zip(columns, headings):
-            self._table.heading(col, text=heading)
+        self._table = VirtualTable(self._dialog, columns, headings, student_values)
+        for col in columns:
             self._table.column(col, width=100)
         self._table.pack(fill='both', expand=True, padx=10, pady=5)
 
         self._create_pagination_controls(self._dialog)
+        
+        self._live_search = self._controller.create_live_search(self._show_results, self._on_search_error)
+        self._search_value_var.trace_add("write", self._on_value_changed)
+        self._dialog.bind("<Destroy>", self._on_destroy)
     
     def _create_search_controls(self, parent) -> None:
         criteria_frame = ttk.Frame(parent)
@@ -78,6 +104,16 @@ class StudentSearchDialog(StudentDialog, PaginatedView):
         self._on_criteria_select()
         
         tk.Button(parent, text="Найти", command=self._perform_search).pack(fill='x', pady=10)
+        
+        query_frame = ttk.Frame(parent)
+        query_frame.pack(fill='x', pady=5)
+        
+        # Составной запрос, например: course = 2 and completed_works >= 5
+        tk.Label(query_frame, text="Запрос:").pack(side='left', padx=(0, 10))
+        self._query_entry = ttk.Entry(query_frame)
+        self._query_entry.pack(side='left', fill='x', expand=True)
+        self._query_entry.bind("<Return>", lambda event: self._perform_query_search())
+        tk.Button(query_frame, text="Найти по запросу", command=self._perform_query_search).pack(side='left', padx=(10, 0))
     
     def _on_criteria_select(self, event=None) -> None:
         selected_criteria = self._search_criteria.get()
@@ -92,6 +128,7 @@ class StudentSearchDialog(StudentDialog, PaginatedView):
             label.pack(side='left', padx=(0, 10))
             
             options = self._controller.get_unique_values(selected_criteria)
+            self._value_options = [str(option) for option in options]
             
             self._search_value_widget = ttk.Combobox(
                 self._value_frame, width=40, values=options, 
@@ -102,23 +139,57 @@ class StudentSearchDialog(StudentDialog, PaginatedView):
         else:
             label = ttk.Label(self._value_frame, text=f"Введите {selected_criteria.lower()}:")
             label.pack(side='left', padx=(0, 10))
+            self._value_options = None
             
             self._search_value_widget = ttk.Entry(
                 self._value_frame, width=40, textvariable=self._search_value_var
             )
             self._search_value_widget.pack(side='left', fill='x', expand=True)
     
-    def _perform_search(self) -> None:
-        criteria_map = {
-            "ФИО": "FullName",
-            "Курс": "Course",
-            "Группа": "Group",
-            "Язык программирования": "ProgrammingLanguage",
-            "Общее число работ": "TotalWorks",
-            "Количество выполненных работ": "CompletedWorks",
-            "Количество не выполненных работ": "NotCompletedWorks"
-        }
+    def _on_value_changed(self, *args) -> None:
+        # Пока значение меняется чаще, чем раз в LIVE_SEARCH_DELAY мс, поиск откладывается
+        self._cancel_live_search_timer()
+        self._live_search_id = self._dialog.after(self.LIVE_SEARCH_DELAY, self._start_live_search)
+    
+    def _cancel_live_search_timer(self) -> None:
+        if self._live_search_id is not None:
+            self._dialog.after_cancel(self._live_search_id)
+            self._live_search_id = None
+    
+    def _start_live_search(self) -> None:
+        self._live_search_id = None
+        key = self._CRITERIA_MAP.get(self._search_criteria.get())
+        value = self._search_value_var.get()
+        if key is None or not value.strip() or (self._value_options is not None and value not in self._value_options):
+            # Значение не введено или ещё не выбрано из списка
+            self._live_search.discard()
+            self._show_results(ListSearchCursor([]))
+            return
+        self._explicit_search = False
+        self._live_search.search(key, value)
+    
+    def _show_results(self, results) -> None:
+        self._search_results = results
+        self._current_page = 1
+        self.update_view()
         
+        if self._explicit_search and not self._total_items:
+            self._show_message("Студенты с указанными критериями не найдены")
+        self._explicit_search = False
+    
+    def _on_search_error(self, error: Exception) -> None:
+        # Ошибка во время ввода (например, курс ещё не число) означает, что найти нечего
+        explicit_search, self._explicit_search = self._explicit_search, False
+        self._show_results(ListSearchCursor([]))
+        if explicit_search:
+            self._show_error(f"Ошибка поиска: {error}")
+    
+    def _on_destroy(self, event) -> None:
+        if event.widget is self._dialog:
+            self._cancel_live_search_timer()
+            self._live_search.close()
+    
+    def _perform_search(self) -> None:
         criteria = self._search_criteria.get()
         value = self._search_value_var.get()
         
@@ -126,37 +197,35 @@ class StudentSearchDialog(StudentDialog, PaginatedView):
             self._show_error("Заполните все поля!")
             return
         
+        if criteria not in self._CRITERIA_MAP:
+            self._show_error(f"Ошибка поиска: Неизвестный критерий поиска: {criteria}")
+            return
+        
+        # Поиск выполняется сразу, не дожидаясь паузы во вводе
+        self._cancel_live_search_timer()
+        self._explicit_search = True
+        self._live_search.search(self._CRITERIA_MAP[criteria], value)
+    
+    def _perform_query_search(self) -> None:
         try:
-            if criteria not in criteria_map:
-                raise ValueError(f"Неизвестный критерий поиска: {criteria}")
-                
-            self._search_results = self._controller.get_search_results({criteria_map[criteria]: value})
-            self._current_page = 1
-            self.update_view()
-            
-            if not self._search_results:
-                self._show_message("Студенты с указанными критериями не найдены")
-        except Exception as e:
-            self._show_error(f"Ошибка поиска: {e}")
+            query = parse_query(self._query_entry.get())
+        except ValueError as e:
+            self._show_error(str(e))
+            return
+        
+        self._cancel_live_search_timer()
+        self._explicit_search = True
+        self._live_search.search_query(query)
     
     def update_view(self) -> None:
-        self._table.delete(*self._table.get_children())
-        self._total_items = len(self._search_results)
-        
-        start_index = (self._current_page - 1) * self._page_size
-        end_index = start_index + self._page_size
-        paginated_results = self._search_results[start_index:end_index]
-        
-        for student in paginated_results:
-            self._table.insert("", "end", values=(
-                student.full_name,
-                student.course,
-                student.group,
-                student.total_works,
-                student.completed_works,
-                student.programming_language
-            ))
+        results = self._search_results
+        self._total_items = results.count()
+        start = (self._current_page - 1) * self._page_size
+        count = max(0, min(self._page_size, self._total_items - start))
         
+        # Из курсора читаются только строки, которые видны в таблице
+        self._table.set_source(count, lambda offset, limit: results.get_range(start + offset, limit),
+                               reset_position=True)
         self._update_pagination_controls()
 
 class StudentAddDialog(StudentDialog):
@@ -216,7 +285,7 @@ class StudentDeleteDialog(StudentDialog):
         super().__init__(parent, controller, "Удаление студентов")
     
     def _create_widgets(self) -> None:
-        self._dialog.geometry("400x200")
+        self._dialog.geometry("400x280")
         tk.Label(self._dialog, text="Критерий удаления:").pack()
 
         values=["ФИО", "Курс", "Группа", "Общее число работ", "Количество выполненных работ", "Количество не выполненных работ", "Язык программирования"]
@@ -235,6 +304,13 @@ class StudentDeleteDialog(StudentDialog):
         self._delete_criteria.bind("<<ComboboxSelected>>", self._clear_value)
         
         tk.Button(self._dialog, text="Удалить", command=self._perform_delete).pack()
+        
+        # Составной запрос, например: course = 4 or completed_works < 3
+        tk.Label(self._dialog, text="Запрос:").pack(pady=(10, 0))
+        self._delete_query = tk.Entry(self._dialog, width=40)
+        self._delete_query.pack()
+        
+        tk.Button(self._dialog, text="Удалить по запросу", command=self._perform_query_delete).pack()
     
     def _clear_value(self, event) -> None:
         self._delete_value.delete(0, tk.END)
@@ -261,4 +337,55 @@ class StudentDeleteDialog(StudentDialog):
             self._controller.delete_students({criteria_map[criteria]: value})
             self._dialog.destroy()
         except Exception as e:
-            self._show_error(f"Ошибка при удалении: {e}")
\ No newline at end of file
+            self._show_error(f"Ошибка при удалении: {e}")
+    
+    def _perform_query_delete(self) -> None:
+        try:
+            query = parse_query(self._delete_query.get())
+        except ValueError as e:
+            self._show_error(str(e))
+            return
+        
+        try:
+            self._controller.delete_students(query)
+            self._dialog.destroy()
+        except Exception as e:
+            self._show_error(f"Ошибка при удалении: {e}")
+
+
+class ProgressDialog(StudentDialog):
+    """Окно с ходом выполнения операции с файлом и кнопкой отмены.
+
+    Окно захватывает ввод (grab_set), поэтому пока операция выполняется в
+    рабочем потоке, с главным окном работать нельзя, но оно продолжает
+    перерисовываться.
+    """
+
+    def __init__(self, parent, controller, title: str):
+        super().__init__(parent, controller, title)
+        self._progress_bar = None
+        self._status_label = None
+
+    def _create_widgets(self) -> None:
+        self._dialog.resizable(False, False)
+        self._dialog.protocol("WM_DELETE_WINDOW", self._cancel)
+
+        self._status_label = tk.Label(self._dialog, text="0%")
+        self._status_label.pack(padx=10, pady=(10, 5))
+
+        self._progress_bar = ttk.Progressbar(self._dialog, length=300, maximum=100, mode="determinate")
+        self._progress_bar.pack(padx=10, pady=5)
+
+        tk.Button(self._dialog, text="Отмена", command=self._cancel).pack(pady=(5, 10))
+
+    def set_progress(self, fraction: float) -> None:
+        self._progress_bar["value"] = fraction * 100
+        self._status_label.config(text=f"{fraction:.0%}")
+
+    def close(self) -> None:
+        self._dialog.grab_release()
+        self._dialog.destroy()
+
+    def _cancel(self) -> None:
+        self._status_label.config(text="Отмена...")
+        self._controller.cancel_file_operation()
@@ -1,8 +1,12 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
+from typing import List
 
-from view.dialogs import StudentAddDialog, StudentSearchDialog, StudentDeleteDialog
+from model.repositories import StudentChange
+
+from view.dialogs import ProgressDialog, StudentAddDialog, StudentSearchDialog, StudentDeleteDialog
 from view.pagination import PaginatedView
+from view.virtual_table import VirtualTable, student_values
 
 
 class StudentView(PaginatedView):
@@ -10,6 +14,11 @@ class StudentView(PaginatedView):
         super().__init__()
         self._root = root
         self._controller = None
+        # Показанная в таблице страница: (номер, размер)
+        self._shown_page = None
+        # Изменения хранилища, ещё не показанные в таблице, и запланированное их применение
+        self._pending_changes: List[StudentChange] = []
+        self._apply_changes_id = None
         
         self._create_ui()
     
@@ -41,9 +50,9 @@ class StudentView(PaginatedView):
         columns = ("FullName", "Course", "Group", "TotalWorks", "CompletedWorks", "ProgrammingLanguage")
         headings = ("ФИО", "Курс", "Группа", "Общее число работ", "Количество выполненных работ", "Язык программирования")
         
-        self._table = ttk.Treeview(self._root, columns=columns, show="headings")
-        for col, heading in zip(columns, headings):
-            self._table.heading(col, text=heading)
+        # Таблица создаёт элементы только для видимых строк, поэтому
+        # страница может быть любого размера
+        self._table = VirtualTable(self._root, columns, headings, student_values)
         self._table.pack(fill='both', expand=True)
     
     def _create_pagination_controls(self) -> None:
@@ -55,23 +64,65 @@ class StudentView(PaginatedView):
     def show_error(self, error: str) -> None:
         messagebox.showerror("Ошибка", error)
     
+    def show_progress(self, title: str) -> ProgressDialog:
+        dialog = ProgressDialog(self._root, self._controller, title)
+        dialog.show()
+        return dialog
+    
+    def after(self, delay: int, callback) -> str:
+        """Планирует вызов callback в потоке Tk через delay мс."""
+        return self._root.after(delay, callback)
+    
     def update_view(self) -> None:
-        self._table.delete(*self._table.get_children())
-        students = self._controller.get_paginated_students(self._current_page, self._page_size)
         self._total_items = self._controller.get_total_students()
+        start = (self._current_page - 1) * self._page_size
+        count = max(0, min(self._page_size, self._total_items - start))
+        page = (self._current_page, self._page_size)
         
-        for student in students:
-            self._table.insert("", "end", values=(
-                student.full_name,
-                student.course,
-                student.group,
-                student.total_works,
-                student.completed_works,
-                student.programming_language
-            ))
+        # Строки страницы запрашиваются у хранилища по мере прокрутки
+        self._table.set_source(
+            count,
+            lambda offset, limit: self._controller.get_students_range(start + offset, limit),
+            reset_position=page != self._shown_page
+        )
+        self._shown_page = page
         
         self._update_pagination_controls()
     
+    def on_students_changed(self, change: StudentChange) -> None:
+        """Запоминает изменение хранилища; все изменения применяются одним проходом, когда Tk свободен."""
+        self._pending_changes.append(change)
+        if self._apply_changes_id is None:
+            self._apply_changes_id = self._root.after_idle(self._apply_changes)
+    
+    def _apply_changes(self) -> None:
+        self._apply_changes_id = None
+        changes, self._pending_changes = self._pending_changes, []
+        if any(change.kind == StudentChange.RESET for change in changes):
+            self.update_view()
+            return
+        
+        # Строки до первой изменённой позиции остались на местах
+        first_changed = min((change.positions[0] for change in changes if change.positions), default=None)
+        if first_changed is None:
+            return
+        for change in changes:
+            if change.kind == StudentChange.INSERTED:
+                self._total_items += len(change.positions)
+            else:
+                self._total_items -= len(change.positions)
+        
+        start = (self._current_page - 1) * self._page_size
+        if start >= self._total_items and self._current_page > 1:
+            # Удалены все студенты последней страницы
+            self._current_page = max(1, (self._total_items + self._page_size - 1) // self._page_size)
+            self.update_view()
+            return
+        
+        count = max(0, min(self._page_size, self._total_items - start))
+        self._table.invalidate(count, max(0, first_changed - start))
+        self._update_pagination_controls()
+    
     def on_add_button_clicked(self) -> None:
         dialog = StudentAddDialog(self._root, self._controller)
         dialog.show()
@@ -88,6 +139,10 @@ class StudentView(PaginatedView):
         self._controller.save_to_file()
     
     def on_load_button_clicked(self) -> None:
-        self._current_page = 1
+        # Загрузка выполняется в рабочем потоке; таблица обновится в on_students_loaded
         self._controller.load_from_file()
+    
+    def on_students_loaded(self) -> None:
+        """Показывает загруженных из файла студентов с первой страницы."""
+        self._current_page = 1
         self.update_view()
\ No newline at end of file
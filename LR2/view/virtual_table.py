@@ -0,0 +1,243 @@
+from collections import OrderedDict
+from tkinter import ttk
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Set
+
+
+# Сколько строк запрашивается у источника за раз и сколько таких окон хранится
+WINDOW_SIZE = 200
+MAX_WINDOWS = 8
+# На сколько строк прокручивает таблицу один щелчок колеса мыши
+WHEEL_STEP = 3
+
+
+def student_values(student) -> tuple:
+    """Значения строки таблицы студентов."""
+    return (
+        student.full_name,
+        student.course,
+        student.group,
+        student.total_works,
+        student.completed_works,
+        student.programming_language
+    )
+
+
+class RowCache:
+    """Строки источника данных, загружаемые окнами по window_size строк.
+
+    fetch(offset, count) возвращает не более count строк начиная с позиции
+    offset. Хранятся max_windows последних использованных окон, самое давнее
+    вытесняется.
+    """
+
+    def __init__(self, fetch: Callable[[int, int], List[Any]],
+                 window_size: int = WINDOW_SIZE, max_windows: int = MAX_WINDOWS):
+        self._fetch = fetch
+        self._window_size = window_size
+        self._max_windows = max_windows
+        self._windows: "OrderedDict[int, List[Any]]" = OrderedDict()
+
+    def get(self, offset: int, count: int) -> List[Any]:
+        """Возвращает не более count строк начиная с позиции offset."""
+        rows = []
+        position, end = offset, offset + count
+        while position < end:
+            index, start = divmod(position, self._window_size)
+            chunk = self._window(index)[start:start + end - position]
+            if not chunk:
+                break
+            rows.extend(chunk)
+            position += len(chunk)
+        return rows
+
+    def clear(self) -> None:
+        self._windows.clear()
+
+    def invalidate_from(self, position: int) -> None:
+        """Забывает окна, в которых есть строки с позиции position и дальше."""
+        for index in [index for index in self._windows if (index + 1) * self._window_size > position]:
+            del self._windows[index]
+
+    def _window(self, index: int) -> List[Any]:
+        window = self._windows.get(index)
+        if window is not None:
+            self._windows.move_to_end(index)
+            return window
+        window = self._windows[index] = list(self._fetch(index * self._window_size, self._window_size))
+        if len(self._windows) > self._max_windows:
+            self._windows.popitem(last=False)
+        return window
+
+
+class RowSelection:
+    """Выделенные строки источника данных.
+
+    Элементы Treeview переиспользуются для разных строк, поэтому выделение
+    хранится по позициям строк источника, а не по элементам.
+    """
+
+    def __init__(self):
+        self._rows: Set[int] = set()
+
+    def update(self, first: int, count: int, selected: Iterable[int]) -> None:
+        """Запоминает, что из видимых строк first..first + count - 1 выделены selected.
+
+        Выделение строк, которые сейчас не видны, сохраняется.
+        """
+        self._rows = {row for row in self._rows if not first <= row < first + count}
+        self._rows.update(selected)
+
+    def visible(self, first: int, count: int) -> List[int]:
+        """Выделенные строки среди строк first..first + count - 1."""
+        return [row for row in range(first, first + count) if row in self._rows]
+
+    def rows(self) -> List[int]:
+        return sorted(self._rows)
+
+    def clear(self) -> None:
+        self._rows.clear()
+
+    def invalidate_from(self, position: int) -> None:
+        """Снимает выделение со строк с позиции position и дальше: там теперь могут быть другие строки."""
+        self._rows = {row for row in self._rows if row < position}
+
+
+class VirtualTable(ttk.Frame):
+    """Таблица с виртуальной прокруткой на основе ttk.Treeview.
+
+    В Treeview ровно столько элементов, сколько строк помещается на экране:
+    при прокрутке элементы не пересоздаются, а получают значения других строк,
+    причём меняются только элементы, значения которых стали другими.
+    Строки запрашиваются у источника окнами через RowCache, поэтому таблица
+    одинаково быстро показывает и десять строк, и миллион. Выделение
+    хранится по строкам источника (RowSelection) и восстанавливается при
+    прокрутке.
+    """
+
+    def __init__(self, parent, columns: Sequence[str], headings: Sequence[str],
+                 row_values: Callable[[Any], Sequence[Any]]):
+        super().__init__(parent)
+        self._row_values = row_values
+        self._total = 0
+        self._top = 0
+        self._cache = RowCache(lambda offset, count: [])
+        self._items: List[str] = []
+        # Значения, показанные в элементах _items
+        self._shown: List[Sequence[Any]] = []
+        self._selection = RowSelection()
+
+        self._tree = ttk.Treeview(self, columns=columns, show="headings")
+        for col, heading in zip(columns, headings):
+            self._tree.heading(col, text=heading)
+        self._capacity = int(self._tree.cget("height"))
+
+        self._scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self._scrollbar.pack(side='right', fill='y')
+        self._tree.pack(side='left', fill='both', expand=True)
+
+        self._tree.bind("<Configure>", self._on_configure)
+        self._tree.bind("<<TreeviewSelect>>", self._on_select)
+        self._tree.bind("<MouseWheel>", self._on_mouse_wheel)
+        self._tree.bind("<Button-4>", lambda event: self._on_wheel_step(-WHEEL_STEP))
+        self._tree.bind("<Button-5>", lambda event: self._on_wheel_step(WHEEL_STEP))
+        self._update_scrollbar()
+
+    def column(self, column: str, **options) -> None:
+        self._tree.column(column, **options)
+
+    def set_source(self, total: int, fetch: Callable[[int, int], List[Any]], reset_position: bool = False) -> None:
+        """Показывает total строк, которые fetch(offset, count) возвращает по частям."""
+        self._total = total
+        self._cache = RowCache(lambda offset, count: fetch(offset, min(count, self._total - offset)))
+        self._selection.clear()
+        if reset_position:
+            self._top = 0
+        self._render()
+
+    def refresh(self) -> None:
+        """Перечитывает строки источника, оставляя таблицу на прежнем месте."""
+        self._cache.clear()
+        self._render()
+
+    def invalidate(self, total: int, first_row: int = 0) -> None:
+        """Сообщает, что строк стало total, а строки начиная с first_row могли измениться."""
+        self._total = total
+        self._cache.invalidate_from(first_row)
+        self._selection.invalidate_from(first_row)
+        self._render()
+
+    def selected_rows(self) -> List[int]:
+        """Позиции выделенных строк источника по возрастанию."""
+        return self._selection.rows()
+
+    def scroll_to(self, row: int) -> None:
+        self._top = row
+        self._render()
+
+    def scroll(self, rows: int) -> None:
+        self.scroll_to(self._top + rows)
+
+    def _render(self) -> None:
+        self._top = max(0, min(self._top, self._total - self._capacity))
+        rows = self._cache.get(self._top, min(self._capacity, self._total - self._top))
+
+        if len(self._items) > len(rows):
+            self._tree.delete(*self._items[len(rows):])
+            del self._items[len(rows):], self._shown[len(rows):]
+
+        for position, row in enumerate(rows):
+            values = tuple(self._row_values(row))
+            if position == len(self._items):
+                self._items.append(self._tree.insert("", "end", values=values))
+                self._shown.append(values)
+            elif self._shown[position] != values:
+                self._tree.item(self._items[position], values=values)
+                self._shown[position] = values
+
+        selected = [self._items[row - self._top] for row in self._selection.visible(self._top, len(self._items))]
+        if set(selected) != set(self._tree.selection()):
+            self._tree.selection_set(selected)
+        self._tree.yview_moveto(0)
+        self._update_scrollbar()
+
+    def _update_scrollbar(self) -> None:
+        if self._total <= self._capacity:
+            self._scrollbar.set(0.0, 1.0)
+        else:
+            self._scrollbar.set(self._top / self._total, (self._top + self._capacity) / self._total)
+
+    def _on_scrollbar(self, action: str, amount: str, unit: Optional[str] = None) -> None:
+        if action == "moveto":
+            self.scroll_to(round(float(amount) * self._total))
+        elif action == "scroll":
+            self.scroll(int(amount) * (self._capacity if unit == "pages" else 1))
+
+    def _on_select(self, event) -> None:
+        positions = {item: position for position, item in enumerate(self._items)}
+        selected = [self._top + positions[item] for item in self._tree.selection() if item in positions]
+        self._selection.update(self._top, len(self._items), selected)
+
+    def _on_mouse_wheel(self, event) -> str:
+        return self._on_wheel_step(-WHEEL_STEP if event.delta > 0 else WHEEL_STEP)
+
+    def _on_wheel_step(self, rows: int) -> str:
+        self.scroll(rows)
+        # Встроенная прокрутка Treeview не нужна: все его элементы и так видны
+        return "break"
+
+    def _on_configure(self, event) -> None:
+        self._fit(event.height)
+        # Высота строк известна точно, только когда Treeview отрисовал элементы
+        self.after_idle(lambda: self._fit(self._tree.winfo_height()))
+
+    def _fit(self, height: int) -> None:
+        """Подгоняет число элементов Treeview под высоту height."""
+        row_height, header_height = 20, 20
+        if self._items:
+            box = self._tree.bbox(self._items[0])
+            if box:
+                header_height, row_height = box[1], box[3]
+        capacity = max(1, (height - header_height) // row_height)
+        if capacity != self._capacity:
+            self._capacity = capacity
+            self._render()